@@ -0,0 +1,232 @@
+"""Matrix assembly module.
+
+This module defines the helpers used by the Rotor class to scatter element
+matrices into the global matrices, either as dense arrays or as sparse
+matrices, using a scatter pattern that is computed only once per rotor.
+"""
+
+import numpy as np
+from scipy import sparse
+
+__all__ = ["ScatterPattern"]
+
+
+class ScatterPattern:
+    """Precomputed COO scatter pattern for a group of elements.
+
+    The global row and column index of every entry of every element matrix is
+    computed once, so that assembling a global matrix reduces to concatenating
+    the element blocks and adding them to a dense array or building a sparse
+    matrix from the (row, column, value) triplets.
+
+    Parameters
+    ----------
+    dofs : list
+        List with the global degrees of freedom of each element, in the same
+        order as the rows and columns of the element matrices.
+    ndof : int
+        Number of degrees of freedom of the global matrix.
+
+    Attributes
+    ----------
+    rows : np.ndarray
+        Global row index of each entry.
+    cols : np.ndarray
+        Global column index of each entry.
+    flat_index : np.ndarray
+        Index of each entry in the flattened (row major) global matrix.
+
+    Examples
+    --------
+    >>> pattern = ScatterPattern([[0, 1], [1, 2]], ndof=3)
+    >>> blocks = [np.ones((2, 2)), 2 * np.ones((2, 2))]
+    >>> pattern.to_dense(blocks)
+    array([[1., 1., 0.],
+           [1., 3., 2.],
+           [0., 2., 2.]])
+    >>> pattern.to_sparse(blocks).nnz
+    7
+
+    Blocks evaluated at several frequencies are assembled at once when they
+    are stacked along the first axis:
+
+    >>> stacked_blocks = [np.ones((4, 2, 2)), 2 * np.ones((4, 2, 2))]
+    >>> pattern.to_dense_stack(stacked_blocks).shape
+    (4, 3, 3)
+    """
+
+    def __init__(self, dofs, ndof):
+        self.ndof = int(ndof)
+        self.sizes = np.array([len(d) for d in dofs], dtype=int)
+
+        rows = [np.repeat(np.asarray(d, dtype=np.int64), len(d)) for d in dofs]
+        cols = [np.tile(np.asarray(d, dtype=np.int64), len(d)) for d in dofs]
+
+        self.rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        self.cols = np.concatenate(cols) if cols else np.zeros(0, dtype=np.int64)
+        self.flat_index = self.rows * self.ndof + self.cols
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def data(self, blocks):
+        """Flatten the element blocks into the COO data array.
+
+        Parameters
+        ----------
+        blocks : list
+            Element matrices, in the same order as the pattern dofs.
+
+        Returns
+        -------
+        data : np.ndarray
+            Concatenated entries of the element matrices.
+        """
+        if len(blocks) == 0:
+            return np.zeros(0)
+
+        return np.concatenate([np.asarray(b).ravel() for b in blocks])
+
+    def stack_data(self, blocks):
+        """Flatten stacked element blocks into a 2D COO data array.
+
+        Parameters
+        ----------
+        blocks : list
+            Element matrices stacked along the first axis, each with shape
+            (n_stack, n, n), in the same order as the pattern dofs.
+
+        Returns
+        -------
+        data : np.ndarray
+            Array with shape (n_stack, nnz), where each row holds the COO data
+            of one matrix of the stack.
+        """
+        return np.concatenate(
+            [np.asarray(b).reshape(len(b), -1) for b in blocks], axis=1
+        )
+
+    def to_sparse(self, blocks, format="csr"):
+        """Assemble the element blocks into a sparse global matrix.
+
+        Parameters
+        ----------
+        blocks : list
+            Element matrices, in the same order as the pattern dofs.
+        format : str, optional
+            Sparse format of the returned matrix. Default is "csr".
+
+        Returns
+        -------
+        matrix : scipy.sparse matrix
+            Global matrix with shape (ndof, ndof).
+        """
+        matrix = sparse.coo_matrix(
+            (self.data(blocks), (self.rows, self.cols)),
+            shape=(self.ndof, self.ndof),
+        )
+
+        return matrix.asformat(format)
+
+    def to_sparse_stack(self, blocks, format="csr"):
+        """Assemble stacked element blocks into a list of sparse matrices.
+
+        Parameters
+        ----------
+        blocks : list
+            Element matrices stacked along the first axis, each with shape
+            (n_stack, n, n), in the same order as the pattern dofs.
+        format : str, optional
+            Sparse format of the returned matrices. Default is "csr".
+
+        Returns
+        -------
+        matrices : list
+            List with n_stack sparse global matrices.
+        """
+        shape = (self.ndof, self.ndof)
+
+        return [
+            sparse.coo_matrix((data, (self.rows, self.cols)), shape=shape).asformat(
+                format
+            )
+            for data in self.stack_data(blocks)
+        ]
+
+    def add_to(self, matrix, blocks):
+        """Add the element blocks to a dense global matrix in place.
+
+        Parameters
+        ----------
+        matrix : np.ndarray
+            C-contiguous global matrix with shape (ndof, ndof).
+        blocks : list
+            Element matrices, in the same order as the pattern dofs.
+
+        Returns
+        -------
+        matrix : np.ndarray
+            The updated global matrix.
+        """
+        if len(self.flat_index):
+            np.add.at(matrix.reshape(-1), self.flat_index, self.data(blocks))
+
+        return matrix
+
+    def to_dense(self, blocks):
+        """Assemble the element blocks into a dense global matrix.
+
+        Parameters
+        ----------
+        blocks : list
+            Element matrices, in the same order as the pattern dofs.
+
+        Returns
+        -------
+        matrix : np.ndarray
+            Global matrix with shape (ndof, ndof).
+        """
+        matrix = np.zeros((self.ndof, self.ndof), dtype=self.data(blocks).dtype)
+
+        return self.add_to(matrix, blocks)
+
+    def add_to_stack(self, matrices, blocks):
+        """Add stacked element blocks to a stack of dense global matrices.
+
+        Parameters
+        ----------
+        matrices : np.ndarray
+            C-contiguous array with shape (n_stack, ndof, ndof).
+        blocks : list
+            Element matrices stacked along the first axis, each with shape
+            (n_stack, n, n), in the same order as the pattern dofs.
+
+        Returns
+        -------
+        matrices : np.ndarray
+            The updated stack of global matrices.
+        """
+        if len(self.flat_index):
+            flat = matrices.reshape(len(matrices), -1)
+            np.add.at(flat, (slice(None), self.flat_index), self.stack_data(blocks))
+
+        return matrices
+
+    def to_dense_stack(self, blocks):
+        """Assemble stacked element blocks into a stack of dense matrices.
+
+        Parameters
+        ----------
+        blocks : list
+            Element matrices stacked along the first axis, each with shape
+            (n_stack, n, n), in the same order as the pattern dofs.
+
+        Returns
+        -------
+        matrices : np.ndarray
+            Stack of global matrices with shape (n_stack, ndof, ndof).
+        """
+        data = self.stack_data(blocks)
+        matrices = np.zeros((len(data), self.ndof, self.ndof), dtype=data.dtype)
+
+        return self.add_to_stack(matrices, blocks)
@@ -34,6 +34,180 @@ __all__ = [
 ]
 
 
+class CoefficientTable:
+    """Packed table of frequency dependent bearing coefficients.
+
+    All coefficients share a single set of breakpoints and are stored as
+    piecewise polynomials in one array, so that every coefficient is evaluated
+    at any number of frequencies with a single vectorized pass. The table only
+    holds numpy arrays, which makes it cheap to copy and to pickle.
+
+    Parameters
+    ----------
+    names : list
+        Name of each coefficient (e.g. "kxx").
+    breakpoints : np.ndarray
+        Sorted breakpoints of the piecewise polynomials, with shape (m + 1,).
+    coefficients : np.ndarray
+        Local polynomial coefficients with shape (n_coeff, k + 1, m), highest
+        power first, as in scipy.interpolate.PPoly.
+
+    Examples
+    --------
+    >>> from scipy import interpolate
+    >>> linear = interpolate.PPoly([[2.0], [1.0]], [0.0, 1.0])
+    >>> constant = interpolate.PPoly([[5.0]], [0.0, 1.0])
+    >>> table = CoefficientTable.from_ppolys(["a", "b"], [linear, constant])
+    >>> table([0.0, 2.0])
+    array([[1., 5.],
+           [5., 5.]])
+    >>> table.column("a")(0.5)
+    array(2.)
+    """
+
+    def __init__(self, names, breakpoints, coefficients):
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.breakpoints = np.asarray(breakpoints, dtype=np.float64)
+        self.coefficients = np.asarray(coefficients, dtype=np.float64)
+
+        # layout used for evaluation: (piece, power, coefficient)
+        self._pieces = np.ascontiguousarray(self.coefficients.transpose(2, 1, 0))
+
+    @classmethod
+    def from_ppolys(cls, names, ppolys):
+        """Pack a list of piecewise polynomials in a single table.
+
+        The polynomials are re-expanded on the union of their breakpoints,
+        using the lowest number of pieces that represents all of them exactly.
+
+        Parameters
+        ----------
+        names : list
+            Name of each coefficient.
+        ppolys : list
+            List of scipy.interpolate.PPoly, one for each coefficient.
+
+        Returns
+        -------
+        table : CoefficientTable
+            Packed coefficient table.
+        """
+        varying = [pp.x for pp in ppolys if pp.c.shape[1] > 1 or pp.c.shape[0] > 1]
+        if varying:
+            breakpoints = np.unique(np.concatenate(varying))
+        else:
+            breakpoints = np.array([0.0, 1.0])
+
+        degree = max(pp.c.shape[0] for pp in ppolys) - 1
+        x = breakpoints[:-1]
+
+        coefficients = np.zeros((len(ppolys), degree + 1, len(x)))
+        factorial = 1.0
+        for order in range(degree + 1):
+            if order:
+                factorial *= order
+            for i, pp in enumerate(ppolys):
+                if order < pp.c.shape[0]:
+                    coefficients[i, degree - order] = pp(x, nu=order) / factorial
+
+        return cls(names, breakpoints, coefficients)
+
+    def __call__(self, frequency, nu=0):
+        """Evaluate all coefficients.
+
+        Parameters
+        ----------
+        frequency : float, array_like
+            Frequencies (rad/s) where the coefficients are evaluated.
+        nu : int, optional
+            Order of the derivative with respect to the frequency.
+            Default is 0.
+
+        Returns
+        -------
+        values : np.ndarray
+            Array with shape (n_freq, n_coeff).
+        """
+        if nu:
+            return self.derivative(nu)(frequency)
+
+        frequency = np.atleast_1d(np.asarray(frequency, dtype=np.float64))
+
+        # frequencies out of the breakpoints range use the first or last piece
+        interval = np.searchsorted(self.breakpoints[1:-1], frequency, side="right")
+        dx = (frequency - self.breakpoints[interval])[:, np.newaxis]
+
+        c = self._pieces[interval]
+        values = c[:, 0].copy()
+        for power in range(1, c.shape[1]):
+            values *= dx
+            values += c[:, power]
+
+        return values
+
+    def derivative(self, nu=1):
+        """Table with the derivatives of the coefficients.
+
+        Parameters
+        ----------
+        nu : int, optional
+            Order of the derivative with respect to the frequency.
+            Default is 1.
+
+        Returns
+        -------
+        table : CoefficientTable
+            Table of the derivatives, with the same names and breakpoints.
+
+        Examples
+        --------
+        >>> from scipy import interpolate
+        >>> quadratic = interpolate.PPoly([[1.0], [0.0], [3.0]], [0.0, 1.0])
+        >>> table = CoefficientTable.from_ppolys(["a"], [quadratic])
+        >>> table.derivative()([2.0])
+        array([[4.]])
+        """
+        coefficients = self.coefficients
+        for _ in range(nu):
+            degree = coefficients.shape[1] - 1
+            if degree == 0:
+                coefficients = np.zeros_like(coefficients)
+                break
+            powers = np.arange(degree, 0, -1)[np.newaxis, :, np.newaxis]
+            coefficients = coefficients[:, :-1] * powers
+
+        return CoefficientTable(self.names, self.breakpoints, coefficients)
+
+    def column(self, name):
+        """Callable that evaluates a single coefficient of the table.
+
+        Parameters
+        ----------
+        name : str
+            Name of the coefficient.
+
+        Returns
+        -------
+        column : callable
+            Function of the frequency with the same output shape as its input.
+        """
+        return _CoefficientColumn(self, self.index[name])
+
+
+class _CoefficientColumn:
+    """Single coefficient view of a CoefficientTable."""
+
+    def __init__(self, table, index):
+        self.table = table
+        self.i = index
+
+    def __call__(self, frequency):
+        values = self.table(frequency)[:, self.i]
+
+        return values.reshape(np.shape(frequency))
+
+
 class BearingElement(Element):
     """A bearing element.
 
@@ -204,12 +378,18 @@ class BearingElement(Element):
         # check coefficients len for consistency
         coefficients_len = []
 
+        ppolys = []
         for arg in args:
-            coefficient, interpolated = self._process_coefficient(args_dict[arg])
+            coefficient, ppoly = self._process_coefficient(args_dict[arg])
             setattr(self, arg, coefficient)
-            setattr(self, f"{arg}_interpolated", interpolated)
+            ppolys.append(ppoly)
             coefficients_len.append(len(coefficient))
 
+        self.coefficient_table = CoefficientTable.from_ppolys(args, ppolys)
+
+        for arg in args:
+            setattr(self, f"{arg}_interpolated", self.coefficient_table.column(arg))
+
         if frequency is not None and type(frequency) != float:
             coefficients_len.append(len(args_dict["frequency"]))
             if len(set(coefficients_len)) > 1:
@@ -244,11 +424,9 @@ class BearingElement(Element):
         -------
         coefficient : float, array
             The processed coefficient data.
-        interpolated : callable
-            A callable for interpolating the coefficient data.
+        ppoly : scipy.interpolate.PPoly
+            Piecewise polynomial interpolating the coefficient data.
         """
-        interpolated = None
-
         if isinstance(coefficient, (int, float)):
             if self.frequency is not None and type(self.frequency) != float:
                 coefficient = [coefficient for _ in range(len(self.frequency))]
@@ -257,36 +435,40 @@ class BearingElement(Element):
 
         if len(coefficient) > 1:
             try:
+                degree = 3
                 with warnings.catch_warnings():
                     warnings.simplefilter("ignore")
-                    interpolated = interpolate.UnivariateSpline(
-                        self.frequency, coefficient
+                    spline = interpolate.UnivariateSpline(
+                        self.frequency, coefficient, k=degree
                     )
+                # full knot vector, with the boundary knots repeated
+                knots = spline.get_knots()
+                knots = np.r_[[knots[0]] * degree, knots, [knots[-1]] * degree]
+                ppoly = interpolate.PPoly.from_spline(
+                    interpolate.BSpline(knots, spline.get_coeffs(), degree)
+                )
             #  dfitpack.error is not exposed by scipy
             #  so a bare except is used
             except:
                 try:
-                    if len(self.frequency) in (2, 3):
-                        interpolated = interpolate.interp1d(
-                            self.frequency,
-                            coefficient,
-                            kind=len(self.frequency) - 1,
-                            fill_value="extrapolate",
-                        )
+                    if len(self.frequency) not in (2, 3):
+                        raise ValueError
+                    order = np.argsort(self.frequency)
+                    spline = interpolate.make_interp_spline(
+                        self.frequency[order],
+                        np.asarray(coefficient, dtype=np.float64)[order],
+                        k=len(self.frequency) - 1,
+                    )
+                    ppoly = interpolate.PPoly.from_spline(spline)
                 except:
                     raise ValueError(
                         "Arguments (coefficients and frequency)"
                         " must have the same dimension"
                     )
         else:
-            interpolated = interpolate.interp1d(
-                [0, 1],
-                [coefficient[0], coefficient[0]],
-                kind="linear",
-                fill_value="extrapolate",
-            )
+            ppoly = interpolate.PPoly([[float(coefficient[0])]], [0.0, 1.0])
 
-        return coefficient, interpolated
+        return coefficient, ppoly
 
     def _get_coefficient_list(self, ignore_mass=False):
         """List with all bearing coefficients as strings
@@ -671,6 +853,63 @@ class BearingElement(Element):
         """
         return dict(x_0=0, y_0=1, z_0=2)
 
+    @check_units
+    def matrices(self, coefficient, frequency, nu=0):
+        """Bearing matrices evaluated at an array of frequencies.
+
+        All the coefficients are evaluated from the packed coefficient table
+        for the whole frequency array at once, and the element matrices are
+        returned stacked along the first axis.
+
+        Parameters
+        ----------
+        coefficient : str
+            Type of matrix: "k" for stiffness, "c" for damping or "m" for mass.
+        frequency : float, array_like
+            The excitation frequencies (rad/s).
+        nu : int, optional
+            Order of the derivative with respect to the frequency.
+            Default is 0.
+
+        Returns
+        -------
+        matrices : np.ndarray
+            Array with shape (n_freq, 3, 3), or (n_freq, 6, 6) if the bearing
+            is linked to another node.
+
+        Examples
+        --------
+        >>> bearing = bearing_example()
+        >>> bearing.matrices("k", [0, 100]).shape
+        (2, 3, 3)
+        >>> bearing.matrices("c", [0, 100])[:, 0, 0]
+        array([200., 200.])
+        """
+        return self._matrices(coefficient, frequency, nu=nu)
+
+    def _matrices(self, coefficient, frequency, nu=0):
+        """Stacked bearing matrices, without units handling."""
+        frequency = np.atleast_1d(np.asarray(frequency, dtype=np.float64))
+
+        table = self.coefficient_table
+        values = table(frequency, nu=nu)
+        xx, yy, xy, yx, zz = (
+            values[:, table.index[f"{coefficient}{direction}"]]
+            for direction in ("xx", "yy", "xy", "yx", "zz")
+        )
+
+        matrices = np.zeros((len(frequency), 3, 3))
+        matrices[:, 0, 0] = xx
+        matrices[:, 0, 1] = xy
+        matrices[:, 1, 0] = yx
+        matrices[:, 1, 1] = yy
+        matrices[:, 2, 2] = zz
+
+        if self.n_link is not None:
+            matrices = np.block([[matrices, -matrices], [-matrices, matrices]])
+
+        return matrices
+
     def M(self, frequency):
         """Mass matrix for an instance of a bearing element.
 
@@ -695,21 +934,7 @@ class BearingElement(Element):
                [0., 0., 0.],
                [0., 0., 0.]])
         """
-        mxx = self.mxx_interpolated(frequency)
-        myy = self.myy_interpolated(frequency)
-        mxy = self.mxy_interpolated(frequency)
-        myx = self.myx_interpolated(frequency)
-        mzz = self.mzz_interpolated(frequency)
-
-        M = np.array([[mxx, mxy, 0], [myx, myy, 0], [0, 0, mzz]])
-
-        if self.n_link is not None:
-            # fmt: off
-            M = np.vstack((np.hstack([M, -M]),
-                           np.hstack([-M, M])))
-            # fmt: on
-
-        return M
+        return self._matrices("m", frequency)[0]
 
     @check_units
     def K(self, frequency):
@@ -737,21 +962,7 @@ class BearingElement(Element):
                [      0.,  800000.,       0.],
                [      0.,       0.,  100000.]])
         """
-        kxx = self.kxx_interpolated(frequency)
-        kyy = self.kyy_interpolated(frequency)
-        kxy = self.kxy_interpolated(frequency)
-        kyx = self.kyx_interpolated(frequency)
-        kzz = self.kzz_interpolated(frequency)
-
-        K = np.array([[kxx, kxy, 0], [kyx, kyy, 0], [0, 0, kzz]])
-
-        if self.n_link is not None:
-            # fmt: off
-            K = np.vstack((np.hstack([K, -K]),
-                           np.hstack([-K, K])))
-            # fmt: on
-
-        return K
+        return self._matrices("k", frequency)[0]
 
     @check_units
     def C(self, frequency):
@@ -779,21 +990,7 @@ class BearingElement(Element):
                [  0., 150.,   0.],
                [  0.,   0.,  50.]])
         """
-        cxx = self.cxx_interpolated(frequency)
-        cyy = self.cyy_interpolated(frequency)
-        cxy = self.cxy_interpolated(frequency)
-        cyx = self.cyx_interpolated(frequency)
-        czz = self.czz_interpolated(frequency)
-
-        C = np.array([[cxx, cxy, 0], [cyx, cyy, 0], [0, 0, czz]])
-
-        if self.n_link is not None:
-            # fmt: off
-            C = np.vstack((np.hstack([C, -C]),
-                           np.hstack([-C, C])))
-            # fmt: on
-
-        return C
+        return self._matrices("c", frequency)[0]
 
     def G(self):
         """Gyroscopic matrix for an instance of a bearing element.
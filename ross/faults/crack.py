@@ -1,8 +1,11 @@
+import hashlib
+import os
 from abc import ABC
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
+from scipy.sparse import csc_matrix
 
 import ross as rs
 from ross.units import Q_, check_units
@@ -36,6 +39,11 @@ class Crack(ABC):
     cross_divisions: float, optional
         Number of square divisions into which the cross-section of the cracked element
         will be divided in the analysis conducted for the Flex Breathing model.
+    exact_breathing : bool, optional
+        If True, the open and closed parts of the crack of the Flex Breathing model
+        are computed iteratively at each time step. If False, they are interpolated
+        from a table over the angular position, built once per crack.
+        Default is False.
 
     Returns
     -------
@@ -67,6 +75,9 @@ class Crack(ABC):
     ShaftElement(L=0.03, idl=0.0, idr=0.0, odl=0.019,  odr=0.019, material='Steel', n=18)
     """
 
+    # number of angular positions of the Flex Breathing section table
+    n_breathing_points = 360
+
     @check_units
     def __init__(
         self,
@@ -75,10 +86,14 @@ class Crack(ABC):
         depth_ratio,
         crack_model="Mayes",
         cross_divisions=None,
+        exact_breathing=False,
     ):
         self.rotor = rotor
         self.cross_divisions = cross_divisions
         self.crack_model = crack_model
+        self.exact_breathing = exact_breathing
+        self._breathing_table = None
+        self._modulation = None
 
         self.validate_depth_ratio(depth_ratio, crack_model)
         self.depth_ratio = depth_ratio
@@ -141,6 +156,22 @@ class Crack(ABC):
             self.Ko = np.linalg.pinv(Co)
             self.Kc = np.linalg.pinv(Cc)
 
+            # the stiffness matrix of the cracked element is affine in the
+            # direct stiffnesses kxx and kyy, see _assemble_crack_stiffness
+            K0 = self._compute_crack_stiffness_gasch_mayes(np.zeros((2, 2)))
+            self._K_basis = np.array(
+                [K0]
+                + [
+                    self._compute_crack_stiffness_gasch_mayes(np.diag(e)) - K0
+                    for e in np.eye(2)
+                ]
+            )
+
+            if self._crack_model == self.gasch:
+                self._breathing = self._gasch_breathing
+            else:
+                self._breathing = self._mayes_breathing
+
     @staticmethod
     def validate_depth_ratio(depth_ratio, crack_model):
         """Validate the maximum allowed crack depth ratio for each crack model.
@@ -256,78 +287,169 @@ class Crack(ABC):
 
         Paramenters
         -----------
-        ap : float
+        ap : float or array_like
             Angular position of the shaft.
 
         Returns
         -------
         K : np.ndarray
-            Stiffness matrix of the cracked element.
+            Stiffness matrix of the cracked element, with shape (12, 12) or
+            (len(ap), 12, 12) if an array of angular positions is given.
         """
+        k = self._direct_stiffness(ap, self._gasch_breathing(ap))
 
-        # Gasch
-        ko = self.Ko[0, 0]
-        kcx = self.Kc[0, 0]
-        kcz = self.Kc[1, 1]
+        return self._assemble_crack_stiffness(k)
+
+    def mayes(self, ap):
+        """Stiffness matrix of the shaft element with crack in rotating coordinates
+        according to the breathing model of Mayes.
+        This model is based on Linear Fracture Mechanics.
+
+        Paramenters
+        -----------
+        ap : float or array_like
+            Angular position of the shaft.
 
-        kme = (ko + kcx) / 2
-        kmn = (ko + kcz) / 2
-        kde = (ko - kcx) / 2
-        kdn = (ko - kcz) / 2
+        Returns
+        -------
+        K : np.ndarray
+            Stiffness matrix of the cracked element, with shape (12, 12) or
+            (len(ap), 12, 12) if an array of angular positions is given.
+        """
+        k = self._direct_stiffness(ap, self._mayes_breathing(ap))
+
+        return self._assemble_crack_stiffness(k)
+
+    @staticmethod
+    def _gasch_breathing(ap):
+        """Breathing function of the Gasch model, a truncated Fourier series of a
+        square wave that is 1 with the crack closed and -1 with the crack open.
 
+        Paramenters
+        -----------
+        ap : float or array_like
+            Angular position of the shaft.
+
+        Returns
+        -------
+        f : float or np.ndarray
+            Breathing function.
+        """
         size = 18
-        cosine_sum = np.sum(
-            [(-1) ** i * np.cos((2 * i + 1) * ap) / (2 * i + 1) for i in range(size)]
+        i = np.arange(size)
+        harmonics = 2 * i + 1
+
+        cosine_sum = np.cos(np.multiply.outer(ap, harmonics)) @ (
+            (-1.0) ** i / harmonics
         )
 
-        ke = kme + (4 / np.pi) * kde * cosine_sum
-        kn = kmn + (4 / np.pi) * kdn * cosine_sum
+        return (4 / np.pi) * cosine_sum
 
-        T_matrix = np.array(
-            [
-                [np.cos(ap), np.sin(ap)],
-                [-np.sin(ap), np.cos(ap)],
-            ]
-        )
+    @staticmethod
+    def _mayes_breathing(ap):
+        """Breathing function of the Mayes model.
 
-        K = T_matrix.T @ np.array([[ke, 0], [0, kn]]) @ T_matrix
+        Paramenters
+        -----------
+        ap : float or array_like
+            Angular position of the shaft.
 
-        return self._compute_crack_stiffness_gasch_mayes(K)
+        Returns
+        -------
+        f : float or np.ndarray
+            Breathing function.
+        """
+        return np.cos(ap)
 
-    def mayes(self, ap):
-        """Stiffness matrix of the shaft element with crack in rotating coordinates
-        according to the breathing model of Mayes.
-        This model is based on Linear Fracture Mechanics.
+    def _direct_stiffness(self, ap, breathing):
+        """Direct stiffnesses of the cracked element in inertial coordinates for
+        the Gasch and Mayes models.
+
+        The stiffnesses along (e) and normal (n) to the crack edge vary between
+        the values with the crack closed and open according to the breathing
+        function, and are rotated to the inertial coordinates.
 
         Paramenters
         -----------
-        ap : float
+        ap : float or array_like
             Angular position of the shaft.
+        breathing : float or array_like
+            Breathing function at the angular positions.
 
         Returns
         -------
-        K : np.ndarray
-            Stiffness matrix of the cracked element.
+        k : np.ndarray
+            Array with shape (..., 2) with the stiffnesses kxx and kyy.
         """
-
-        # Mayes
         ko = self.Ko[0, 0]
         kcx = self.Kc[0, 0]
         kcz = self.Kc[1, 1]
 
-        ke = 0.5 * (ko + kcx) + 0.5 * (ko - kcx) * np.cos(ap)
-        kn = 0.5 * (ko + kcz) + 0.5 * (ko - kcz) * np.cos(ap)
+        ke = 0.5 * (ko + kcx) + 0.5 * (ko - kcx) * breathing
+        kn = 0.5 * (ko + kcz) + 0.5 * (ko - kcz) * breathing
 
-        T_matrix = np.array(
-            [
-                [np.cos(ap), np.sin(ap)],
-                [-np.sin(ap), np.cos(ap)],
-            ]
-        )
+        cos2 = np.cos(ap) ** 2
+        sin2 = np.sin(ap) ** 2
 
-        K = T_matrix.T @ np.array([[ke, 0], [0, kn]]) @ T_matrix
+        return np.stack([cos2 * ke + sin2 * kn, sin2 * ke + cos2 * kn], axis=-1)
 
-        return self._compute_crack_stiffness_gasch_mayes(K)
+    def _assemble_crack_stiffness(self, k):
+        """Stiffness matrix of the cracked element from its direct stiffnesses for
+        the Gasch and Mayes models.
+
+        Paramenters
+        -----------
+        k : np.ndarray
+            Array with shape (..., 2) with the stiffnesses kxx and kyy.
+
+        Returns
+        -------
+        K : np.ndarray
+            Array with shape (..., 12, 12) with the stiffness matrices.
+        """
+        return self._K_basis[0] + np.tensordot(k, self._K_basis[1:], axes=1)
+
+    def stiffness_fourier_coefficients(self, n_harmonics):
+        """Fourier coefficients of the stiffness change of the cracked element over
+        a revolution of the shaft for the Gasch and Mayes models.
+
+        The coefficients follow the convention of the Harmonic Balance method: the
+        stiffness change at the angular position `ap` is `Ko / 2` plus the sum of
+        the real parts of `Kn[:, :, n - 1] * exp(1j * n * ap)`.
+
+        Parameters
+        ----------
+        n_harmonics : int
+            Number of harmonics.
+
+        Returns
+        -------
+        Ko : np.ndarray
+            Twice the mean stiffness change, with shape (12, 12).
+        Kn : np.ndarray
+            Complex harmonic coefficients, with shape (12, 12, n_harmonics).
+
+        Examples
+        --------
+        >>> rotor = rs.rotor_example_with_damping()
+        >>> fault = Crack(rotor, n=18, depth_ratio=0.2, crack_model="Mayes")
+        >>> Ko, Kn = fault.stiffness_fourier_coefficients(4)
+        >>> Kn.shape
+        (12, 12, 4)
+        """
+        # the Gasch breathing function has harmonics up to the 35th
+        n_points = 4 * max(n_harmonics, 64)
+        ap = 2 * np.pi * np.arange(n_points) / n_points
+
+        X = np.fft.rfft(self._direct_stiffness(ap, self._breathing(ap)), axis=0)
+        X *= 2 / n_points
+
+        Ko = 2 * (self._K_basis[0] - self.K_elem) + np.tensordot(
+            X[0].real, self._K_basis[1:], axes=1
+        )
+        Kn = np.tensordot(X[1 : n_harmonics + 1], self._K_basis[1:], axes=1)
+
+        return Ko, np.moveaxis(Kn, 0, -1)
 
     def _compute_crack_stiffness_flex(self, Lce, at, IXX, IYY, IXY):
         """Compute stiffness matrix of the shaft element with crack in inertial coordinates
@@ -461,6 +583,9 @@ class Crack(ABC):
         considering which parts of the crack are open or closed under local
         stress. These are then used to compute the element stiffness.
 
+        Unless `exact_breathing` is True, the resistant area and inertia moments
+        are interpolated from the table returned by `_get_breathing_table`.
+
         Paramenters
         -----------
         ap : float
@@ -477,7 +602,6 @@ class Crack(ABC):
         radius = self.shaft_elem.odl / 2
         depth_ratio = self.depth_ratio
         J = (np.pi / 4) * radius**4
-        step = radius / self.cross_divisions
         Lce = (
             (
                 -33.3333 * depth_ratio**5
@@ -501,6 +625,43 @@ class Crack(ABC):
         MTx = Mdx + Mpx
         MTy = Mdy + Mpy
 
+        if self.exact_breathing:
+            at, IXX, IYY, IXY = self._breathing_section(ap, MTx, MTy)
+        else:
+            table = self._get_breathing_table()[int(MTx != 0 or MTy != 0)]
+
+            n_points = table.shape[1]
+            position = (ap % (2 * np.pi)) / (2 * np.pi) * n_points
+            i = int(position) % n_points
+            w = position - int(position)
+
+            at, IXX, IYY, IXY = (1 - w) * table[:, i] + w * table[:, (i + 1) % n_points]
+
+        return self._compute_crack_stiffness_flex(Lce, at, IXX, IYY, IXY)
+
+    def _breathing_section(self, ap, MTx, MTy):
+        """Compute the resistant area and inertia moments of the cracked section
+        of the Flex Breathing model.
+
+        Paramenters
+        -----------
+        ap : float
+            Angular position of the shaft.
+        MTx, MTy : float
+            Bending moments about the x and y axes.
+
+        Returns
+        -------
+        at : float
+            Resistant area.
+        IXX, IYY, IXY : float
+            Moments and product of inertia.
+        """
+        radius = self.shaft_elem.odl / 2
+        depth_ratio = self.depth_ratio
+        J = (np.pi / 4) * radius**4
+        step = radius / self.cross_divisions
+
         CCi = np.zeros(
             (2 * self.cross_divisions + 1, 2 * self.cross_divisions + 1), dtype=complex
         )
@@ -596,7 +757,77 @@ class Crack(ABC):
             if si >= 50:
                 break
 
-        return self._compute_crack_stiffness_flex(Lce, at, IXX, IYY, IXY)
+        return at, IXX, IYY, IXY
+
+    def _get_breathing_table(self):
+        """Resistant area and inertia moments of the Flex Breathing model over a
+        revolution of the shaft.
+
+        The section depends on the bending moment only through whether it is null,
+        as the open part of the crack is where the stress does not vanish, so the
+        table has a row for the unloaded and a row for the loaded section. It is
+        built once per crack and, if the ROSS_CACHE_DIR environment variable is
+        set, saved there for cracks with the same geometry.
+
+        Returns
+        -------
+        table : np.ndarray
+            Array with shape (2, 4, n_breathing_points) with the resistant area and
+            the moments and product of inertia of the unloaded and loaded section
+            at equally spaced angular positions in [0, 2 pi).
+        """
+        if self._breathing_table is not None:
+            return self._breathing_table
+
+        file = self._breathing_table_file()
+
+        if file is not None and file.exists():
+            self._breathing_table = np.load(file)
+            return self._breathing_table
+
+        angular_position = np.linspace(
+            0, 2 * np.pi, self.n_breathing_points, endpoint=False
+        )
+
+        # any bending moment that is not null opens the crack
+        moments = [(0.0, 0.0), (np.cos(1.0), np.sin(1.0))]
+
+        self._breathing_table = np.array(
+            [
+                np.array(
+                    [self._breathing_section(ap, *moment) for ap in angular_position]
+                ).real.T
+                for moment in moments
+            ]
+        )
+
+        if file is not None:
+            file.parent.mkdir(parents=True, exist_ok=True)
+            np.save(file, self._breathing_table)
+
+        return self._breathing_table
+
+    def _breathing_table_file(self):
+        """File of the cached section table of the Flex Breathing model.
+
+        Returns
+        -------
+        file : pathlib.Path or None
+            Path of the .npy file, or None if ROSS_CACHE_DIR is not set.
+        """
+        cache_dir = os.environ.get("ROSS_CACHE_DIR")
+        if not cache_dir:
+            return None
+
+        key = [
+            self.n_breathing_points,
+            self.cross_divisions,
+            self.depth_ratio,
+            self.shaft_elem.odl,
+        ]
+        digest = hashlib.sha1(repr([float(value) for value in key]).encode())
+
+        return Path(cache_dir) / "crack_breathing" / f"{digest.hexdigest()}.npy"
 
     def _get_force_in_time(self, step, disp_resp, ang_pos):
         """Calculate the dynamic force related on given time step.
@@ -618,14 +849,40 @@ class Crack(ABC):
 
         self.disp_resp = disp_resp
 
-        K_crack = self._crack_model(ang_pos)
+        if self._modulation is not None:
+            K_crack = self._assemble_crack_stiffness(self._modulation[step])
+        else:
+            K_crack = self._crack_model(ang_pos)
 
         F = np.zeros(self.rotor.ndof)
         F[self.dofs] = (self.K_elem - K_crack) @ disp_resp[self.dofs]
         self.forces[:, step] = F
+        self._K_crack = K_crack
 
         return F
 
+    def _get_force_jacobian(self):
+        """Calculate the derivatives of the crack force with respect to the
+        displacements, with the crack stiffness of the last evaluated state.
+
+        Returns
+        -------
+        dF_dy : scipy.sparse.csc_matrix
+            Derivative of the force with respect to the displacements.
+        dF_dydot : None
+            The crack force does not depend on the velocities.
+        """
+        n = len(self.dofs)
+        rows = np.repeat(self.dofs, n)
+        cols = np.tile(self.dofs, n)
+
+        dF_dy = csc_matrix(
+            (np.ravel(self.K_elem - self._K_crack), (rows, cols)),
+            shape=(self.rotor.ndof, self.rotor.ndof),
+        )
+
+        return dF_dy, None
+
     def run(self, node, unb_magnitude, unb_phase, speed, t, **kwargs):
         """Run analysis for the system with crack given an unbalance force.
 
@@ -670,9 +927,14 @@ class Crack(ABC):
 
         self.forces = np.zeros((rotor.ndof, len(t)))
 
+        if self._crack_model in (self.mayes, self.gasch):
+            # the direct stiffnesses of the whole run are evaluated at once
+            self._modulation = self._direct_stiffness(ang_pos, self._breathing(ang_pos))
+
         force_crack = lambda step, **state: self._get_force_in_time(
             step, state.get("disp_resp"), ang_pos[step]
         )
+        force_crack.jacobian = lambda step, **state: self._get_force_jacobian()
 
         results = rotor.run_time_response(
             speed=speed,
@@ -7,9 +7,11 @@ a number of options, for the formulation of 6 DoFs (degrees of freedom).
 from abc import ABC
 
 import numpy as np
+from numba import njit
 
 import ross as rs
 from ross.units import Q_, check_units
+from ross.utils import ForceKernel
 
 
 __all__ = ["MisalignmentFlex", "MisalignmentRigid"]
@@ -384,95 +386,28 @@ class MisalignmentRigid(ABC):
             Force matrix of the element due to misalignment.
         """
 
-        kte = 1 / (self.kt1 + self.kt2)
-        kt1 = self.kt1 * kte
-        kt2 = self.kt2 * kte
-        kle = self.kl1 * self.kl2 / (self.kl1 + self.kl2)
+        params = self._kernel_params()
+        y = np.asarray(y, dtype=float)[self.dofs]
+        F = _misalignment_rigid_force(0, y, y, params, np.array([ap], dtype=float))
+        self.phi = params[-1]
 
-        x1 = y[self.dofs[0]]
-        x2 = y[self.dofs[6]]
-
-        y1 = y[self.dofs[1]]
-        y2 = y[self.dofs[7]]
-
-        # fmt: off
-        self.phi = kt1 * ap + kt2 * ap + (
-            kle * kte * self.delta * (
-                (x2 - x1) * np.sin(self.phi) - (y2 - y1) * np.cos(self.phi)
-            )
-        )
-        # fmt: on
-
-        beta = 0
-        sin = np.sin(beta + self.phi)
-        cos = np.cos(beta + self.phi)
-
-        k_beta = np.array(
-            [
-                kle * self.delta * (kt1 * sin),
-                -kle * self.delta * (kt1 * cos),
-                0,
-                0,
-                0,
-                0,
-                kle * self.delta * (kt2 * sin),
-                -kle * self.delta * (kt2 * cos),
-                0,
-                0,
-                0,
-                0,
-            ]
-        )
-
-        K_mis = np.zeros((12, 12))
-        K_mis[5, :] = k_beta
-        K_mis[11, :] = -k_beta
+        return F
 
-        F_mis = np.array(
+    def _kernel_params(self):
+        """Parameters of the misalignment force kernel. The last one is phi."""
+        return np.array(
             [
-                -kle * self.delta * (cos - 1),
-                -kle * self.delta * sin,
-                0,
-                0,
-                0,
+                self.kl1,
+                self.kl2,
+                self.kt1,
+                self.kt2,
+                self.delta,
                 self.input_torque - self.load_torque,
-                kle * self.delta * (cos - 1),
-                kle * self.delta * sin,
-                0,
-                0,
-                0,
-                -(self.input_torque - self.load_torque),
-            ]
+                self.phi,
+            ],
+            dtype=float,
         )
 
-        F = K_mis @ y[self.dofs] + F_mis
-
-        return F
-
-    def _get_force_over_time(self, step, disp_resp, ang_pos):
-        """Calculate the dynamic force on given time step.
-
-        Paramenters
-        -----------
-        step : int
-            Current time step index.
-        disp_resp : np.ndarray
-            Displacement response of the system at the current time step.
-        ang_pos : float
-            Angular position of the shaft at the current time step.
-
-        Returns
-        -------
-        F : np.ndarray
-            Force matrix due to misalignment in the current time step `t[step]`.
-        """
-
-        F = np.zeros(self.rotor.ndof)
-        F[self.dofs] = self.compute_reaction_force(disp_resp, ang_pos)
-        self.forces[:, step] = F
-
-        return F
-
     def run(self, node, unb_magnitude, unb_phase, speed, t, **kwargs):
         """Run analysis for the system with rubbing given an unbalance force.
 
@@ -513,12 +448,16 @@ class MisalignmentRigid(ABC):
 
         self.forces = np.zeros((rotor.ndof, len(t)))
 
-        force_mis = lambda step, **state: self._get_force_over_time(
-            step, state.get("disp_resp"), ang_pos[step]
-        )
-
         self._initialize_params(np.mean(speed))
 
+        force_mis = ForceKernel(
+            _misalignment_rigid_force,
+            self.dofs,
+            self._kernel_params(),
+            ang_pos,
+            jacobian=_misalignment_rigid_jacobian,
+        )
+
         results = rotor.run_time_response(
             speed=speed,
             F=F.T,
@@ -528,9 +467,121 @@ class MisalignmentRigid(ABC):
             **kwargs,
         )
 
+        self.forces[self.dofs] = force_mis.forces
+        self.phi = force_mis.params[-1]
+
         return results
 
 
+@njit
+def _misalignment_rigid_force(step, y, ydot, params, signal):
+    """Rigid coupling misalignment force kernel.
+
+    The parameters are given by MisalignmentRigid._kernel_params, and the
+    coupling angular position phi (the last parameter) is updated in place.
+    The signal is the angular position of the shaft at each time step.
+    """
+    ap = signal[step]
+    delta = params[4]
+    torque = params[5]
+
+    kte = 1 / (params[2] + params[3])
+    kt1 = params[2] * kte
+    kt2 = params[3] * kte
+    kle = params[0] * params[1] / (params[0] + params[1])
+
+    x1 = y[0]
+    x2 = y[6]
+
+    y1 = y[1]
+    y2 = y[7]
+
+    # fmt: off
+    phi = kt1 * ap + kt2 * ap + (
+        kle * kte * delta * (
+            (x2 - x1) * np.sin(params[6]) - (y2 - y1) * np.cos(params[6])
+        )
+    )
+    # fmt: on
+    params[6] = phi
+
+    beta = 0
+    sin = np.sin(beta + phi)
+    cos = np.cos(beta + phi)
+
+    k_beta = np.zeros(12)
+    k_beta[0] = kle * delta * (kt1 * sin)
+    k_beta[1] = -kle * delta * (kt1 * cos)
+    k_beta[6] = kle * delta * (kt2 * sin)
+    k_beta[7] = -kle * delta * (kt2 * cos)
+
+    F = np.zeros(12)
+    F[0] = -kle * delta * (cos - 1)
+    F[1] = -kle * delta * sin
+    F[5] = k_beta @ y + torque
+    F[6] = kle * delta * (cos - 1)
+    F[7] = kle * delta * sin
+    F[11] = -(k_beta @ y) - torque
+
+    return F
+
+
+@njit
+def _misalignment_rigid_jacobian(step, y, ydot, params, signal):
+    """Derivatives of the rigid coupling misalignment force kernel with respect
+    to y and ydot, with phi of the previous evaluation given in params.
+    """
+    ap = signal[step]
+    delta = params[4]
+
+    kte = 1 / (params[2] + params[3])
+    kt1 = params[2] * kte
+    kt2 = params[3] * kte
+    kle = params[0] * params[1] / (params[0] + params[1])
+
+    sin_prev = np.sin(params[6])
+    cos_prev = np.cos(params[6])
+
+    # fmt: off
+    phi = kt1 * ap + kt2 * ap + (
+        kle * kte * delta * (
+            (y[6] - y[0]) * sin_prev - (y[7] - y[1]) * cos_prev
+        )
+    )
+    # fmt: on
+
+    dphi_dy = np.zeros(12)
+    dphi_dy[0] = -kle * kte * delta * sin_prev
+    dphi_dy[1] = kle * kte * delta * cos_prev
+    dphi_dy[6] = -dphi_dy[0]
+    dphi_dy[7] = -dphi_dy[1]
+
+    sin = np.sin(phi)
+    cos = np.cos(phi)
+
+    k_beta = np.zeros(12)
+    k_beta[0] = kle * delta * (kt1 * sin)
+    k_beta[1] = -kle * delta * (kt1 * cos)
+    k_beta[6] = kle * delta * (kt2 * sin)
+    k_beta[7] = -kle * delta * (kt2 * cos)
+
+    dk_beta = np.zeros(12)
+    dk_beta[0] = kle * delta * (kt1 * cos)
+    dk_beta[1] = kle * delta * (kt1 * sin)
+    dk_beta[6] = kle * delta * (kt2 * cos)
+    dk_beta[7] = kle * delta * (kt2 * sin)
+
+    dF_dy = np.zeros((12, 12))
+    dF_dy[0] = kle * delta * sin * dphi_dy
+    dF_dy[1] = -kle * delta * cos * dphi_dy
+    dF_dy[5] = k_beta + (dk_beta @ y) * dphi_dy
+    dF_dy[6] = -dF_dy[0]
+    dF_dy[7] = -dF_dy[1]
+    dF_dy[11] = -dF_dy[5]
+
+    return dF_dy, np.zeros((12, 12))
+
+
 def misalignment_flex_example(mis_type="parallel"):
     """Create an example of a flexible combined misalignment fault.
 
@@ -1,9 +1,11 @@
 from abc import ABC
 
 import numpy as np
+from numba import njit
 
 import ross as rs
 from ross.units import Q_, check_units
+from ross.utils import ForceKernel
 
 __all__ = [
     "Rubbing",
@@ -109,69 +111,24 @@ class Rubbing(ABC):
             Force matrix of the element due to rubbing.
         """
 
-        F_k = np.zeros_like(y)
-        F_c = np.zeros_like(y)
-        F_f = np.zeros_like(y)
-
-        r = self.shaft_elem.odl / 2
-        c = self.contact_damping
-        k = self.contact_stiffness
-        f = self.friction_coeff
-
-        y_r = np.sqrt(y[0] ** 2 + y[1] ** 2)
-        ydot_r = np.sqrt(ydot[0] ** 2 + ydot[1] ** 2)
-
-        if y_r >= self.delta:
-            F_k[0:2] = -k * y[0:2] * (y_r - self.delta) / abs(y_r)
-            F_c[0:2] = -c * ydot[0:2] * ydot_r / abs(ydot_r)
-
-            phi = np.arctan2(y[1], y[0])
-            velc_t = ydot[0] * np.cos(phi) - ydot[1] * np.sin(phi)
-            velc = velc_t + ang_speed * r
-
-            if velc > 0:
-                F_f[0:2] = f * abs(F_k[0:2] + F_c[0:2])
-                F_f[0] = -F_f[0]
-
-            elif velc < 0:
-                F_f[0:2] = f * abs(F_k[0:2] + F_c[0:2])
-                F_f[1] = -F_f[1]
-
-            if self.torque:
-                F_f_r = np.sqrt(F_f[0] ** 2 + F_f[1] ** 2)
-                F_f[5] = F_f_r * r * y[0] / abs(y_r)
-
-        F = F_k + F_c + F_f
-
-        return F
-
-    def _get_force_over_time(self, step, disp_resp, velc_resp, speed):
-        """Calculate the dynamic force on given time step.
-
-        Paramenters
-        -----------
-        step : int
-            Current time step index.
-        disp_resp : np.ndarray
-            Displacement response of the system at the current time step.
-        velc_resp : np.ndarray
-            Velocity response of the system at the current time step.
-        speed : float
-            Rotation speed of the shaft at the current time step.
-
-        Returns
-        -------
-        F : np.ndarray
-            Force matrix due to rubbing in the current time step `t[step]`.
-        """
-
-        F = np.zeros(self.rotor.ndof)
-        F[self.dofs] = self.compute_rubbing_force(
-            disp_resp[self.dofs], velc_resp[self.dofs], speed
+        y = np.asarray(y, dtype=float)
+        ydot = np.asarray(ydot, dtype=float)
+        signal = np.array([ang_speed], dtype=float)
+
+        return _rubbing_force(0, y, ydot, self._kernel_params(), signal)
+
+    def _kernel_params(self):
+        """Parameters of the rubbing force kernel."""
+        return np.array(
+            [
+                self.shaft_elem.odl / 2,
+                self.delta,
+                self.contact_stiffness,
+                self.contact_damping,
+                self.friction_coeff,
+                float(self.torque),
+            ]
         )
-        self.forces[:, step] = F
-
-        return F
 
     def run(self, node, unb_magnitude, unb_phase, speed, t, **kwargs):
         """Run analysis for the system with rubbing given an unbalance force.
@@ -214,8 +171,12 @@ class Rubbing(ABC):
 
         self.forces = np.zeros((rotor.ndof, len(t)))
 
-        force_rubbing = lambda step, **state: self._get_force_over_time(
-            step, state.get("disp_resp"), state.get("velc_resp"), speed[step]
+        force_rubbing = ForceKernel(
+            _rubbing_force,
+            self.dofs,
+            self._kernel_params(),
+            speed,
+            jacobian=_rubbing_jacobian,
         )
 
         results = rotor.run_time_response(
@@ -227,9 +188,110 @@ class Rubbing(ABC):
             **kwargs,
         )
 
+        self.forces[self.dofs] = force_rubbing.forces
+
         return results
 
 
+@njit(error_model="numpy")
+def _rubbing_force(step, y, ydot, params, signal):
+    """Rubbing force kernel, with the parameters given by Rubbing._kernel_params.
+
+    The signal is the angular speed of the shaft at each time step.
+    """
+    r = params[0]
+    delta = params[1]
+    k = params[2]
+    c = params[3]
+    f = params[4]
+    ang_speed = signal[step]
+
+    F = np.zeros(len(y))
+
+    y_r = np.sqrt(y[0] ** 2 + y[1] ** 2)
+    ydot_r = np.sqrt(ydot[0] ** 2 + ydot[1] ** 2)
+
+    if y_r >= delta:
+        F_k = -k * y[0:2] * (y_r - delta) / abs(y_r)
+        F_c = -c * ydot[0:2] * ydot_r / abs(ydot_r)
+        F_f = np.zeros(2)
+
+        phi = np.arctan2(y[1], y[0])
+        velc_t = ydot[0] * np.cos(phi) - ydot[1] * np.sin(phi)
+        velc = velc_t + ang_speed * r
+
+        if velc > 0:
+            F_f[:] = f * np.abs(F_k + F_c)
+            F_f[0] = -F_f[0]
+
+        elif velc < 0:
+            F_f[:] = f * np.abs(F_k + F_c)
+            F_f[1] = -F_f[1]
+
+        F[0:2] = F_k + F_c + F_f
+
+        if params[5]:
+            F_f_r = np.sqrt(F_f[0] ** 2 + F_f[1] ** 2)
+            F[5] = F_f_r * r * y[0] / abs(y_r)
+
+    return F
+
+
+@njit(error_model="numpy")
+def _rubbing_jacobian(step, y, ydot, params, signal):
+    """Derivatives of the rubbing force kernel with respect to y and ydot.
+
+    The direction of the friction force is kept constant, so the derivative
+    is not defined when the tangential velocity changes sign.
+    """
+    r = params[0]
+    delta = params[1]
+    k = params[2]
+    c = params[3]
+    f = params[4]
+    ang_speed = signal[step]
+
+    dF_dy = np.zeros((len(y), len(y)))
+    dF_dydot = np.zeros((len(y), len(y)))
+
+    y_r = np.sqrt(y[0] ** 2 + y[1] ** 2)
+
+    if y_r < delta:
+        return dF_dy, dF_dydot
+
+    u = y[0:2]
+    F_n = -k * u * (y_r - delta) / y_r - c * ydot[0:2]
+
+    dFn_du = -k * ((1 - delta / y_r) * np.eye(2) + delta / y_r**3 * np.outer(u, u))
+    dFn_dv = -c * np.eye(2)
+
+    phi = np.arctan2(y[1], y[0])
+    velc = ydot[0] * np.cos(phi) - ydot[1] * np.sin(phi) + ang_speed * r
+
+    sign = np.zeros(2)
+    if velc > 0:
+        sign[0] = -1.0
+        sign[1] = 1.0
+    elif velc < 0:
+        sign[0] = 1.0
+        sign[1] = -1.0
+
+    for i in range(2):
+        s_i = 1 + f * sign[i] * np.sign(F_n[i])
+        dF_dy[i, 0:2] = s_i * dFn_du[i]
+        dF_dydot[i, 0:2] = s_i * dFn_dv[i]
+
+    if params[5] and velc != 0:
+        F_n_r = np.sqrt(F_n[0] ** 2 + F_n[1] ** 2)
+        ratio = u[0] / y_r
+        dratio_du = np.array([u[1] ** 2, -u[0] * u[1]]) / y_r**3
+
+        dF_dy[5, 0:2] = r * f * (ratio * (F_n @ dFn_du) / F_n_r + F_n_r * dratio_du)
+        dF_dydot[5, 0:2] = r * f * ratio * (F_n @ dFn_dv) / F_n_r
+
+    return dF_dy, dF_dydot
+
+
 def rubbing_example():
     """Create an example of a rubbing fault.
 
@@ -34,6 +34,7 @@ class HarmonicBalance:
         t,
         gravity=False,
         F_ext=None,
+        crack=None,
     ):
         """
         Solve the rotor system in the frequency domain using the
@@ -69,6 +70,9 @@ class HarmonicBalance:
         F_ext : ndarray, optional
             External force array of shape (ndof, N), where N is the number of time
             samples.
+        crack : ross.Crack, optional
+            Crack with the Gasch or Mayes model, whose stiffness variation over a
+            revolution is included in the analysis. Default is None.
 
         Returns
         -------
@@ -94,7 +98,6 @@ class HarmonicBalance:
         rotor = self.rotor
 
         accel = 0  # Assuming always constant speed
-        crack = None  # Assuming there's no crack, crack model needs to be integrated
         freq = Q_(speed, "rad/s").to("Hz").m
         dt = t[1] - t[0]
 
@@ -112,7 +115,7 @@ class HarmonicBalance:
         F = self._assemble_forces(W, Fo, Fn, Fn_s)
 
         # Crack stiffness matrices
-        Ko, Kn, Kn_s = self._crack_stiffness_matrices(dt, freq, crack)
+        Ko, Kn, Kn_s = self._crack_stiffness_matrices(crack)
 
         # Harmonic Balance Matrix
         H = self._build_harmonic_balance_matrix(
@@ -308,19 +311,15 @@ class HarmonicBalance:
 
         return F
 
-    def _crack_stiffness_matrices(self, dt, freq, crack=None):
+    def _crack_stiffness_matrices(self, crack=None):
         """
         Compute Fourier-expanded stiffness matrices for cracked shafts.
 
         Parameters
         ----------
-        dt : float
-            Time step (s).
-        freq : float
-            Rotational frequency (Hz).
-        crack : object, optional
-            Crack model object providing `dofs`, `crack_coeff`, and `_Kflex()`
-            methods.
+        crack : ross.Crack, optional
+            Crack model object providing `dofs` and
+            `stiffness_fourier_coefficients()`.
 
         Returns
         -------
@@ -339,18 +338,13 @@ class HarmonicBalance:
         Kn_s = np.zeros((ndof, ndof, n_aux), dtype=complex)
 
         if crack:
-            dof = crack.dofs
-            crack_coeff = crack.crack_coeff
-
-            Kco, Kcn, Kcn_s = self._Fourier_expansion(crack_coeff, dt, freq, n_aux)
+            dof = np.ix_(crack.dofs, crack.dofs)
 
-            Ko[dof, dof] = crack._Kflex(Kco.reshape(-1, 1))[:, :, 0]
-            Kn_ = crack._Kflex(Kcn)
-            Kn_s_ = crack._Kflex(Kcn_s)
+            Kco, Kcn = crack.stiffness_fourier_coefficients(n_aux)
 
-            for i in range(n_aux):
-                Kn[dof, dof, i] = Kn_[:, :, i]
-                Kn_s[dof, dof, i] = Kn_s_[:, :, i]
+            Ko[dof] = Kco
+            Kn[dof] = Kcn
+            Kn_s[dof] = np.conjugate(Kcn)
 
         return Ko, Kn, Kn_s
 
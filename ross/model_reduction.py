@@ -2,6 +2,7 @@ import warnings
 import numpy as np
 from numpy import linalg as la
 from scipy.linalg import eigh
+from scipy.sparse import issparse
 
 
 class ModelReduction:
@@ -123,7 +124,7 @@ class PseudoModal(ModelReduction):
 
         Parameters
         ----------
-        array: np.ndarray
+        array: np.ndarray or scipy.sparse matrix
             Square matrix to be transformed.
 
         Returns
@@ -131,7 +132,7 @@ class PseudoModal(ModelReduction):
         array_reduced : np.ndarray
             Reduced matrix.
         """
-        return self.transf_matrix.T @ array @ self.transf_matrix
+        return self.transf_matrix.T @ (array @ self.transf_matrix)
 
     def reduce_vector(self, array):
         """Transform a vector from physical to modal space.
@@ -332,14 +333,17 @@ class Guyan(ModelReduction):
 
         Parameters
         ----------
-        matrix : np.ndarray
+        matrix : np.ndarray or scipy.sparse matrix
             The matrix to be rearranged.
 
         Returns
         -------
-        rearranged_matrix : np.ndarray
+        rearranged_matrix : np.ndarray or scipy.sparse matrix
             The rearranged matrix.
         """
+        if issparse(matrix):
+            return matrix.tocsr()[self.reordering][:, self.reordering]
+
         return np.block(
             [
                 [
@@ -358,7 +362,7 @@ class Guyan(ModelReduction):
 
         Parameters
         ----------
-        array: np.ndarray
+        array: np.ndarray or scipy.sparse matrix
             Square matrix to be transformed.
 
         Returns
@@ -366,7 +370,9 @@ class Guyan(ModelReduction):
         array_reduced : np.ndarray
             Reduced matrix.
         """
-        return self.transf_matrix.T @ self._rearrange_matrix(array) @ self.transf_matrix
+        return self.transf_matrix.T @ (
+            self._rearrange_matrix(array) @ self.transf_matrix
+        )
 
     def reduce_vector(self, array):
         """Transform a vector from complete to reduced model.
@@ -5,7 +5,6 @@ gears or gearboxes used to couple different shafts in the MultiRotor class.
 """
 
 import numpy as np
-import scipy as sp
 from plotly import graph_objects as go
 from warnings import warn
 
@@ -389,6 +388,9 @@ class GearElementTVMS(GearElement):
     0.058260...
     """
 
+    # order of the Gauss-Legendre quadratures of the stiffness integrals
+    n_quadrature = 64
+
     @check_units
     def __init__(
         self,
@@ -613,15 +615,17 @@ class GearElementTVMS(GearElement):
 
         Parameters
         ----------
-        pr_angle : float
+        pr_angle : float or np.ndarray
             The pressure angle (rad) at which to perform the transformation.
 
         Returns
         -------
-        tau : float
+        tau : float or np.ndarray
             Corresponding tau angle (rad).
         """
-        tau = pr_angle + involute(pr_angle) - self.tooth_dict["base_angle"]
+        # involute of the pressure angle, evaluated for arrays as well
+        inv = np.tan(pr_angle) - pr_angle
+        tau = pr_angle + inv - self.tooth_dict["base_angle"]
         return tau
 
     def _diff_tau(self, tau):
@@ -739,14 +743,17 @@ class GearElementTVMS(GearElement):
         """Compute the stiffness in the direction of the applied force on the
         gear (line of action), according to the involute profile.
 
+        All the contact angles are evaluated at once, with Gauss-Legendre
+        quadratures of fixed order (`n_quadrature`) for the stiffness integrals.
+
         Parameters
         ----------
-        angle : float
+        angle : float or np.ndarray
             The angle formed by the normal of the contact involute curves and the x axis.
 
         Returns
         -------
-        k : float
+        k : float or np.ndarray
             The sum of the computed stiffness components.
 
         References
@@ -755,7 +762,7 @@ class GearElementTVMS(GearElement):
         calculation of cracked spur gears. Engineering Failure Analysis, 44,
         179-194. https://doi.org/10.1016/j.engfailanal.2014.05.006
         """
-        beta = self._to_tau(angle)
+        beta = self._to_tau(np.asarray(angle, dtype=np.float64))
 
         inv_kf = self._inv_kf(beta)
         inv_ka = self._inv_ka(beta)
@@ -851,9 +858,11 @@ class GearElementTVMS(GearElement):
         inv_ks : float
             The inverse of shear stiffness, 1/ks.
         """
+        beta_ = np.asarray(beta)[..., np.newaxis]
+
         func_ks = lambda angle, compute_curve, diff: (
             1.2
-            * np.cos(beta) ** 2
+            * np.cos(beta_) ** 2
             / (self.material.G_s * compute_curve(angle)[2])
             * diff(angle)
         )
@@ -879,10 +888,12 @@ class GearElementTVMS(GearElement):
         inv_kb : float
             The inverse of bending stiffness, 1/kb.
         """
-        y_op, x_op, _, _ = self._compute_involute_curve(beta)
+        beta_ = np.asarray(beta)[..., np.newaxis]
+        y_op, x_op, _, _ = self._compute_involute_curve(beta_)
 
         func_kb = lambda angle, compute_curve, diff: (
-            (np.cos(beta) * (y_op - compute_curve(angle)[0]) - x_op * np.sin(beta)) ** 2
+            (np.cos(beta_) * (y_op - compute_curve(angle)[0]) - x_op * np.sin(beta_))
+            ** 2
             / (self.material.E * compute_curve(angle)[3])
             * diff(angle)
         )
@@ -908,8 +919,10 @@ class GearElementTVMS(GearElement):
         inv_ka : float
             The inverse of axial stiffness, 1/ka.
         """
+        beta_ = np.asarray(beta)[..., np.newaxis]
+
         func_ka = lambda angle, compute_curve, diff: (
-            np.sin(beta) ** 2
+            np.sin(beta_) ** 2
             / (self.material.E * compute_curve(angle)[2])
             * diff(angle)
         )
@@ -928,17 +941,19 @@ class GearElementTVMS(GearElement):
         ----------
         func : callable
             The function to be integrated. It should accept the angle, the curve
-            computation method, and the differential method.
+            computation method, and the differential method, and broadcast the
+            quadrature nodes along the last axis.
 
         Returns
         -------
-        inv_k_t : float
+        inv_k_t : float or np.ndarray
             The integrated inverse stiffness value for the transition region.
         """
-        inv_k_t, _ = sp.integrate.quad(
-            lambda gamma: func(gamma, self._compute_transition_curve, self._diff_gamma),
-            np.pi / 2,
-            self.pr_angle,
+        gamma, weights = _gauss_legendre(np.pi / 2, self.pr_angle, self.n_quadrature)
+
+        inv_k_t = np.sum(
+            func(gamma, self._compute_transition_curve, self._diff_gamma) * weights,
+            axis=-1,
         )
         return inv_k_t
 
@@ -949,20 +964,21 @@ class GearElementTVMS(GearElement):
         ----------
         func : callable
             The function to be integrated. It should accept the angle, the curve
-            computation method, and the differential method.
-        beta : float
+            computation method, and the differential method, and broadcast the
+            quadrature nodes along the last axis.
+        beta : float or np.ndarray
             The upper limit of integration (current contact angle).
 
         Returns
         -------
-        inv_k_i : float
+        inv_k_i : float or np.ndarray
             The integrated inverse stiffness value for the involute region.
         """
-        tau_c = self.tau_c
-        inv_k_i, error = sp.integrate.quad(
-            lambda tau: func(tau, self._compute_involute_curve, self._diff_tau),
-            tau_c,
-            beta,
+        tau, weights = _gauss_legendre(self.tau_c, beta, self.n_quadrature)
+
+        inv_k_i = np.sum(
+            func(tau, self._compute_involute_curve, self._diff_tau) * weights,
+            axis=-1,
         )
         return inv_k_i
 
@@ -1010,3 +1026,32 @@ class GearElementTVMS(GearElement):
         )
 
         return fig
+
+
+def _gauss_legendre(a, b, n):
+    """Gauss-Legendre nodes and weights of order n in the interval [a, b].
+
+    Parameters
+    ----------
+    a, b : float or np.ndarray
+        Limits of integration. Arrays of limits give nodes and weights with
+        the shape of the limits plus a last axis of size n.
+    n : int
+        Number of nodes.
+
+    Returns
+    -------
+    nodes : np.ndarray
+        Quadrature nodes.
+    weights : np.ndarray
+        Quadrature weights.
+    """
+    x, w = np.polynomial.legendre.leggauss(n)
+
+    a = np.asarray(a, dtype=np.float64)[..., np.newaxis]
+    b = np.asarray(b, dtype=np.float64)[..., np.newaxis]
+
+    nodes = a + (b - a) * (x + 1) / 2
+    weights = w * (b - a) / 2
+
+    return nodes, weights
@@ -5,8 +5,11 @@ the meshing behavior (stiffness, contact ratio and, optionally, backlash)
 between the two gears coupled in a MultiRotor.
 """
 
+import hashlib
 import math
+import os
 import numpy as np
+from pathlib import Path
 from plotly import graph_objects as go
 from warnings import warn
 from numba import njit
@@ -19,6 +22,10 @@ from .utils import involute, mod, interpolate2d, compute_contact_ratio
 
 __all__ = ["Mesh"]
 
+# version of the cached stiffness tables, to be increased whenever the
+# computation of the equivalent stiffness changes
+STIFFNESS_TABLE_VERSION = 1
+
 
 class Mesh:
     """A class representing the meshing behavior between two gears in
@@ -298,16 +305,19 @@ class Mesh:
         process and the contact ratio of the gear pair. It is assumed constant
         rotor speed.
 
+        Angular positions and contact ratios may be arrays, which are
+        broadcast and evaluated at once.
+
         Parameters
         ----------
-        angular_position : float
+        angular_position : float or np.ndarray
             Gear angular position for which the meshing stiffness is calculated (rad).
-        contact_ratio : float
+        contact_ratio : float or np.ndarray
             The contact ratio of the gear pair.
 
         Returns
         -------
-        stiffness : float
+        stiffness : float or np.ndarray
             The total equivalent meshing stiffness at the given angular position.
         """
         cr = contact_ratio
@@ -320,12 +330,18 @@ class Mesh:
         d_meshing = (alpha_a - alpha_c) / cr
         d_alpha = d_meshing / tm_om * theta
 
+        d_alpha, d_meshing = np.broadcast_arrays(d_alpha, d_meshing)
         stiffness = self._angular_equivalent_stiffness(d_alpha)
 
-        if d_alpha <= d_meshing * (cr - 1):
-            stiffness += self._angular_equivalent_stiffness(d_alpha + d_meshing)
+        # second pair of teeth in contact
+        double_contact = d_alpha <= d_meshing * (cr - 1)
+        stiffness = stiffness + np.where(
+            double_contact,
+            self._angular_equivalent_stiffness(d_alpha + d_meshing),
+            0.0,
+        )
 
-        return stiffness
+        return stiffness[()]
 
     def get_square_varying_stiffness(self, theta_range, contact_ratio):
         """Calculate the square varying stiffness of a gear pair.
@@ -440,9 +456,7 @@ class Mesh:
         cr = self.contact_ratio
 
         if stiffness_type == "equivalent":
-            stiffness_range = np.vectorize(self.get_variable_equivalent_stiffness)(
-                theta_range, cr
-            )
+            stiffness_range = self.get_variable_equivalent_stiffness(theta_range, cr)
         elif stiffness_type == "square":
             stiffness_range = self.get_square_varying_stiffness(theta_range, cr)
         else:
@@ -499,9 +513,18 @@ class Mesh:
             stiffness_type = self.stiffness_type
 
         if stiffness_type == "equivalent":
-            stiffness_table = np.vectorize(self.get_variable_equivalent_stiffness)(
-                theta_range[:, None], cr_range[None, :]
-            )
+            file = self._stiffness_table_file(n_points)
+
+            if file is not None and file.exists():
+                stiffness_table = np.load(file)
+            else:
+                stiffness_table = self.get_variable_equivalent_stiffness(
+                    theta_range[:, None], cr_range[None, :]
+                )
+
+                if file is not None:
+                    file.parent.mkdir(parents=True, exist_ok=True)
+                    np.save(file, stiffness_table)
         else:
             stiffness_table = np.array(
                 [self.get_square_varying_stiffness(theta_range, cr) for cr in cr_range]
@@ -509,6 +532,47 @@ class Mesh:
 
         return theta_range, cr_range, stiffness_table
 
+    def _stiffness_table_file(self, n_points):
+        """File of the cached equivalent stiffness table of the gear pair.
+
+        The tables are cached in the directory given by the ROSS_CACHE_DIR
+        environment variable, with a file name that is a hash of the geometry,
+        material and quadrature order of both gears, of the table resolution
+        and of the table version, `STIFFNESS_TABLE_VERSION`.
+
+        Parameters
+        ----------
+        n_points : int
+            Number of data points of the stiffness table.
+
+        Returns
+        -------
+        file : pathlib.Path or None
+            Path of the .npy file, or None if ROSS_CACHE_DIR is not set.
+        """
+        cache_dir = os.environ.get("ROSS_CACHE_DIR")
+        if not cache_dir:
+            return None
+
+        key = [STIFFNESS_TABLE_VERSION, n_points, self.hertzian_stiffness]
+        for gear in (self.driving_gear, self.driven_gear):
+            key += [
+                gear.n_quadrature,
+                gear.material.E,
+                gear.material.G_s,
+                gear.width,
+                gear.bore_diameter,
+                gear.module,
+                gear.n_teeth,
+                gear.pr_angle,
+                gear.addendum_coeff,
+                gear.tip_clearance_coeff,
+            ]
+
+        digest = hashlib.sha1(repr([float(value) for value in key]).encode())
+
+        return Path(cache_dir) / "mesh_stiffness" / f"{digest.hexdigest()}.npy"
+
     def plot_stiffness_profile(
         self,
         n_mesh_period=1,
@@ -699,6 +763,40 @@ class Backlash:
         self._f1 = np.zeros(6)
         self._f2 = np.zeros(6)
 
+        self._dofs1 = np.array(self.driving_gear_dofs, dtype=np.int64)
+        self._dofs2 = np.array(self.driven_gear_dofs, dtype=np.int64)
+        self._params = np.array(
+            [
+                self.pressure_angle,
+                self.orientation_angle,
+                self.helix_angle,
+                self.n_teeth,
+                self.driving_gear_pitch_radius,
+                self.driven_gear_pitch_radius,
+                self.driving_gear_base_radius,
+                self.driven_gear_base_radius,
+                self.driving_gear_addendum_radius,
+                self.driven_gear_addendum_radius,
+                self.damping_ratio,
+                self.module,
+                self.M_eq,
+                self.initial_value,
+                self.error_amp,
+                self.sigma,
+            ],
+            dtype=np.float64,
+        )
+
+        self.allocate(0)
+
+    def allocate(self, n_steps):
+        """Allocate the arrays where the mesh dynamics of each time step are saved.
+
+        Parameters
+        ----------
+        n_steps : int
+            Number of time steps.
+        """
         data_keys = [
             "transmission_error",
             "backlash",
@@ -708,7 +806,8 @@ class Backlash:
             "pressure_angle",
             "contact_ratio",
         ]
-        self._data = {key: list() for key in data_keys}
+        self._results = np.zeros((len(data_keys), n_steps))
+        self._data = dict(zip(data_keys, self._results))
 
     def interpolate_stiffness(self, angular_position, contact_ratio):
         """Interpolate the mesh stiffness value at a given angular position
@@ -760,38 +859,21 @@ class Backlash:
         backlash_force : array-like
             Backlash force.
         """
-        dofs1 = self.driving_gear_dofs
-        dofs2 = self.driven_gear_dofs
-
-        disp1 = disp_resp[dofs1]
-        velc1 = velc_resp[dofs1]
-        disp2 = disp_resp[dofs2]
-        velc2 = velc_resp[dofs2]
-
-        Fm, delta, bt, k_m, d_inst, alpha, contact_ratio = _compute_backlash_force(
-            disp1,
-            velc1,
-            disp2,
-            velc2,
+        if step >= self._results.shape[1]:
+            results = self._results
+            self.allocate(max(step + 1, 2 * results.shape[1]))
+            self._results[:, : results.shape[1]] = results
+
+        return _backlash_force_kernel(
+            step,
+            np.asarray(disp_resp, dtype=np.float64),
+            np.asarray(velc_resp, dtype=np.float64),
             angular_pos,
             speed,
-            self.pressure_angle,
-            self.orientation_angle,
-            self.helix_angle,
-            self.n_teeth,
-            self.driving_gear_pitch_radius,
-            self.driven_gear_pitch_radius,
-            self.driving_gear_base_radius,
-            self.driven_gear_base_radius,
-            self.driving_gear_addendum_radius,
-            self.driven_gear_addendum_radius,
-            self.damping_ratio,
-            self.module,
-            self.M_eq,
-            self.initial_value,
-            self.error_amp,
+            self._dofs1,
+            self._dofs2,
+            self._params,
             self.smooth_operator,
-            self.sigma,
             self.theta_range,
             self.contact_ratio_range,
             self.stiffness_table,
@@ -799,42 +881,174 @@ class Backlash:
             self._d_delta_d2,
             self._f1,
             self._f2,
+            self._results,
         )
 
-        # Force decomposition: Q_i = -Fm * f_(q_i)
-        backlash_force = np.zeros(len(disp_resp))
-        backlash_force[dofs1] = -Fm * self._f1
-        backlash_force[dofs2] = -Fm * self._f2
+    def contact_gap(self, disp_resp, velc_resp, angular_pos, speed):
+        """Signed distance of the transmission error to the backlash limits.
 
-        results = {
-            "transmission_error": delta,
-            "backlash": bt,
-            "mesh_force": Fm,
-            "mesh_stiffness": k_m,
-            "center_distance": d_inst,
-            "pressure_angle": alpha,
-            "contact_ratio": contact_ratio,
-        }
-        self._save_time_results(step, results)
-
-        return backlash_force
-
-    def _save_time_results(self, step, results):
-        """Save time results in data at each step.
+        The gap is positive while the teeth are in contact (on either flank)
+        and negative while they are separated, so its sign changes at tooth
+        separation and re-engagement.
 
         Parameters
         ----------
-        step : int
-            Step number.
-        results : dict
-            Results to save.
+        disp_resp : array-like
+            Displacement response.
+        velc_resp : array-like
+            Velocity response.
+        angular_pos : float
+            Angular position of rotor system.
+        speed : float
+            Speed of the rotor system.
+
+        Returns
+        -------
+        gap : float
+            Absolute transmission error minus the backlash.
         """
-        for key, value in results.items():
-            lst = self._data[key]
-            if step < len(lst):
-                lst[step] = value
-            else:
-                lst.append(value)
+        disp_resp = np.asarray(disp_resp, dtype=np.float64)
+        velc_resp = np.asarray(velc_resp, dtype=np.float64)
+
+        _, delta, bt, _, _, _, _ = _compute_backlash_force(
+            disp_resp[self._dofs1],
+            velc_resp[self._dofs1],
+            disp_resp[self._dofs2],
+            velc_resp[self._dofs2],
+            angular_pos,
+            speed,
+            *self._params[:-1],
+            self.smooth_operator,
+            self._params[-1],
+            self.theta_range,
+            self.contact_ratio_range,
+            self.stiffness_table,
+            self._d_delta_d1,
+            self._d_delta_d2,
+            self._f1,
+            self._f2,
+        )
+
+        return abs(delta) - bt
+
+
+@njit(fastmath=True)
+def _backlash_force_kernel(
+    step,
+    disp_resp,
+    velc_resp,
+    angular_pos,
+    speed,
+    dofs1,
+    dofs2,
+    params,
+    smooth_operator,
+    theta_range,
+    contact_ratio_range,
+    stiffness_table,
+    d_delta_d1,
+    d_delta_d2,
+    f1,
+    f2,
+    results,
+):
+    """Compute the backlash force vector and save the mesh dynamics of a step.
+
+    Parameters
+    ----------
+    step : int
+        Step number, column of `results` where the mesh dynamics are saved.
+    disp_resp, velc_resp : np.ndarray
+        Displacement and velocity responses.
+    angular_pos, speed : float
+        Angular position and speed of the rotor system.
+    dofs1, dofs2 : np.ndarray
+        Degrees of freedom of the driving and driven gears.
+    params : np.ndarray
+        Parameters of `_compute_backlash_force`, from `alpha_0` to `error_amp`,
+        followed by `sigma`.
+    smooth_operator : bool
+        Whether to use a smooth operator.
+    theta_range, contact_ratio_range, stiffness_table : np.ndarray
+        Mesh stiffness table.
+    d_delta_d1, d_delta_d2, f1, f2 : np.ndarray
+        Pre-allocated arrays, as in `_compute_backlash_force`.
+    results : np.ndarray
+        Array with shape (7, n_steps) updated in place with the transmission
+        error, backlash, mesh force, mesh stiffness, center distance, pressure
+        angle and contact ratio.
+
+    Returns
+    -------
+    backlash_force : np.ndarray
+        Backlash force.
+    """
+    (
+        alpha_0,
+        orientation_angle,
+        helix_angle,
+        n_teeth,
+        Rp1,
+        Rp2,
+        Rb1,
+        Rb2,
+        Ra1,
+        Ra2,
+        damping_ratio,
+        module,
+        M_eq,
+        b0,
+        error_amp,
+        sigma,
+    ) = params
+
+    Fm, delta, bt, k_m, d_inst, alpha, contact_ratio = _compute_backlash_force(
+        disp_resp[dofs1],
+        velc_resp[dofs1],
+        disp_resp[dofs2],
+        velc_resp[dofs2],
+        angular_pos,
+        speed,
+        alpha_0,
+        orientation_angle,
+        helix_angle,
+        n_teeth,
+        Rp1,
+        Rp2,
+        Rb1,
+        Rb2,
+        Ra1,
+        Ra2,
+        damping_ratio,
+        module,
+        M_eq,
+        b0,
+        error_amp,
+        smooth_operator,
+        sigma,
+        theta_range,
+        contact_ratio_range,
+        stiffness_table,
+        d_delta_d1,
+        d_delta_d2,
+        f1,
+        f2,
+    )
+
+    # Force decomposition: Q_i = -Fm * f_(q_i)
+    backlash_force = np.zeros(len(disp_resp))
+    backlash_force[dofs1] = -Fm * f1
+    backlash_force[dofs2] = -Fm * f2
+
+    results[0, step] = delta
+    results[1, step] = bt
+    results[2, step] = Fm
+    results[3, step] = k_m
+    results[4, step] = d_inst
+    results[5, step] = alpha
+    results[6, step] = contact_ratio
+
+    return backlash_force
 
 
 @njit(fastmath=True)
@@ -7,9 +7,11 @@ geared rotor-dynamic systems.
 
 import numpy as np
 from re import search
+from scipy import sparse as sps
 from copy import deepcopy as copy
 
 import ross as rs
+from ross.assembly import ScatterPattern
 from ross.rotor_assembly import Rotor
 from ross.units import Q_, check_units
 from ross.utils import make_speed_array
@@ -87,6 +89,9 @@ class MultiRotor(Rotor):
         when plotting the multi-rotor. Default is 'above'.
     tag : str, optional
         A tag to identify the multi-rotor. Default is None.
+    sparse_assembly : bool, optional
+        If True, the global matrices are assembled as sparse (CSR) matrices in
+        the analyses. See :py:class:`ross.Rotor`. Default is False.
 
     Returns
     -------
@@ -173,6 +178,7 @@ class MultiRotor(Rotor):
         orientation_angle=0.0,
         position="above",
         tag=None,
+        sparse_assembly=False,
     ):
         self.rotors = {"driving": driving_rotor, "driven": driven_rotor}
 
@@ -235,6 +241,7 @@ class MultiRotor(Rotor):
             bearing_elements,
             point_mass_elements,
             tag=tag,
+            sparse_assembly=sparse_assembly,
         )
 
         # Create mesh
@@ -251,6 +258,11 @@ class MultiRotor(Rotor):
 
         self.K_coupling = self.compute_coupling_matrix()
 
+        dofs_1 = self.mesh.driving_gear.dof_global_index.values()
+        dofs_2 = self.mesh.driven_gear.dof_global_index.values()
+        self._mesh_dofs = [*dofs_1, *dofs_2]
+        self._mesh_pattern = ScatterPattern([self._mesh_dofs], self.ndof)
+
         if self.mesh.backlash:
             self.add_coupling_stiffness = lambda K0: K0
         else:
@@ -379,7 +391,8 @@ class MultiRotor(Rotor):
         Parameters
         ----------
         driving_matrix : np.ndarray
-            The matrix from the driving rotor.
+            The matrix from the driving rotor. Dense matrices may be stacked
+            along the first axis.
         driven_matrix : np.ndarray
             The matrix from the driven rotor.
 
@@ -388,12 +401,15 @@ class MultiRotor(Rotor):
         global_matrix : np.ndarray
             The combined matrix of the coupled system.
         """
+        if sps.issparse(driving_matrix):
+            return sps.block_diag((driving_matrix, driven_matrix), format="csr")
 
-        global_matrix = np.zeros((self.ndof, self.ndof))
+        shape = np.shape(driving_matrix)[:-2] + (self.ndof, self.ndof)
+        global_matrix = np.zeros(shape)
 
         first_ndof = self.rotors["driving"].ndof
-        global_matrix[:first_ndof, :first_ndof] = driving_matrix
-        global_matrix[first_ndof:, first_ndof:] = driven_matrix
+        global_matrix[..., :first_ndof, :first_ndof] = driving_matrix
+        global_matrix[..., first_ndof:, first_ndof:] = driven_matrix
 
         return global_matrix
 
@@ -697,27 +713,88 @@ class MultiRotor(Rotor):
         ----------
         K0 : np.ndarray
             Stiffness matrix to which the gear mesh stiffness will be added.
+            Dense matrices may be stacked along the first axis.
 
         Returns
         -------
         K0 : np.ndarray
             Stiffness matrix with the gear mesh stiffness contribution added.
         """
-        dofs_1 = self.mesh.driving_gear.dof_global_index.values()
-        dofs_2 = self.mesh.driven_gear.dof_global_index.values()
-        dofs = [*dofs_1, *dofs_2]
+        blocks = [self.K_coupling * self.mesh.stiffness]
+
+        if sps.issparse(K0):
+            return (K0 + self._mesh_pattern.to_sparse(blocks)).tocsr()
+
+        if K0.ndim == 3:
+            blocks = [np.broadcast_to(blocks[0], (len(K0), *blocks[0].shape))]
+            return self._mesh_pattern.add_to_stack(K0, blocks)
+
+        return self._mesh_pattern.add_to(K0, blocks)
+
+    def _bearing_frequency_ratios(self):
+        """Ratios between the frequency of each bearing element and the speed
+        of the driving rotor.
+
+        Returns
+        -------
+        ratios : np.ndarray
+            Gear ratio for the bearings of the driven rotor and one for the
+            bearings of the driving rotor.
+        """
+        return np.array(
+            [
+                self.mesh.gear_ratio if brg.n in self.driven_nodes else 1.0
+                for brg in self.bearing_elements
+            ]
+        )
 
-        K0[np.ix_(dofs, dofs)] += self.K_coupling * self.mesh.stiffness
+    def _speed_varying_base(self, speed, varying, sparse):
+        """Damping and stiffness matrices without the varying bearings and
+        without the coupling stiffness.
 
-        return K0
+        Parameters
+        ----------
+        speed : float
+            Speed of the driving rotor.
+        varying : list
+            Boolean for each bearing element, True if its blocks are left out.
+        sparse : bool
+            If True, sparse matrices are returned.
 
-    def K(self, frequency):
+        Returns
+        -------
+        C, K : np.ndarray or scipy.sparse.csr_matrix
+            Damping and stiffness matrices.
+        """
+        frequency = speed * self._bearing_frequency_ratios()
+        matrices = {
+            "C": self.C(speed, sparse=True),
+            "K": self._join_matrices(
+                self.rotors["driving"].K(speed, sparse=True),
+                self.rotors["driven"].K(speed * self.mesh.gear_ratio, sparse=True),
+            ),
+        }
+
+        base = []
+        for matrix, full_matrix in matrices.items():
+            blocks = [
+                -getattr(brg, matrix)(freq) if var else 0 * getattr(brg, matrix)(freq)
+                for brg, freq, var in zip(self.bearing_elements, frequency, varying)
+            ]
+            base.append(self._assemble_bearings(full_matrix, blocks, sparse))
+
+        return tuple(base)
+
+    def K(self, frequency, sparse=False):
         """Stiffness matrix for a multi-rotor.
 
         Parameters
         ----------
         frequency : float, optional
             Excitation frequency.
+        sparse : bool, optional
+            If True, a scipy.sparse CSR matrix is returned.
+            Default is False.
 
         Returns
         -------
@@ -736,12 +813,14 @@ class MultiRotor(Rotor):
 
         return self.add_coupling_stiffness(
             self._join_matrices(
-                self.rotors["driving"].K(frequency),
-                self.rotors["driven"].K(frequency * self.mesh.gear_ratio),
+                self.rotors["driving"].K(frequency, sparse=sparse),
+                self.rotors["driven"].K(
+                    frequency * self.mesh.gear_ratio, sparse=sparse
+                ),
             )
         )
 
-    def Ksdt(self):
+    def Ksdt(self, sparse=False):
         """Dynamic stiffness matrix for a multi-rotor.
 
         Stiffness matrix associated with the transient motion of the
@@ -750,6 +829,12 @@ class MultiRotor(Rotor):
         of the driven rotor is scaled by the gear ratio before being combined
         with the driving rotor matrix.
 
+        Parameters
+        ----------
+        sparse : bool, optional
+            If True, a scipy.sparse CSR matrix is returned.
+            Default is False.
+
         Returns
         -------
         Ksdt0 : np.ndarray
@@ -768,11 +853,11 @@ class MultiRotor(Rotor):
         """
 
         return self._join_matrices(
-            self.rotors["driving"].Ksdt(),
-            -self.mesh.gear_ratio * self.rotors["driven"].Ksdt(),
+            self.rotors["driving"].Ksdt(sparse=sparse),
+            -self.mesh.gear_ratio * self.rotors["driven"].Ksdt(sparse=sparse),
         )
 
-    def M(self, frequency=None, synchronous=False):
+    def M(self, frequency=None, synchronous=False, sparse=False):
         """Mass matrix for a multi-rotor.
 
         Parameters
@@ -780,6 +865,9 @@ class MultiRotor(Rotor):
         synchronous : bool, optional
             If True a synchronous analysis is carried out.
             Default is False.
+        sparse : bool, optional
+            If True, a scipy.sparse CSR matrix is returned.
+            Default is False.
 
         Returns
         -------
@@ -798,22 +886,27 @@ class MultiRotor(Rotor):
 
         if frequency is None:
             return self._join_matrices(
-                self.rotors["driving"].M(synchronous=synchronous),
-                self.rotors["driven"].M(synchronous=synchronous),
+                self.rotors["driving"].M(synchronous=synchronous, sparse=sparse),
+                self.rotors["driven"].M(synchronous=synchronous, sparse=sparse),
             )
         else:
             return self._join_matrices(
-                self.rotors["driving"].M(frequency, synchronous),
-                self.rotors["driven"].M(frequency * self.mesh.gear_ratio, synchronous),
+                self.rotors["driving"].M(frequency, synchronous, sparse=sparse),
+                self.rotors["driven"].M(
+                    frequency * self.mesh.gear_ratio, synchronous, sparse=sparse
+                ),
             )
 
-    def C(self, frequency):
+    def C(self, frequency, sparse=False):
         """Damping matrix for a multi-rotor rotor.
 
         Parameters
         ----------
         frequency : float
             Excitation frequency.
+        sparse : bool, optional
+            If True, a scipy.sparse CSR matrix is returned.
+            Default is False.
 
         Returns
         -------
@@ -824,24 +917,94 @@ class MultiRotor(Rotor):
         --------
         >>> multi_rotor = two_shaft_rotor_example()
         >>> multi_rotor.C(0)[:4, :4] / 1e3
-        array([[ 3.,  0.,  0.,  0.],
-               [ 0.,  3.,  0., -0.],
-               [ 0.,  0.,  0.,  0.],
-               [ 0., -0.,  0.,  0.]])
+        array([[3., 0., 0., 0.],
+               [0., 3., 0., 0.],
+               [0., 0., 0., 0.],
+               [0., 0., 0., 0.]])
         """
 
         return self._join_matrices(
-            self.rotors["driving"].C(frequency),
-            self.rotors["driven"].C(frequency * self.mesh.gear_ratio),
+            self.rotors["driving"].C(frequency, sparse=sparse),
+            self.rotors["driven"].C(frequency * self.mesh.gear_ratio, sparse=sparse),
+        )
+
+    def assemble_matrices(self, frequency, sparse=False, nu=0):
+        """Mass, stiffness and damping matrices for an array of frequencies.
+
+        The driven rotor matrices are evaluated at the frequencies scaled by
+        the gear ratio.
+
+        Parameters
+        ----------
+        frequency : array_like
+            Excitation frequencies (rad/s) of the driving rotor.
+        sparse : bool, optional
+            If True, lists of scipy.sparse CSR matrices are returned.
+            Default is False.
+        nu : int, optional
+            Order of the derivative of the matrices with respect to the
+            frequency of the driving rotor. Default is 0.
+
+        Returns
+        -------
+        M : np.ndarray or list
+            Mass matrices with shape (n_freq, ndof, ndof).
+        K : np.ndarray or list
+            Stiffness matrices with shape (n_freq, ndof, ndof).
+        C : np.ndarray or list
+            Damping matrices with shape (n_freq, ndof, ndof).
+
+        Examples
+        --------
+        >>> multi_rotor = two_shaft_rotor_example()
+        >>> M, K, C = multi_rotor.assemble_matrices([0, 100])
+        >>> np.allclose(K[1], multi_rotor.K(100))
+        True
+        """
+        frequency = np.atleast_1d(np.asarray(frequency, dtype=np.float64))
+
+        gear_ratio = self.mesh.gear_ratio
+        driving = self.rotors["driving"].assemble_matrices(
+            frequency, sparse=sparse, nu=nu
         )
+        driven = self.rotors["driven"].assemble_matrices(
+            frequency * gear_ratio, sparse=sparse, nu=nu
+        )
+        if nu:
+            # chain rule for the derivatives of the driven rotor matrices
+            scale = gear_ratio**nu
+            if sparse:
+                driven = [[m * scale for m in matrices] for matrices in driven]
+            else:
+                driven = [matrices * scale for matrices in driven]
+
+        if sparse:
+            M, K, C = (
+                [self._join_matrices(a, b) for a, b in zip(driving[i], driven[i])]
+                for i in range(3)
+            )
+            if not nu:
+                K = [self.add_coupling_stiffness(k) for k in K]
+        else:
+            M, K, C = (self._join_matrices(driving[i], driven[i]) for i in range(3))
+            if not nu:
+                K = self.add_coupling_stiffness(K)
 
-    def G(self):
+        return M, K, C
+
+    def G(self, sparse=False):
         """Gyroscopic matrix for a multi-rotor.
 
         For time-dependent analyses, this matrix needs to be multiplied by the
         rotor speed. Therefore, the gyroscopic matrix of the driven rotor is
         scaled by the gear ratio before being combined with the driving rotor matrix.
 
+        Parameters
+        ----------
+        sparse : bool, optional
+            If True, a scipy.sparse CSR matrix is returned.
+            Default is False.
+
         Returns
         -------
         G0 : np.ndarray
@@ -858,10 +1021,21 @@ class MultiRotor(Rotor):
         """
 
         return self._join_matrices(
-            self.rotors["driving"].G(),
-            -self.mesh.gear_ratio * self.rotors["driven"].G(),
+            self.rotors["driving"].G(sparse=sparse),
+            -self.mesh.gear_ratio * self.rotors["driven"].G(sparse=sparse),
         )
 
+    def _use_compiled_integration(self, speed, xout, reduced, **kwargs):
+        """Check if the time integration can run in the compiled Newmark loop.
+
+        The backlash force and the time-varying mesh stiffness are computed
+        in Python, so the compiled loop is only used without them.
+        """
+        if self.mesh.backlash or self.update_mesh_stiffness:
+            return False
+
+        return super()._use_compiled_integration(speed, xout, reduced, **kwargs)
+
     def _rotor_system_for_integrate(
         self, rotor, speed, t, reduce_model, forces, **kwargs
     ):
@@ -872,42 +1046,135 @@ class MultiRotor(Rotor):
         if self.mesh.backlash:
             speed, theta, _ = make_speed_array(speed, t)
 
+            def rotation_state(step, curr_state):
+                """Time, angular position and speed of the state.
+
+                The robust Newmark method passes the time of its sub-steps,
+                at which the angular position and speed are interpolated.
+                """
+                time = curr_state.get("time")
+                if time is None:
+                    return t[step], theta[step], speed[step]
+                return time, np.interp(time, t, theta), np.interp(time, t, speed)
+
+            def backlash_force(step, **curr_state):
+                time, angular_pos, angular_speed = rotation_state(step, curr_state)
+                return self.mesh.backlash.compute_force(
+                    step=step,
+                    disp_resp=reduce_model[2](curr_state.get("disp_resp")),
+                    velc_resp=reduce_model[2](curr_state.get("velc_resp")),
+                    time=time,
+                    angular_pos=angular_pos,
+                    speed=angular_speed,
+                )
+
             updated_forces = lambda step, **curr_state: (
                 forces(step, **curr_state)
-                + reduce_model[1](
-                    self.mesh.backlash.compute_force(
-                        step=step,
-                        disp_resp=reduce_model[2](curr_state.get("disp_resp")),
-                        velc_resp=reduce_model[2](curr_state.get("velc_resp")),
-                        time=t[step],
-                        angular_pos=theta[step],
-                        speed=speed[step],
-                    )
-                )
+                + reduce_model[1](backlash_force(step, **curr_state))
             )
 
+            # mesh dynamics are saved at each time step, starting at rest
+            backlash = self.mesh.backlash
+            backlash.allocate(len(t))
+            backlash.compute_force(
+                0, np.zeros(self.ndof), np.zeros(self.ndof), t[0], theta[0], speed[0]
+            )
+
+            # the robust Newmark method refines the time step around tooth
+            # separation and re-engagement, where the sign of the gap changes.
+            # The gap is evaluated with the same state as the contact force
+            def contact_gap(step, **curr_state):
+                _, angular_pos, angular_speed = rotation_state(step, curr_state)
+                return backlash.contact_gap(
+                    disp_resp=reduce_model[2](curr_state.get("disp_resp")),
+                    velc_resp=reduce_model[2](curr_state.get("velc_resp")),
+                    angular_pos=angular_pos,
+                    speed=angular_speed,
+                )
+
+            updated_forces.event = contact_gap
+
         elif self.update_mesh_stiffness:
             speed, theta, accel = make_speed_array(speed, t)
             reduce_matrix = reduce_model[0]
+            sparse = self.sparse_assembly
 
             # Assemble matrices
-            M = reduce_matrix(kwargs.get("M", self.M()))
-            C2 = reduce_matrix(kwargs.get("G", self.G()))
-            K2 = reduce_matrix(kwargs.get("Ksdt", self.Ksdt()))
-
-            def rotor_system(step, **current_state):
-                C1 = reduce_matrix(self.C(speed[step]))
-
-                # Update mesh stiffness
-                self.mesh.stiffness = self.mesh.interpolate_stiffness(theta[step])
-                K1 = reduce_matrix(self.K(speed[step]))
-
-                return (
-                    M,
-                    C1 + C2 * speed[step],
-                    K1 + K2 * accel[step],
-                    updated_forces(step, **current_state),
+            M = reduce_matrix(kwargs.get("M", self.M(sparse=sparse)))
+            C2 = reduce_matrix(kwargs.get("G", self.G(sparse=sparse)))
+            K2 = reduce_matrix(kwargs.get("Ksdt", self.Ksdt(sparse=sparse)))
+
+            # Only the mesh stiffness changes at each step, multiplying the
+            # coupling matrix, which is assembled and reduced once
+            stiffness = self.mesh.interpolate_stiffness(theta)
+            K_mesh = reduce_matrix(
+                self._mesh_pattern.to_sparse([self.K_coupling])
+                if sparse
+                else self._mesh_pattern.to_dense([self.K_coupling])
+            )
+
+            def base_matrices(frequency):
+                C1 = reduce_matrix(self.C(frequency, sparse=sparse))
+                K1 = reduce_matrix(
+                    self._join_matrices(
+                        self.rotors["driving"].K(frequency, sparse=sparse),
+                        self.rotors["driven"].K(
+                            frequency * self.mesh.gear_ratio, sparse=sparse
+                        ),
+                    )
                 )
+                return C1, K1
+
+            if np.all(speed == speed[0]):
+                C1, K1 = base_matrices(speed[0])
+                C = C1 + C2 * speed[0]
+
+                def rotor_system(step, **current_state):
+                    self.mesh.stiffness = stiffness[step]
+
+                    return (
+                        M,
+                        C,
+                        K1 + K_mesh * stiffness[step],
+                        updated_forces(step, **current_state),
+                    )
+
+                # The coupling matrix has a low rank, K_coupling = Q diag(s) Q^T,
+                # so the Newmark Jacobian is factorized only once
+                s, Q = np.linalg.eigh(self.K_coupling)
+                rank = np.abs(s) > 1e-12 * np.abs(s).max()
+                s, Q = s[rank], Q[:, rank]
+
+                U = np.zeros((self.ndof, len(s)))
+                U[self._mesh_dofs] = Q
+
+                rotor_system.low_rank_stiffness = (
+                    K1,
+                    reduce_model[1](U),
+                    lambda step: s * stiffness[step],
+                )
+
+            else:
+                if any(brg.frequency is not None for brg in self.bearing_elements):
+                    # only the blocks of the bearings with variable coefficients
+                    # are updated at each step
+                    bearing_matrices = self._speed_varying_bearings(
+                        speed, reduce_model, M.shape[0], sparse
+                    )
+                else:
+                    base = base_matrices(speed[0])
+                    bearing_matrices = lambda step: base
+
+                def rotor_system(step, **current_state):
+                    self.mesh.stiffness = stiffness[step]
+                    C1, K1 = bearing_matrices(step)
+
+                    return (
+                        M,
+                        C1 + C2 * speed[step],
+                        K1 + K_mesh * stiffness[step] + K2 * accel[step],
+                        updated_forces(step, **current_state),
+                    )
 
             return rotor_system, updated_forces
 
@@ -952,7 +1219,15 @@ class MultiRotor(Rotor):
         """
         if self.mesh.backlash:
             t_, yout, xout = self.time_response(speed, F, t, method=method, **kwargs)
-            results = BacklashResults(self, t, yout, xout)
+
+            # mesh dynamics are kept at the same time steps of the response
+            decimation = kwargs.get("output_decimation", 1)
+            backlash = self.mesh.backlash
+            backlash._data = {
+                key: value[::decimation] for key, value in backlash._data.items()
+            }
+
+            results = BacklashResults(self, t_, yout, xout)
         else:
             results = super().run_time_response(speed, F, t, method=method, **kwargs)
 
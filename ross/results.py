@@ -6,7 +6,8 @@ This module returns graphs for each type of analyses in rotor_assembly.py.
 import copy
 import inspect
 from abc import ABC
-from collections.abc import Iterable
+from collections import OrderedDict
+from collections.abc import Iterable, Sequence
 from warnings import warn
 
 import matplotlib.pyplot as plt
@@ -36,6 +37,7 @@ __all__ = [
     "ClearanceResults",
     "FrequencyResponseResults",
     "ForcedResponseResults",
+    "InfluenceCoefficientResults",
     "StaticResults",
     "SummaryResults",
     "ConvergenceResults",
@@ -450,6 +452,198 @@ def _init_orbit(ru_e, rv_e):
     )
 
 
+def _orbit_parameters(ru_e, rv_e):
+    """Orbit parameters for arrays of complex responses.
+
+    Vectorized counterpart of `_init_orbit`, evaluated with array operations
+    for any number of orbits (e.g. all nodes x all modes). The ellipse axes
+    are the square roots of the eigenvalues of H = T.T^T, which are obtained
+    in closed form for the 2x2 symmetric matrix.
+
+    Parameters
+    ----------
+    ru_e : array_like
+        Complex elements corresponding to the x direction.
+    rv_e : array_like
+        Complex elements corresponding to the y direction, with the same
+        shape as ru_e.
+
+    Returns
+    -------
+    parameters : dict
+        Dictionary with arrays for "forward" and "backward" (radii of the
+        forward and backward whirl components), "minor_axis", "major_axis",
+        "kappa", "major_x", "major_y", "major_angle", "x0", "y0" and
+        "angle_0", with the same shape as the inputs.
+
+    Examples
+    --------
+    >>> parameters = _orbit_parameters(np.array([1 + 1j]), np.array([1 - 1j]))
+    >>> parameters["kappa"]
+    array([1.])
+    """
+    ru_e = np.asarray(ru_e, dtype=np.complex128)
+    rv_e = np.asarray(rv_e, dtype=np.complex128)
+
+    ru = np.absolute(ru_e)
+    rv = np.absolute(rv_e)
+    nu = np.angle(ru_e)
+    nv = np.angle(rv_e)
+
+    # H = [[a, b], [b, c]]
+    a = ru**2
+    c = rv**2
+    b = ru * rv * np.cos(nu - nv)
+
+    mean = (a + c) / 2
+    radius = np.hypot((a - c) / 2, b)
+    minor = np.sqrt(np.maximum(mean - radius, 0.0))
+    major = np.sqrt(np.maximum(mean + radius, 0.0))
+
+    # we need to evaluate if 0 < nv - nu < pi.
+    diff = nv - nu
+    diff = np.where(diff < -np.pi, diff + 2 * np.pi, diff)
+    diff = np.where(diff > np.pi, diff - 2 * np.pi, diff)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = minor / major
+    # if nv = nu or nv = nu + pi then the response is a straight line.
+    kappa = np.where(
+        (diff == 0) | (diff == np.pi),
+        0.0,
+        np.where((0 < diff) & (diff < np.pi), -ratio, ratio),
+    )
+
+    # major axis direction in the upper half plane [0, pi)
+    theta = np.mod(np.arctan2(2 * b, a - c) / 2, np.pi)
+    major_x = major * np.cos(theta)
+    major_y = major * np.sin(theta)
+    major_angle = np.mod(np.arctan2(major_y, major_x), 2 * np.pi)
+
+    x0 = ru_e.real
+    y0 = rv_e.real
+    angle_0 = np.mod(np.arctan2(y0, x0), 2 * np.pi)
+
+    # radii of the forward and backward rotating circles composing the orbit
+    forward = np.absolute(ru_e + 1j * rv_e) / 2
+    backward = np.absolute(ru_e - 1j * rv_e) / 2
+
+    return {
+        "forward": forward,
+        "backward": backward,
+        "minor_axis": minor,
+        "major_axis": major,
+        "kappa": kappa,
+        "major_x": major_x,
+        "major_y": major_y,
+        "major_angle": major_angle,
+        "x0": x0,
+        "y0": y0,
+        "angle_0": angle_0,
+    }
+
+
+def _normalize_modes(vectors, number_dof):
+    """Normalize mode shapes by their largest lateral displacement.
+
+    Parameters
+    ----------
+    vectors : np.ndarray
+        Complex array with one mode shape per column.
+    number_dof : int
+        Number of degrees of freedom per node.
+
+    Returns
+    -------
+    vectors : np.ndarray
+        Copy of the vectors, each one divided by its x or y displacement with
+        the largest magnitude.
+    """
+    vectors = np.array(vectors, dtype=np.complex128)
+    columns = np.arange(vectors.shape[1])
+
+    modex = np.abs(vectors[0::number_dof])
+    modey = np.abs(vectors[1::number_dof])
+    ixmax = np.argmax(modex, axis=0)
+    iymax = np.argmax(modey, axis=0)
+
+    use_y = modey[iymax, columns] > modex[ixmax, columns]
+    rows = np.where(use_y, number_dof * iymax + 1, number_dof * ixmax)
+
+    return vectors / vectors[rows, columns]
+
+
+def _classify_modes(vectors, number_dof):
+    """Classify mode shapes as Lateral, Axial or Torsional.
+
+    The predominant type of degree of freedom in each mode shape defines its
+    type.
+
+    Parameters
+    ----------
+    vectors : np.ndarray
+        Complex array with one mode shape per column.
+    number_dof : int
+        Number of degrees of freedom per node.
+
+    Returns
+    -------
+    mode_type : np.ndarray
+        Array of strings with the mode type of each column.
+    """
+    n_modes = vectors.shape[1]
+
+    if number_dof == 1:
+        return np.full(n_modes, "Torsional", dtype=object)
+
+    mode_type = np.full(n_modes, "Lateral", dtype=object)
+
+    if number_dof == 6:
+        magnitude = np.abs(vectors)
+        nonzero = magnitude / la.norm(magnitude, axis=0) > 0.08
+
+        dofs_count = nonzero.reshape(-1, number_dof, n_modes).sum(axis=0)
+        total = dofs_count.sum(axis=0)
+
+        axial = dofs_count[2] / total > 0.9
+        torsional = dofs_count[5] / total > 0.9
+        mode_type[axial] = "Axial"
+        mode_type[torsional & ~axial] = "Torsional"
+
+    return mode_type
+
+
+def _shape_whirl(kappa, axis=-1):
+    """Whirl direction of shapes from the kappa of their orbits.
+
+    Parameters
+    ----------
+    kappa : np.ndarray
+        Kappa values of the orbits of each shape.
+    axis : int, optional
+        Axis along the orbits of a shape. Default is -1.
+
+    Returns
+    -------
+    whirl : np.ndarray
+        Array of strings: "Forward" if all orbits are forward, "Backward" if
+        all orbits are backward, "Mixed" otherwise.
+    """
+    forward = kappa > 0
+    return np.where(
+        forward.all(axis=axis),
+        "Forward",
+        np.where((~forward).all(axis=axis), "Backward", "Mixed"),
+    ).astype(object)
+
+
+_WHIRL_COLORS = {
+    "Forward": tableau_colors["blue"],
+    "Backward": tableau_colors["red"],
+    "Mixed": tableau_colors["gray"],
+}
+
+
 class Shape(Results):
     """Class used to construct a mode or a deflected shape from a eigen or response vector.
 
@@ -488,18 +682,11 @@ class Shape(Results):
         evec = np.copy(vector)
 
         if self.normalize:
-            modex = evec[0 :: self.number_dof]
-            modey = evec[1 :: self.number_dof]
-            xmax, ixmax = max(abs(modex)), np.argmax(abs(modex))
-            ymax, iymax = max(abs(modey)), np.argmax(abs(modey))
-
-            if ymax > xmax:
-                evec /= modey[iymax]
-            else:
-                evec /= modex[ixmax]
+            evec = _normalize_modes(evec[:, np.newaxis], self.number_dof)[:, 0]
 
         self._evec = evec
-        self.orbits = None
+        self._orbits = None
+        self._orbit_data = None
         self.whirl = None
         self.color = None
         self.xn = None
@@ -517,56 +704,52 @@ class Shape(Results):
         Classifies the mode type as Lateral, Axial, or Torsional based on the
         predominant degree of freedom in the eigenvector.
         """
-        self.mode_type = "Lateral"
+        self.mode_type = _classify_modes(
+            np.asarray(self.vector)[:, np.newaxis], self.number_dof
+        )[0]
 
-        if self.number_dof == 6:
-            size = len(self.vector)
+        if self.mode_type == "Axial":
+            self.color = tableau_colors["orange"]
+        elif self.mode_type == "Torsional":
+            self.color = tableau_colors["green"]
 
-            norm_vec = abs(self.vector) / la.norm(abs(self.vector))
-            nonzero_dofs = np.where(norm_vec > 0.08)[0]
+    @property
+    def orbits(self):
+        """Orbit objects of each node, built on first access.
 
-            dofs_count = [
-                sum(np.isin(np.arange(i, size, self.number_dof), nonzero_dofs))
-                for i in range(self.number_dof)
+        Orbits are only available for lateral modes, otherwise this is None.
+        """
+        if self._orbits is None and self._orbit_data is not None:
+            self._orbits = [
+                Orbit(node=node, node_pos=node_pos, ru_e=ru_e, rv_e=rv_e)
+                for node, node_pos, ru_e, rv_e in zip(
+                    self.nodes,
+                    self.nodes_pos,
+                    self._orbit_data["ru_e"],
+                    self._orbit_data["rv_e"],
+                )
             ]
 
-            axial_percent = dofs_count[2] / sum(dofs_count)
-            torsional_percent = dofs_count[5] / sum(dofs_count)
-
-            if axial_percent > 0.9:
-                self.mode_type = "Axial"
-                self.color = tableau_colors["orange"]
-
-            elif torsional_percent > 0.9:
-                self.mode_type = "Torsional"
-                self.color = tableau_colors["green"]
-
-        elif self.number_dof == 1:
-            self.mode_type = "Torsional"
-            self.color = tableau_colors["green"]
+        return self._orbits
 
     def _calculate_orbits(self):
-        """Calculate orbits for each node in the shape."""
-        orbits = []
-        whirl = []
+        """Calculate the orbit parameters of all nodes in the shape.
 
-        for node, node_pos in zip(self.nodes, self.nodes_pos):
-            ru_e, rv_e = self._evec[self.number_dof * node : self.number_dof * node + 2]
-            orbit = Orbit(node=node, node_pos=node_pos, ru_e=ru_e, rv_e=rv_e)
-            orbits.append(orbit)
-            whirl.append(orbit.whirl)
+        The parameters are computed with array operations, and Orbit objects
+        are only built when the orbits are accessed (e.g. for plotting).
+        """
+        dofs = self.number_dof * np.asarray(self.nodes)
+        ru_e = self._evec[dofs]
+        rv_e = self._evec[dofs + 1]
+
+        self._orbit_data = _orbit_parameters(ru_e, rv_e)
+        self._orbit_data["ru_e"] = ru_e
+        self._orbit_data["rv_e"] = rv_e
+        self._orbits = None
 
-        self.orbits = orbits
         # check shape whirl
-        if all(w == "Forward" for w in whirl):
-            self.whirl = "Forward"
-            self.color = tableau_colors["blue"]
-        elif all(w == "Backward" for w in whirl):
-            self.whirl = "Backward"
-            self.color = tableau_colors["red"]
-        else:
-            self.whirl = "Mixed"
-            self.color = tableau_colors["gray"]
+        self.whirl = _shape_whirl(self._orbit_data["kappa"])[()]
+        self.color = _WHIRL_COLORS[self.whirl]
 
     def _calculate(self):
         """Calculate shape data for plotting.
@@ -598,13 +781,6 @@ class Shape(Results):
             xn_complex = np.zeros(shape, dtype=np.complex128)
             yn_complex = np.zeros(shape, dtype=np.complex128)
             zn = np.zeros(shape)
-            major = np.zeros(shape)
-            major_x = np.zeros(shape)
-            major_y = np.zeros(shape)
-            major_angle = np.zeros(shape)
-            x0 = np.zeros(shape)
-            y0 = np.zeros(shape)
-            angle_0 = np.zeros(shape)
 
             N1 = onn - 3 * zeta**2 + 2 * zeta**3
             N2 = zeta - 2 * zeta**2 + zeta**3
@@ -651,33 +827,23 @@ class Shape(Results):
                     yn_complex[pos0:pos1] = Ny @ evec[yy]
 
                     k += 1
-                    for i in range(pos0, pos1):
-                        orb = Orbit(
-                            node=0, node_pos=0, ru_e=xn_complex[i], rv_e=yn_complex[i]
-                        )
-
-                        major[i] = orb.major_axis
-                        major_x[i] = orb.major_x
-                        major_y[i] = orb.major_y
-                        major_angle[i] = orb.major_angle
-
-                        x0[i] = orb.x_circle[0]
-                        y0[i] = orb.y_circle[0]
-                        angle_0[i] = orb.angle[0]
 
                 n0 = n1
                 e0 = e1
 
+            # orbit parameters of all the line points at once
+            line_orbits = _orbit_parameters(xn_complex, yn_complex)
+
             self.xn = xn
             self.yn = yn
             self.zn = zn
-            self.major_axis = major
-            self.major_x = major_x
-            self.major_y = major_y
-            self.major_angle = major_angle
-            self.x0 = x0
-            self.y0 = y0
-            self.angle_0 = angle_0
+            self.major_axis = line_orbits["major_axis"]
+            self.major_x = line_orbits["major_x"]
+            self.major_y = line_orbits["major_y"]
+            self.major_angle = line_orbits["major_angle"]
+            self.x0 = line_orbits["x0"]
+            self.y0 = line_orbits["y0"]
+            self.angle_0 = line_orbits["angle_0"]
 
         else:
             self.whirl = "None"
@@ -1713,6 +1879,51 @@ class CriticalSpeedResults(Results):
         return Q_(self.__dict__["_wd"], "rad/s").to(frequency_units).m
 
 
+class _ModeShapes(Sequence):
+    """Lazy sequence with the mode shapes of a ModalResults.
+
+    Each Shape, with its orbits, is built on first access. At most `maxsize`
+    shapes are cached, the least recently used being discarded first, so that
+    results that are stored but never plotted (e.g. the modal results of each
+    speed of a Campbell diagram) only hold eigenvalues and eigenvectors.
+
+    Parameters
+    ----------
+    results : ModalResults
+        Modal results that own the eigenvectors.
+    maxsize : int, optional
+        Maximum number of cached shapes. Default is 32.
+    """
+
+    def __init__(self, results, maxsize=32):
+        self.results = results
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+
+    def __len__(self):
+        return len(self.results.wn)
+
+    def __getitem__(self, mode):
+        if isinstance(mode, slice):
+            return [self[i] for i in range(*mode.indices(len(self)))]
+
+        mode = range(len(self))[mode]
+        if mode in self._cache:
+            self._cache.move_to_end(mode)
+            return self._cache[mode]
+
+        shape = self.results._shape(mode)
+        self._cache[mode] = shape
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+        return shape
+
+    def clear(self):
+        """Discard the cached shapes."""
+        self._cache.clear()
+
+
 class ModalResults(Results):
     """Class used to store results and provide plots for Modal Analysis.
 
@@ -1761,6 +1972,8 @@ class ModalResults(Results):
         shaft_elements_length,
         number_dof,
     ):
+        self._shapes = _ModeShapes(self)
+        self._orbit_data = None
         self.speed = speed
         self.evalues = evalues
         self.evectors = evectors
@@ -1773,32 +1986,88 @@ class ModalResults(Results):
         self.nodes_pos = nodes_pos
         self.shaft_elements_length = shaft_elements_length
         self.number_dof = number_dof
+
+    @property
+    def evectors(self):
+        """Eigenvectors array."""
+        return self._evectors
+
+    @evectors.setter
+    def evectors(self, evectors):
+        self._evectors = evectors
         self.update_mode_shapes()
 
+    @property
+    def modes(self):
+        """Displacement part of the eigenvectors."""
+        return self.evectors[: self.ndof]
+
+    @property
+    def shapes(self):
+        """Mode shapes, built from the eigenvectors on first access.
+
+        Only the most recently used shapes are kept in memory, see
+        `_ModeShapes`.
+        """
+        return self._shapes
+
     def update_mode_shapes(self):
-        """Update mode shapes based on eigenvectors."""
-        self.modes = self.evectors[: self.ndof]
-        self.shapes = []
-        for mode in range(len(self.wn)):
-            self.shapes.append(
-                Shape(
-                    vector=self.modes[:, mode],
-                    nodes=self.nodes,
-                    nodes_pos=self.nodes_pos,
-                    shaft_elements_length=self.shaft_elements_length,
-                    normalize=True,
-                    number_dof=self.number_dof,
-                )
-            )
+        """Update mode shapes based on eigenvectors.
+
+        The cached shapes are discarded and rebuilt on access.
+        """
+        self._shapes.clear()
+        self._orbit_data = None
+
+    def _orbits_data(self):
+        """Orbit parameters of all the modes, computed with array operations.
+
+        Returns
+        -------
+        data : dict
+            Dictionary with the "mode_type" and "whirl" of each mode and the
+            "forward", "backward", "minor_axis", "major_axis" and "kappa"
+            arrays with shape (number of modes, number of nodes).
+        """
+        if self._orbit_data is None:
+            vectors = _normalize_modes(self.modes[:, : len(self.wd)], self.number_dof)
+            mode_type = _classify_modes(vectors, self.number_dof)
+
+            data = {"mode_type": mode_type}
+            if self.number_dof > 3:
+                dofs = self.number_dof * np.asarray(self.nodes)
+                orbits = _orbit_parameters(vectors[dofs].T, vectors[dofs + 1].T)
+                whirl = _shape_whirl(orbits["kappa"])
+                whirl[mode_type != "Lateral"] = "None"
+
+                data["whirl"] = whirl
+                keys = ["forward", "backward", "minor_axis", "major_axis", "kappa"]
+                data.update({key: orbits[key] for key in keys})
+            else:
+                data["whirl"] = np.full(len(mode_type), None, dtype=object)
+
+            self._orbit_data = data
+
+        return self._orbit_data
+
+    def _shape(self, mode):
+        """Build the Shape object of a mode."""
+        return Shape(
+            vector=self.modes[:, mode],
+            nodes=self.nodes,
+            nodes_pos=self.nodes_pos,
+            shaft_elements_length=self.shaft_elements_length,
+            normalize=True,
+            number_dof=self.number_dof,
+        )
 
     @staticmethod
-    @np.vectorize
     def whirl_to_cmap(whirl):
         """Map the whirl to a value.
 
         Parameters
         ----------
-        whirl: string
+        whirl: string or array
             A string indicating the whirl direction related to the kappa_mode.
             If whirl is None, it does not correspond to a Lateral mode.
 
@@ -1810,17 +2079,15 @@ class ModalResults(Results):
         Example
         -------
         >>> whirl = 'Backward'
-        >>> whirl_to_cmap(whirl)
+        >>> ModalResults.whirl_to_cmap(whirl)
         array(1.)
         """
-        if whirl == "Forward":
-            return 0.0
-        elif whirl == "Backward":
-            return 1.0
-        elif whirl == "Mixed":
-            return 0.5
-        else:
-            return np.nan
+        whirl = np.asarray(whirl, dtype=object)
+        return np.select(
+            [whirl == "Forward", whirl == "Backward", whirl == "Mixed"],
+            [0.0, 1.0, 0.5],
+            default=np.nan,
+        )
 
     def kappa(self, node, w, wd=True):
         r"""Calculate kappa for a given node and natural frequency.
@@ -1863,11 +2130,12 @@ class ModalResults(Results):
         else:
             nat_freq = self.wn[w]
 
+        data = self._orbits_data()
         k = {
             "Frequency": nat_freq,
-            "Minor axis": self.shapes[w].orbits[node].minor_axis,
-            "Major axis": self.shapes[w].orbits[node].major_axis,
-            "kappa": self.shapes[w].orbits[node].kappa,
+            "Minor axis": data["minor_axis"][w, node],
+            "Major axis": data["major_axis"][w, node],
+            "kappa": data["kappa"][w, node],
         }
 
         return k
@@ -1892,7 +2160,7 @@ class ModalResults(Results):
             A list with the value of kappa for each node related
             to the mode/natural frequency of interest.
         """
-        kappa_mode = [orb.kappa for orb in self.shapes[w].orbits]
+        kappa_mode = list(self._orbits_data()["kappa"][w])
         return kappa_mode
 
     def whirl_direction(self):
@@ -1906,9 +2174,9 @@ class ModalResults(Results):
             None if it does not correspond to a Lateral mode (e.g. Torsional or Axial).
         """
         # whirl direction/values are methods because they are expensive.
-        whirl_w = [self.shapes[wd].whirl for wd in range(len(self.wd))]
+        whirl_w = self._orbits_data()["whirl"]
 
-        return np.array(whirl_w)
+        return np.array(list(whirl_w))
 
     def whirl_values(self):
         r"""Get the whirl value (0., 0.5, or 1.) for each frequency.
@@ -2908,18 +3176,34 @@ class CampbellResults(Results):
 class FrequencyResponseResults(Results):
     """Class used to store results and provide plots for Frequency Response.
 
+    The responses are receptances stored as `freq_resp[out, inp, :]`, the
+    response at `out` to a force at `inp`. Without selected inputs and
+    outputs, they have shape (ndof, ndof, n_freq). With selected inputs or
+    outputs, they have shape (len(outputs), len(inputs), n_freq), with a row
+    for each output and a column for each input.
+
     Parameters
     ----------
     freq_resp : array
         Array with the frequency response (displacement).
     velc_resp : array
-        Array with the frequency response (velocity).
+        Array with the frequency response (velocity). If None, it is derived
+        from the displacement when first accessed.
     accl_resp : array
-        Array with the frequency response (acceleration).
+        Array with the frequency response (acceleration). If None, it is
+        derived from the displacement when first accessed.
     speed_range : array
         Array with the speed range in rad/s.
     number_dof : int
         Number of degrees of freedom per node.
+    inputs : list, optional
+        Degrees of freedom (int) or probes (ross.Probe or label) of the
+        columns of the responses, if only some inputs were computed.
+        Default is all the degrees of freedom.
+    outputs : list, optional
+        Degrees of freedom (int) or probes (ross.Probe or label) of the rows
+        of the responses, if only some outputs were computed.
+        Default is all the degrees of freedom.
 
     Returns
     -------
@@ -2927,7 +3211,16 @@ class FrequencyResponseResults(Results):
         Plotly figure with Amplitude vs Frequency and Phase vs Frequency plots.
     """
 
-    def __init__(self, freq_resp, velc_resp, accl_resp, speed_range, number_dof):
+    def __init__(
+        self,
+        freq_resp,
+        velc_resp,
+        accl_resp,
+        speed_range,
+        number_dof,
+        inputs=None,
+        outputs=None,
+    ):
         self.freq_resp = freq_resp
         self.velc_resp = velc_resp
         self.accl_resp = accl_resp
@@ -2936,6 +3229,95 @@ class FrequencyResponseResults(Results):
 
         self.dof_dict = {"0": "x", "1": "y", "2": "z", "3": "α", "4": "β", "5": "θ"}
 
+        self.inputs = self._labels(inputs)
+        self.outputs = self._labels(outputs)
+
+    @property
+    def velc_resp(self):
+        """Frequency response (velocity)."""
+        if self._velc_resp is None:
+            self._velc_resp = 1j * self.speed_range * self.freq_resp
+        return self._velc_resp
+
+    @velc_resp.setter
+    def velc_resp(self, velc_resp):
+        self._velc_resp = velc_resp
+
+    @property
+    def accl_resp(self):
+        """Frequency response (acceleration)."""
+        if self._accl_resp is None:
+            self._accl_resp = -(self.speed_range**2) * self.freq_resp
+        return self._accl_resp
+
+    @accl_resp.setter
+    def accl_resp(self, accl_resp):
+        self._accl_resp = accl_resp
+
+    def _labels(self, items):
+        """Labels of the degrees of freedom or probes of inputs or outputs."""
+        if items is None:
+            return None
+
+        labels = []
+        for i, item in enumerate(items):
+            if isinstance(item, str):
+                labels.append(item)
+            elif hasattr(item, "get_label"):
+                labels.append(item.tag or item.get_label(i + 1))
+            else:
+                node = int(item) // self.number_dof
+                dof = self.dof_dict[str(int(item) % self.number_dof)]
+                labels.append(f"node {node} | dof: {dof}")
+
+        return labels
+
+    def _response(self, inp, out, amplitude_units):
+        """Response between an input and an output.
+
+        Parameters
+        ----------
+        inp : int
+            Input. If only some inputs were computed, it is the position in
+            the inputs list.
+        out : int
+            Output. If only some outputs were computed, it is the position in
+            the outputs list.
+        amplitude_units : str
+            Units for the response, which select displacement, velocity or
+            acceleration.
+
+        Returns
+        -------
+        response : np.ndarray
+            Complex response for each frequency.
+        base_unit : str
+            Units of the response.
+        y_label : str
+            Name of the response.
+        name : str
+            Trace name with the input and the output.
+        """
+        response = self.freq_resp[out, inp, :]
+
+        inp_label = self._labels([inp])[0] if self.inputs is None else self.inputs[inp]
+        out_label = (
+            self._labels([out])[0] if self.outputs is None else self.outputs[out]
+        )
+        name = f"inp: {inp_label}<br>out: {out_label}"
+
+        dummy_var = Q_(1, amplitude_units)
+        if dummy_var.check("[length]/[force]"):
+            return response, "m/N", "Displacement", name
+        elif dummy_var.check("[speed]/[force]"):
+            return 1j * self.speed_range * response, "m/s/N", "Velocity", name
+        elif dummy_var.check("[acceleration]/[force]"):
+            return -(self.speed_range**2) * response, "m/s**2/N", "Acceleration", name
+
+        raise ValueError(
+            "Not supported unit. Options are '[length]/[force]', '[speed]/[force]', '[acceleration]/[force]'"
+        )
+
     def plot_magnitude(
         self,
         inp,
@@ -2955,9 +3337,11 @@ class FrequencyResponseResults(Results):
         Parameters
         ----------
         inp : int
-            Input.
+            Input. If only some inputs were computed, it is the position in
+            the inputs list.
         out : int
-            Output.
+            Output. If only some outputs were computed, it is the position in
+            the outputs list.
         frequency_units : str, optional
             Units for the x axis.
             Default is "rad/s"
@@ -2988,28 +3372,11 @@ class FrequencyResponseResults(Results):
         fig : Plotly graph_objects.Figure()
             The figure object with the plot.
         """
-        inpn = inp // self.number_dof
-        idof = self.dof_dict[str(inp % self.number_dof)]
-        outn = out // self.number_dof
-        odof = self.dof_dict[str(out % self.number_dof)]
-
         frequency_range = Q_(self.speed_range, "rad/s").to(frequency_units).m
 
-        dummy_var = Q_(1, amplitude_units)
+        response, base_unit, _, name = self._response(inp, out, amplitude_units)
         y_label = "Magnitude"
-        if dummy_var.check("[length]/[force]"):
-            mag = np.abs(self.freq_resp)
-            mag = Q_(mag, "m/N").to(amplitude_units).m
-        elif dummy_var.check("[speed]/[force]"):
-            mag = np.abs(self.velc_resp)
-            mag = Q_(mag, "m/s/N").to(amplitude_units).m
-        elif dummy_var.check("[acceleration]/[force]"):
-            mag = np.abs(self.accl_resp)
-            mag = Q_(mag, "m/s**2/N").to(amplitude_units).m
-        else:
-            raise ValueError(
-                "Not supported unit. Options are '[length]/[force]', '[speed]/[force]', '[acceleration]/[force]'"
-            )
+        mag = Q_(np.abs(response), base_unit).to(amplitude_units).m
 
         if fig is None:
             fig = go.Figure()
@@ -3018,11 +3385,11 @@ class FrequencyResponseResults(Results):
         fig.add_trace(
             go.Scatter(
                 x=frequency_range,
-                y=mag[inp, out, :],
+                y=mag,
                 mode="lines",
                 line=dict(color=list(tableau_colors)[idx], shape=line_shape),
-                name=f"inp: node {inpn} | dof: {idof}<br>out: node {outn} | dof: {odof}",
-                legendgroup=f"inp: node {inpn} | dof: {idof}<br>out: node {outn} | dof: {odof}",
+                name=name,
+                legendgroup=name,
                 showlegend=True,
                 hovertemplate=f"Frequency ({frequency_units}): %{{x:.2f}}<br>Amplitude ({amplitude_units}): %{{y:.2e}}",
             )
@@ -3055,9 +3422,11 @@ class FrequencyResponseResults(Results):
         Parameters
         ----------
         inp : int
-            Input.
+            Input. If only some inputs were computed, it is the position in
+            the inputs list.
         out : int
-            Output.
+            Output. If only some outputs were computed, it is the position in
+            the outputs list.
         frequency_units : str, optional
             Units for the x axis.
             Default is "rad/s"
@@ -3088,26 +3457,10 @@ class FrequencyResponseResults(Results):
         fig : Plotly graph_objects.Figure()
             The figure object with the plot.
         """
-        inpn = inp // self.number_dof
-        idof = self.dof_dict[str(inp % self.number_dof)]
-        outn = out // self.number_dof
-        odof = self.dof_dict[str(out % self.number_dof)]
-
         frequency_range = Q_(self.speed_range, "rad/s").to(frequency_units).m
 
-        dummy_var = Q_(1, amplitude_units)
-        if dummy_var.check("[length]/[force]"):
-            phase = np.angle(self.freq_resp[inp, out, :])
-        elif dummy_var.check("[speed]/[force]"):
-            phase = np.angle(self.velc_resp[inp, out, :])
-        elif dummy_var.check("[acceleration]/[force]"):
-            phase = np.angle(self.accl_resp[inp, out, :])
-        else:
-            raise ValueError(
-                "Not supported unit. Options are '[length]/[force]', '[speed]/[force]', '[acceleration]/[force]'"
-            )
-
-        phase = Q_(phase, "rad").to(phase_units).m
+        response, _, _, name = self._response(inp, out, amplitude_units)
+        phase = Q_(np.angle(response), "rad").to(phase_units).m
 
         if phase_units in ["rad", "radian", "radians"]:
             phase = [i + 2 * np.pi if i < 0 else i for i in phase]
@@ -3124,8 +3477,8 @@ class FrequencyResponseResults(Results):
                 y=phase,
                 mode="lines",
                 line=dict(color=list(tableau_colors)[idx]),
-                name=f"inp: node {inpn} | dof: {idof}<br>out: node {outn} | dof: {odof}",
-                legendgroup=f"inp: node {inpn} | dof: {idof}<br>out: node {outn} | dof: {odof}",
+                name=name,
+                legendgroup=name,
                 showlegend=True,
                 hovertemplate=f"Frequency ({frequency_units}): %{{x:.2f}}<br>Phase: %{{y:.2e}}",
             )
@@ -3162,9 +3515,11 @@ class FrequencyResponseResults(Results):
         Parameters
         ----------
         inp : int
-            Input.
+            Input. If only some inputs were computed, it is the position in
+            the inputs list.
         out : int
-            Output.
+            Output. If only some outputs were computed, it is the position in
+            the outputs list.
         frequency_units : str, optional
             Units for the x axis.
             Default is "rad/s"
@@ -3195,35 +3550,11 @@ class FrequencyResponseResults(Results):
         fig : Plotly graph_objects.Figure()
             The figure object with the plot.
         """
-        inpn = inp // self.number_dof
-        idof = self.dof_dict[str(inp % self.number_dof)]
-        outn = out // self.number_dof
-        odof = self.dof_dict[str(out % self.number_dof)]
-
         frequency_range = Q_(self.speed_range, "rad/s").to(frequency_units).m
 
-        dummy_var = Q_(1, amplitude_units)
-        if dummy_var.check("[length]/[force]"):
-            mag = np.abs(self.freq_resp[inp, out, :])
-            mag = Q_(mag, "m/N").to(amplitude_units).m
-            phase = np.angle(self.freq_resp[inp, out, :])
-            y_label = "Displacement"
-        elif dummy_var.check("[speed]/[force]"):
-            mag = np.abs(self.velc_resp[inp, out, :])
-            mag = Q_(mag, "m/s/N").to(amplitude_units).m
-            phase = np.angle(self.velc_resp[inp, out, :])
-            y_label = "Velocity"
-        elif dummy_var.check("[acceleration]/[force]"):
-            mag = np.abs(self.accl_resp[inp, out, :])
-            mag = Q_(mag, "m/s**2/N").to(amplitude_units).m
-            phase = np.angle(self.accl_resp[inp, out, :])
-            y_label = "Acceleration"
-        else:
-            raise ValueError(
-                "Not supported unit. Options are '[length]/[force]', '[speed]/[force]', '[acceleration]/[force]'"
-            )
-
-        phase = Q_(phase, "rad").to(phase_units).m
+        response, base_unit, y_label, name = self._response(inp, out, amplitude_units)
+        mag = Q_(np.abs(response), base_unit).to(amplitude_units).m
+        phase = Q_(np.angle(response), "rad").to(phase_units).m
 
         if phase_units in ["rad", "radian", "radians"]:
             polar_theta_unit = "radians"
@@ -3245,8 +3576,8 @@ class FrequencyResponseResults(Results):
                 mode="lines+markers",
                 marker=dict(color=list(tableau_colors)[idx]),
                 line=dict(color=list(tableau_colors)[idx]),
-                name=f"inp: node {inpn} | dof: {idof}<br>out: node {outn} | dof: {odof}",
-                legendgroup=f"inp: node {inpn} | dof: {idof}<br>out: node {outn} | dof: {odof}",
+                name=name,
+                legendgroup=name,
                 showlegend=True,
                 hovertemplate=f"Amplitude ({amplitude_units}): %{{r:.2e}}<br>Phase: %{{theta:.2f}}<br>Frequency ({frequency_units}): %{{customdata:.2f}}",
             )
@@ -3294,9 +3625,11 @@ class FrequencyResponseResults(Results):
         Parameters
         ----------
         inp : int
-            Input.
+            Input. If only some inputs were computed, it is the position in
+            the inputs list.
         out : int
-            Output.
+            Output. If only some outputs were computed, it is the position in
+            the outputs list.
         frequency_units : str, optional
             Units for the x axis.
             Default is "rad/s"
@@ -4885,6 +5218,154 @@ class ForcedResponseResults(Results):
         return subplots
 
 
+class InfluenceCoefficientResults(Results):
+    """Class used to store unbalance influence coefficients.
+
+    The influence coefficients are the responses at the probes to a unit
+    unbalance (1 kg.m at 0 rad) at each candidate node. Since the response is
+    linear in the unbalance, the response to any combination of unbalances is
+    a linear combination of the influence coefficients.
+
+    Parameters
+    ----------
+    influence : array
+        Complex influence coefficients with shape
+        (n_probes, n_nodes, n_speeds), in m/(kg.m).
+    speed_range : array
+        Array with the speed range in rad/s.
+    nodes : array
+        Candidate nodes for the unbalance.
+    probes : list
+        Labels of the probes.
+    """
+
+    def __init__(self, influence, speed_range, nodes, probes):
+        self.influence = np.asarray(influence)
+        self.speed_range = np.asarray(speed_range)
+        self.nodes = np.asarray(nodes, dtype=int)
+        self.probes = list(probes)
+
+    def _node_index(self, node):
+        """Positions of the nodes in the candidate nodes."""
+        node = np.atleast_1d(np.asarray(node, dtype=int))
+        missing = node[~np.isin(node, self.nodes)]
+        if missing.size:
+            raise ValueError(
+                f"Nodes {list(missing)} are not in the influence coefficient nodes "
+                f"{list(self.nodes)}."
+            )
+        return np.array([np.flatnonzero(self.nodes == n)[0] for n in node])
+
+    def _speed_index(self, speed):
+        """Positions of the closest speeds in the speed range."""
+        if speed is None:
+            return np.arange(len(self.speed_range))
+        speed = np.atleast_1d(speed)
+        return np.abs(self.speed_range[:, np.newaxis] - speed).argmin(axis=0)
+
+    def unbalance_response(self, node, unbalance_magnitude, unbalance_phase):
+        """Response at the probes to combinations of unbalances.
+
+        Parameters
+        ----------
+        node : list, int
+            Nodes where the unbalances are applied.
+        unbalance_magnitude : array_like
+            Unbalance magnitudes (kg.m), with shape (..., len(node)). Each
+            leading index is a different unbalance scenario.
+        unbalance_phase : array_like
+            Unbalance phases (rad), with the same shape as the magnitudes.
+
+        Returns
+        -------
+        response : np.ndarray
+            Complex response with shape (..., n_probes, n_speeds).
+
+        Examples
+        --------
+        >>> import ross as rs
+        >>> rotor = rs.rotor_example()
+        >>> speed = np.linspace(0, 1000, 101)
+        >>> ic = rotor.run_influence_coefficients(
+        ...     probes=[rs.Probe(3, 0), rs.Probe(3, np.pi / 2)], frequency=speed
+        ... )
+        >>> magnitude = np.random.default_rng(0).uniform(0, 1e-3, size=(500, 2))
+        >>> ic.unbalance_response([2, 4], magnitude, np.zeros((500, 2))).shape
+        (500, 2, 101)
+        """
+        idx = self._node_index(node)
+        unbalance = np.asarray(unbalance_magnitude) * np.exp(
+            1j * np.asarray(unbalance_phase)
+        )
+        if unbalance.ndim == 0:
+            unbalance = unbalance[np.newaxis]
+
+        return np.einsum("pnf,...n->...pf", self.influence[:, idx, :], unbalance)
+
+    def balance(self, response, node, speed=None, weights=None):
+        """Correction unbalances that minimize the response at the probes.
+
+        The corrections U minimize the weighted least squares residual
+        ||W (A U + v)|| over all the probes and speeds, where A holds the
+        influence coefficients of the correction nodes and v the measured
+        response. Several measured responses are solved at once as right hand
+        sides of a single least squares problem.
+
+        Parameters
+        ----------
+        response : array_like
+            Complex response at the probes, with shape
+            (..., n_probes, n_speeds). Each leading index is a different
+            measurement.
+        node : list, int
+            Correction nodes (balancing planes).
+        speed : array_like, optional
+            Speeds of the measured response. The closest speeds in the speed
+            range are used. Default is all the speeds in the speed range.
+        weights : array_like, optional
+            Weights with shape (n_probes, n_speeds). Default is one for all
+            the probes and speeds.
+
+        Returns
+        -------
+        magnitude : np.ndarray
+            Correction magnitudes (kg.m) with shape (..., len(node)).
+        phase : np.ndarray
+            Correction phases (rad) with shape (..., len(node)).
+
+        Examples
+        --------
+        >>> import ross as rs
+        >>> rotor = rs.rotor_example()
+        >>> speed = np.linspace(0, 1000, 101)
+        >>> ic = rotor.run_influence_coefficients(
+        ...     probes=[rs.Probe(2, 0), rs.Probe(5, 0)], frequency=speed
+        ... )
+        >>> response = ic.unbalance_response([2, 4], [1e-4, 2e-4], [0.5, 1.0])
+        >>> magnitude, phase = ic.balance(response, node=[2, 4])
+        >>> np.round(magnitude, 6), np.round(phase, 6)
+        (array([0.0001, 0.0002]), array([-2.641593, -2.141593]))
+        """
+        idx = self._node_index(node)
+        sdx = self._speed_index(speed)
+
+        A = self.influence[:, idx][..., sdx]
+        if weights is not None:
+            A = A * np.asarray(weights)[:, np.newaxis, :]
+        # rows are the (probe, speed) pairs and columns the correction nodes
+        A = np.moveaxis(A, 1, -1).reshape(-1, len(idx))
+
+        response = np.asarray(response, dtype=complex)
+        if weights is not None:
+            response = response * np.asarray(weights)
+        batch_shape = response.shape[:-2]
+        b = -response.reshape(-1, A.shape[0]).T
+
+        U = np.linalg.lstsq(A, b, rcond=None)[0].T.reshape(*batch_shape, len(idx))
+
+        return np.abs(U), np.angle(U)
+
+
 class StaticResults(Results):
     """Class used to store results and provide plots for Static Analysis.
 
@@ -5689,8 +6170,9 @@ class TimeResponseResults(Results):
         The Rotor object
     t : array
         Time values for the output.
-    yout : array
-        System response.
+    yout : array or ross.utils.TimeResponseStore
+        System response. A store written to disk by the integration is read
+        lazily, only for the degrees of freedom used by each method.
     xout : array
         Time evolution of the state vector.
 
@@ -1,6 +1,9 @@
+import os
 import warnings
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from copy import copy, deepcopy
+from functools import cached_property
 from itertools import chain, cycle
 from pathlib import Path
 
@@ -12,11 +15,13 @@ from plotly import graph_objects as go
 from scipy import io as sio
 from scipy import linalg as la
 from scipy import signal as signal
+from scipy import sparse as sps
 from scipy.linalg import lu_factor, lu_solve
-from scipy.optimize import newton
+from scipy.optimize import linear_sum_assignment
 from scipy.signal import chirp
 from scipy.sparse import linalg as las
 
+from ross.assembly import ScatterPattern
 from ross.bearing_seal_element import (
     BallBearingElement,
     BearingElement,
@@ -48,6 +53,7 @@ from ross.results import (
     CriticalSpeedResults,
     ForcedResponseResults,
     FrequencyResponseResults,
+    InfluenceCoefficientResults,
     Level1Results,
     ModalResults,
     SensitivityResults,
@@ -65,7 +71,11 @@ from ross.utils import (
     convert_6dof_to_4dof,
     convert_6dof_to_torsional,
     intersection,
+    mac_matrix,
     newmark,
+    newmark_compiled,
+    ForceKernel,
+    TimeResponseStore,
     remove_dofs,
     make_speed_array,
 )
@@ -94,6 +104,21 @@ RENDER_COLORSCALE = [
 ]
 
 
+class _SolverSettings(dict):
+    """Keyword arguments of a solver that do not change its results.
+
+    All the instances have the same hash and are equal to each other, so
+    that they can be passed to a method cached with `lru_cache` without
+    being part of the cache key.
+    """
+
+    def __hash__(self):
+        return 0
+
+    def __eq__(self, other):
+        return isinstance(other, _SolverSettings)
+
+
 def _shaft_envelope(spans, columns=300):
     """Build the axial grid and the outer radius envelope of a set of elements.
 
@@ -222,6 +247,10 @@ class Rotor(object):
         Default is zero.
     tag : str
         A tag for the rotor
+    sparse_assembly : bool, optional
+        If True, the global matrices are assembled as sparse (CSR) matrices in
+        the modal, frequency response, static and time integration analyses.
+        Default is False.
 
     Returns
     -------
@@ -268,6 +297,8 @@ class Rotor(object):
     215.3707...
     """
 
+    sparse_assembly = False
+
     def __init__(
         self,
         shaft_elements,
@@ -282,8 +313,10 @@ class Rotor(object):
         alpha=0.0,
         beta=0.0,
         tag=None,
+        sparse_assembly=False,
     ):
         self.parameters = {"min_w": min_w, "max_w": max_w, "rated_w": rated_w}
+        self.sparse_assembly = sparse_assembly
 
         self.set_tag(tag)
 
@@ -697,7 +730,7 @@ class Rotor(object):
             v[dofs[a0]] = 1  # alpha
             v[dofs[a1]] = 1  # alpha
         # Then, use the vector to compute diametral aka transverse inertia of the entire rotor.
-        self.It = v @ (self.M0 @ v.T)
+        self.It = v @ (self._M0 @ v.T)
 
     def __add__(self, rotor2):
         return Rotor.concatenate_rotors([self, rotor2])
@@ -857,35 +890,47 @@ class Rotor(object):
             Stiffness proportional damping factor.
             Default is zero.
         """
-        M0 = np.zeros((self.ndof, self.ndof))
-        K0 = np.zeros((self.ndof, self.ndof))
-        C0 = np.zeros((self.ndof, self.ndof))
-        G0 = np.zeros((self.ndof, self.ndof))
-        Ksdt0 = np.zeros((self.ndof, self.ndof))
+        bearing_ids = {id(brg) for brg in self.bearing_elements}
+        elements = [elm for elm in self.elements if id(elm) not in bearing_ids]
 
-        elements = list(set(self.elements).difference(self.bearing_elements))
+        # COO scatter patterns are computed once and reused for every assembly
+        self._base_pattern = ScatterPattern(
+            [list(elm.dof_global_index.values()) for elm in elements], self.ndof
+        )
+        self._synchronous_pattern = ScatterPattern(
+            [
+                list(elm.dof_global_index.values())
+                for elm in [*self.shaft_elements, *self.disk_elements]
+            ],
+            self.ndof,
+        )
 
-        for elm in elements:
-            dofs = list(elm.dof_global_index.values())
+        shaft_ids = {id(elm) for elm in self.shaft_elements}
+        disk_ids = {id(elm) for elm in self.disk_elements}
 
-            M0[np.ix_(dofs, dofs)] += elm.M()
-            K0[np.ix_(dofs, dofs)] += elm.K()
-            C0[np.ix_(dofs, dofs)] += elm.C()
-            G0[np.ix_(dofs, dofs)] += elm.G()
+        Ksdt_blocks = []
+        for elm in elements:
+            if id(elm) in shaft_ids:
+                Ksdt_blocks.append(elm.Kst())
+            elif id(elm) in disk_ids:
+                Ksdt_blocks.append(elm.Kdt())
+            else:
+                Ksdt_blocks.append(np.zeros_like(elm.K()))
 
-            if elm in self.shaft_elements:
-                Ksdt0[np.ix_(dofs, dofs)] += elm.Kst()
-            elif elm in self.disk_elements:
-                Ksdt0[np.ix_(dofs, dofs)] += elm.Kdt()
+        M0 = self._base_pattern.to_sparse([elm.M() for elm in elements])
+        K0 = self._base_pattern.to_sparse([elm.K() for elm in elements])
+        C0 = self._base_pattern.to_sparse([elm.C() for elm in elements])
+        G0 = self._base_pattern.to_sparse([elm.G() for elm in elements])
+        Ksdt0 = self._base_pattern.to_sparse(Ksdt_blocks)
 
-        self.M0 = M0
-        self.K0 = K0
-        self.G0 = G0
-        self.Ksdt0 = Ksdt0
+        self._M0 = M0
+        self._K0 = K0
+        self._G0 = G0
+        self._Ksdt0 = Ksdt0
 
         # Damping configuration
         damping_global = (alpha != 0) or (beta != 0)
-        damping_elemental = np.any(C0)
+        damping_elemental = C0.count_nonzero() > 0
         damping_modal = modal_damping_ratio is not None
 
         self.modal_damping_ratio = modal_damping_ratio
@@ -910,11 +955,127 @@ class Rotor(object):
         elif damping_modal:
             self.alpha = 0.0
             self.beta = 0.0
-            C0 = self._compute_modal_damping(modal_damping_ratio, default_damping_ratio)
+            C0 = sps.csr_matrix(
+                self._compute_modal_damping(modal_damping_ratio, default_damping_ratio)
+            )
         else:
             C0 = self.alpha * M0 + self.beta * K0
 
-        self.C0 = C0
+        self._C0 = C0
+
+    @cached_property
+    def M0(self):
+        """Dense mass matrix of the rotor without bearings."""
+        return self._M0.toarray()
+
+    @cached_property
+    def K0(self):
+        """Dense stiffness matrix of the rotor without bearings."""
+        return self._K0.toarray()
+
+    @cached_property
+    def C0(self):
+        """Dense damping matrix of the rotor without bearings."""
+        return self._C0.toarray()
+
+    @cached_property
+    def G0(self):
+        """Dense gyroscopic matrix of the rotor without bearings."""
+        return self._G0.toarray()
+
+    @cached_property
+    def Ksdt0(self):
+        """Dense dynamic stiffness matrix of the rotor without bearings."""
+        return self._Ksdt0.toarray()
+
+    @property
+    def _bearing_pattern(self):
+        """Scatter pattern of the bearing elements.
+
+        The pattern is rebuilt only if the list of bearing elements changes
+        (e.g. when magnetic bearings are removed for a time integration).
+        """
+        key = tuple(id(brg) for brg in self.bearing_elements)
+        cache = self.__dict__.get("_bearing_pattern_cache")
+
+        if cache is None or cache[0] != key:
+            pattern = ScatterPattern(
+                [list(brg.dof_global_index.values()) for brg in self.bearing_elements],
+                self.ndof,
+            )
+            cache = (key, pattern)
+            self.__dict__["_bearing_pattern_cache"] = cache
+
+        return cache[1]
+
+    def _assemble_bearings(self, base, blocks, sparse_format):
+        """Add the bearing blocks to a copy of a base matrix.
+
+        Parameters
+        ----------
+        base : scipy.sparse matrix
+            Base matrix of the rotor without bearings.
+        blocks : list
+            Bearing matrices, in the same order as the bearing elements.
+        sparse_format : bool
+            If True a CSR matrix is returned, otherwise a dense array.
+
+        Returns
+        -------
+        matrix : np.ndarray or scipy.sparse.csr_matrix
+            Global matrix including the bearing elements.
+        """
+        pattern = self._bearing_pattern
+
+        if sparse_format:
+            return (base + pattern.to_sparse(blocks)).tocsr()
+
+        return pattern.add_to(base.toarray(), blocks)
+
+    def _assemble_bearings_stack(
+        self, base, coefficient, frequency, sparse_format, nu=0
+    ):
+        """Add the bearing matrices evaluated at several frequencies to a base.
+
+        Parameters
+        ----------
+        base : scipy.sparse matrix
+            Base matrix of the rotor without bearings.
+        coefficient : str
+            Type of bearing matrix: "k", "c" or "m".
+        frequency : np.ndarray
+            Frequencies (rad/s) at which the bearing matrices are evaluated.
+        sparse_format : bool
+            If True a list of CSR matrices is returned, otherwise a dense array
+            with shape (n_freq, ndof, ndof).
+        nu : int, optional
+            Order of the derivative of the bearing matrices with respect to the
+            frequency. Default is 0.
+
+        Returns
+        -------
+        matrices : np.ndarray or list
+            Global matrices including the bearing elements.
+        """
+        pattern = self._bearing_pattern
+        blocks = [
+            elm.matrices(coefficient, frequency, nu=nu) for elm in self.bearing_elements
+        ]
+
+        if sparse_format:
+            if not len(blocks):
+                return [base.tocsr() for _ in frequency]
+
+            return [
+                (base + matrix).tocsr() for matrix in pattern.to_sparse_stack(blocks)
+            ]
+
+        matrices = np.repeat(base.toarray()[np.newaxis], len(frequency), axis=0)
+
+        if not len(blocks):
+            return matrices
+
+        return pattern.add_to_stack(matrices, blocks)
 
     def _compute_modal_damping(self, modal_damping_ratio, default_damping_ratio=0.0):
         """Compute the physical damping matrix from modal damping ratios.
@@ -1215,6 +1376,27 @@ class Rotor(object):
             speed, num_modes=num_modes, sparse=sparse, synchronous=synchronous
         )
 
+        return self._modal_results(speed, evalues, evectors, num_modes)
+
+    def _modal_results(self, speed, evalues, evectors, num_modes):
+        """Build the modal results from sorted eigenvalues and eigenvectors.
+
+        Parameters
+        ----------
+        speed : float
+            Rotor speed.
+        evalues : np.ndarray
+            Eigenvalues, sorted as returned by `_eigen`.
+        evectors : np.ndarray
+            Eigenvectors, sorted as returned by `_eigen`.
+        num_modes : int
+            The number of eigenvalues and eigenvectors requested.
+
+        Returns
+        -------
+        results : ross.ModalResults
+            Modal results object.
+        """
         wn_len = num_modes // 2
         wn = (np.absolute(evalues))[:wn_len]
         wd = (np.imag(evalues))[:wn_len]
@@ -1244,9 +1426,12 @@ class Rotor(object):
     def run_critical_speed(self, speed_range=None, num_modes=12, rtol=0.005):
         """Calculate the critical speeds and damping ratios for the rotor model.
 
-        This function runs an iterative method over "run_modal()" to minimize
-        (using scipy.optimize.newton) the error between the rotor speed and the rotor
-        critical speeds (rotor speed - critical speed).
+        This function solves rotor speed - critical speed = 0 for all the modes
+        with Newton's method. The derivatives of the natural frequencies with
+        respect to the rotor speed are computed analytically from the left and
+        right eigenvectors, the gyroscopic matrix and the derivatives of the
+        bearing coefficients, so that each iteration needs a single eigenvalue
+        solution. Critical speeds closer than "rtol" share the same solution.
 
         Differently from run_modal(), this function doesn't take a speed input because
         it iterates over the natural frequencies calculated in the last iteration.
@@ -1256,8 +1441,8 @@ class Rotor(object):
         Once the error is within an acceptable range defined by "rtol", it returns the
         approximated critical speed.
 
-        With the critical speeds calculated, the function uses the results to
-        calculate the log dec and damping ratios for each critical speed.
+        The log dec, damping ratios and whirl directions are taken from the last
+        eigenvalue solution of each critical speed.
 
         Parameters
         ----------
@@ -1272,7 +1457,7 @@ class Rotor(object):
             If speed_range is not None, num_modes is overrided.
             Default is 12.
         rtol : float, optional
-            Tolerance (relative) for termination. Applied to scipy.optimize.newton.
+            Tolerance (relative) for termination of the Newton iterations.
             Default is 0.005 (0.5%).
 
         Returns
@@ -1308,25 +1493,68 @@ class Rotor(object):
         """
         num_modes = (self.ndof - 4) * 2 if speed_range is not None else num_modes
 
-        modal = self.run_modal(0, num_modes)
-        _wn = modal.wn
-        _wd = modal.wd
-        wn = np.zeros_like(_wn)
-        wd = np.zeros_like(_wd)
+        evalues, _ = self._eigen(0, num_modes=num_modes, sparse=True)
+        n_modes = len(evalues[: num_modes // 2])
 
-        for i in range(len(wn)):
-            wn_func = lambda s: s - self.run_modal(s, num_modes).wn[i]
-            wn[i] = newton(func=wn_func, x0=_wn[i], rtol=rtol)
+        # unknown speeds: wn critical speeds followed by wd critical speeds
+        speeds = np.concatenate([np.abs(evalues[:n_modes]), np.imag(evalues[:n_modes])])
+        mode = np.tile(np.arange(n_modes), 2)
+        use_wn = np.arange(2 * n_modes) < n_modes
 
-        for i in range(len(wd)):
-            wd_func = lambda s: s - self.run_modal(s, num_modes).wd[i]
-            wd[i] = newton(func=wd_func, x0=_wd[i], rtol=rtol)
+        solves = []
+        final_solve = np.full(2 * n_modes, -1)
+        for _ in range(50):
+            active = np.flatnonzero(final_solve < 0)
+            if not len(active):
+                break
 
+            # speeds closer than rtol share one eigenvalue solution, which is
+            # extrapolated to each of them with the eigenvalue derivatives
+            active = active[np.argsort(speeds[active])]
+            group_start = np.r_[
+                True, np.diff(speeds[active]) > rtol * np.abs(speeds[active[1:]])
+            ]
+            for group in np.split(active, np.flatnonzero(group_start)[1:]):
+                speed = np.mean(speeds[group])
+                evalues, evectors = self._eigen(speed, num_modes=num_modes, sparse=True)
+                devalues = self._eigen_speed_derivative(
+                    speed, evalues, evectors, num_modes
+                )
+                solves.append((speed, evalues, evectors))
+
+                lam = evalues[mode[group]]
+                dlam = devalues[mode[group]]
+                w = np.where(use_wn[group], np.abs(lam), np.imag(lam))
+                dw = np.where(
+                    use_wn[group],
+                    np.real(np.conj(lam) * dlam) / np.abs(lam),
+                    np.imag(dlam),
+                )
+
+                # Newton step for s - w(s) = 0
+                s = speeds[group]
+                step = (s - w - dw * (s - speed)) / (1 - dw)
+                speeds[group] = s - step
+
+                converged = np.abs(step) <= 1.48e-8 + rtol * np.abs(speeds[group])
+                final_solve[group[converged]] = len(solves) - 1
+        else:
+            raise RuntimeError(
+                f"Failed to converge after 50 iterations, value is {speeds}."
+            )
+
+        wn = speeds[:n_modes]
+        wd = speeds[n_modes:]
+
+        # post-processing with the last eigenvalue solution of each wd
+        modal_results = {}
         log_dec = np.zeros_like(wn)
         damping_ratio = np.zeros_like(wn)
         whirl_direction = list(np.zeros_like(wn))
-        for i, s in enumerate(wd):
-            modal = self.run_modal(s, num_modes)
+        for i, j in enumerate(final_solve[n_modes:]):
+            if j not in modal_results:
+                modal_results[j] = self._modal_results(*solves[j], num_modes)
+            modal = modal_results[j]
             log_dec[i] = modal.log_dec[i]
             damping_ratio[i] = modal.damping_ratio[i]
             whirl_direction[i] = modal.whirl_direction()[i]
@@ -1464,7 +1692,7 @@ class Rotor(object):
 
         return results
 
-    def M(self, frequency=None, synchronous=False):
+    def M(self, frequency=None, synchronous=False, sparse=False):
         """Mass matrix for an instance of a rotor.
 
         Parameters
@@ -1472,6 +1700,9 @@ class Rotor(object):
         synchronous : bool, optional
             If True a synchronous analysis is carried out.
             Default is False.
+        sparse : bool, optional
+            If True, a scipy.sparse CSR matrix is returned.
+            Default is False.
 
         Returns
         -------
@@ -1492,52 +1723,71 @@ class Rotor(object):
         if frequency is None:
             frequency = 0
 
-        M0 = self.M0.copy()
-
-        for elm in self.bearing_elements:
-            dofs = list(elm.dof_global_index.values())
-            M0[np.ix_(dofs, dofs)] += elm.M(frequency)
+        M0 = self._M0
 
         if synchronous:
-            for elm in self.shaft_elements:
-                dofs = list(elm.dof_global_index.values())
-                x0 = elm.dof_mapping()["x_0"]
-                y0 = elm.dof_mapping()["y_0"]
-                a0 = elm.dof_mapping()["alpha_0"]
-                b0 = elm.dof_mapping()["beta_0"]
-                x1 = elm.dof_mapping()["x_1"]
-                y1 = elm.dof_mapping()["y_1"]
-                a1 = elm.dof_mapping()["alpha_1"]
-                b1 = elm.dof_mapping()["beta_1"]
-                G = elm.G()
-                for i in range(2 * self.number_dof):
-                    if i in (x0, b0, x1, b1):
-                        M0[dofs[i], dofs[x0]] -= G[i, y0]
-                        M0[dofs[i], dofs[b0]] += G[i, a0]
-                        M0[dofs[i], dofs[x1]] -= G[i, y1]
-                        M0[dofs[i], dofs[b1]] += G[i, a1]
-                    else:
-                        M0[dofs[i], dofs[y0]] += G[i, x0]
-                        M0[dofs[i], dofs[a0]] -= G[i, b0]
-                        M0[dofs[i], dofs[y1]] += G[i, x1]
-                        M0[dofs[i], dofs[a1]] -= G[i, b1]
-            for elm in self.disk_elements:
-                dofs = list(elm.dof_global_index.values())
-                a0 = elm.dof_mapping()["alpha_0"]
-                b0 = elm.dof_mapping()["beta_0"]
-                G = elm.G()
-                M0[dofs[a0], dofs[a0]] -= G[a0, b0]
-                M0[dofs[b0], dofs[b0]] += G[b0, a0]
-
-        return M0
-
-    def K(self, frequency):
+            M0 = M0 + self._synchronous_pattern.to_sparse(self._synchronous_blocks())
+
+        return self._assemble_bearings(
+            M0, [elm.M(frequency) for elm in self.bearing_elements], sparse
+        )
+
+    def _synchronous_blocks(self):
+        """Element blocks added to the mass matrix in synchronous analyses.
+
+        Returns
+        -------
+        blocks : list
+            Matrices to be added to the mass matrix for each shaft and disk
+            element, in the order of the synchronous scatter pattern.
+        """
+        blocks = []
+
+        for elm in self.shaft_elements:
+            x0 = elm.dof_mapping()["x_0"]
+            y0 = elm.dof_mapping()["y_0"]
+            a0 = elm.dof_mapping()["alpha_0"]
+            b0 = elm.dof_mapping()["beta_0"]
+            x1 = elm.dof_mapping()["x_1"]
+            y1 = elm.dof_mapping()["y_1"]
+            a1 = elm.dof_mapping()["alpha_1"]
+            b1 = elm.dof_mapping()["beta_1"]
+            G = elm.G()
+            block = np.zeros_like(G)
+            for i in range(2 * self.number_dof):
+                if i in (x0, b0, x1, b1):
+                    block[i, x0] -= G[i, y0]
+                    block[i, b0] += G[i, a0]
+                    block[i, x1] -= G[i, y1]
+                    block[i, b1] += G[i, a1]
+                else:
+                    block[i, y0] += G[i, x0]
+                    block[i, a0] -= G[i, b0]
+                    block[i, y1] += G[i, x1]
+                    block[i, a1] -= G[i, b1]
+            blocks.append(block)
+
+        for elm in self.disk_elements:
+            a0 = elm.dof_mapping()["alpha_0"]
+            b0 = elm.dof_mapping()["beta_0"]
+            G = elm.G()
+            block = np.zeros_like(G)
+            block[a0, a0] -= G[a0, b0]
+            block[b0, b0] += G[b0, a0]
+            blocks.append(block)
+
+        return blocks
+
+    def K(self, frequency, sparse=False):
         """Stiffness matrix for an instance of a rotor.
 
         Parameters
         ----------
         frequency : float, optional
             Excitation frequency.
+        sparse : bool, optional
+            If True, a scipy.sparse CSR matrix is returned.
+            Default is False.
 
         Returns
         -------
@@ -1553,21 +1803,23 @@ class Rotor(object):
                [ 0.000e+00,  0.000e+00,  1.657e+03,  0.000e+00],
                [ 0.000e+00, -6.000e+00,  0.000e+00,  1.000e+00]])
         """
-        K0 = self.K0.copy()
-
-        for elm in self.bearing_elements:
-            dofs = list(elm.dof_global_index.values())
-            K0[np.ix_(dofs, dofs)] += elm.K(frequency)
-
-        return K0
+        return self._assemble_bearings(
+            self._K0, [elm.K(frequency) for elm in self.bearing_elements], sparse
+        )
 
-    def Ksdt(self):
+    def Ksdt(self, sparse=False):
         """Dynamic stiffness matrix for an instance of a rotor.
 
         Stiffness matrix associated with the transient motion of the
         shaft and disks. It needs to be multiplied by the angular
         acceleration when considered in time dependent analyses.
 
+        Parameters
+        ----------
+        sparse : bool, optional
+            If True, a scipy.sparse CSR matrix is returned.
+            Default is False.
+
         Returns
         -------
         Ksdt0 : np.ndarray
@@ -1584,17 +1836,21 @@ class Rotor(object):
                [  0.  ,  -0.48,   0.  ,   0.16,   0.  ,   0.  ],
                [  0.  ,   0.  ,   0.  ,   0.  ,   0.  ,   0.  ]])
         """
-        Ksdt0 = self.Ksdt0.copy()
+        if sparse:
+            return self._Ksdt0.copy()
 
-        return Ksdt0
+        return self.Ksdt0.copy()
 
-    def C(self, frequency):
+    def C(self, frequency, sparse=False):
         """Damping matrix for an instance of a rotor.
 
         Parameters
         ----------
         frequency : float
             Excitation frequency.
+        sparse : bool, optional
+            If True, a scipy.sparse CSR matrix is returned.
+            Default is False.
 
         Returns
         -------
@@ -1605,22 +1861,76 @@ class Rotor(object):
         --------
         >>> rotor = compressor_example()
         >>> rotor.C(0)[:4, :4]
-        array([[ 0.,  0.,  0.,  0.],
-               [ 0.,  0.,  0., -0.],
-               [ 0.,  0.,  0.,  0.],
-               [ 0., -0.,  0.,  0.]])
+        array([[0., 0., 0., 0.],
+               [0., 0., 0., 0.],
+               [0., 0., 0., 0.],
+               [0., 0., 0., 0.]])
         """
-        C0 = self.C0.copy()
+        return self._assemble_bearings(
+            self._C0, [elm.C(frequency) for elm in self.bearing_elements], sparse
+        )
 
-        for elm in self.bearing_elements:
-            dofs = list(elm.dof_global_index.values())
-            C0[np.ix_(dofs, dofs)] += elm.C(frequency)
+    def assemble_matrices(self, frequency, sparse=False, nu=0):
+        """Mass, stiffness and damping matrices for an array of frequencies.
 
-        return C0
+        The frequency dependent bearing coefficients are evaluated for all the
+        frequencies at once and scattered with the precomputed bearing degrees
+        of freedom, so that sweeps do not assemble the matrices point by point.
+
+        Parameters
+        ----------
+        frequency : array_like
+            Excitation frequencies (rad/s).
+        sparse : bool, optional
+            If True, lists of scipy.sparse CSR matrices are returned.
+            Default is False.
+        nu : int, optional
+            Order of the derivative of the matrices with respect to the
+            frequency. Only the bearing coefficients depend on the frequency.
+            Default is 0.
+
+        Returns
+        -------
+        M : np.ndarray or list
+            Mass matrices with shape (n_freq, ndof, ndof).
+        K : np.ndarray or list
+            Stiffness matrices with shape (n_freq, ndof, ndof).
+        C : np.ndarray or list
+            Damping matrices with shape (n_freq, ndof, ndof).
+
+        Examples
+        --------
+        >>> rotor = rotor_example()
+        >>> M, K, C = rotor.assemble_matrices([0, 100, 200])
+        >>> K.shape
+        (3, 42, 42)
+        >>> np.allclose(K[1], rotor.K(100))
+        True
+        >>> dM, dK, dC = rotor.assemble_matrices([0, 100], nu=1)
+        >>> np.abs(dK).max()
+        0.0
+        """
+        frequency = np.atleast_1d(np.asarray(frequency, dtype=np.float64))
 
-    def G(self):
+        M0, K0, C0 = self._M0, self._K0, self._C0
+        if nu:
+            M0 = K0 = C0 = sps.csr_matrix(self._K0.shape)
+
+        M = self._assemble_bearings_stack(M0, "m", frequency, sparse, nu=nu)
+        K = self._assemble_bearings_stack(K0, "k", frequency, sparse, nu=nu)
+        C = self._assemble_bearings_stack(C0, "c", frequency, sparse, nu=nu)
+
+        return M, K, C
+
+    def G(self, sparse=False):
         """Gyroscopic matrix for an instance of a rotor.
 
+        Parameters
+        ----------
+        sparse : bool, optional
+            If True, a scipy.sparse CSR matrix is returned.
+            Default is False.
+
         Returns
         -------
         G0 : np.ndarray
@@ -1635,9 +1945,10 @@ class Rotor(object):
                [ 0.        ,  0.        ,  0.        ,  0.        ],
                [ 0.00022681,  0.        ,  0.        ,  0.        ]])
         """
-        G0 = self.G0.copy()
+        if sparse:
+            return self._G0.copy()
 
-        return G0
+        return self.G0.copy()
 
     def A(self, speed=0, frequency=None, synchronous=False):
         """State space matrix for an instance of a rotor.
@@ -1688,6 +1999,83 @@ class Rotor(object):
 
         return A
 
+    def _quadratic_shift_invert(
+        self, speed=0, frequency=None, sigma=1, transpose=False
+    ):
+        """Shift-invert operator of the state space matrix.
+
+        The eigenvalues of the state space matrix A are the roots of the
+        quadratic eigenvalue problem (lambda^2 M + lambda D + K) x = 0, with
+        D = C + speed * G. The operator (A - sigma I)^-1 is applied to a state
+        vector [a, b] as
+
+            x = -Q^-1 (M b + (D + sigma M) a)
+            y = a + sigma x
+
+        where Q = sigma^2 M + sigma D + K is factorized once. Only matrices of
+        size ndof are factorized and neither A nor the inverse of M is formed,
+        so the sparsity of the rotor matrices is kept when the rotor is built
+        with sparse_assembly=True.
+
+        Parameters
+        ----------
+        speed: float, optional
+            Rotor speed.
+            Default is 0.
+        frequency : float, optional
+            Excitation frequency. Default is rotor speed.
+        sigma : float, optional
+            Shift. Default is 1.
+        transpose : bool, optional
+            If True, the operator of the transposed quadratic problem
+            (lambda^2 M^T + lambda D^T + K^T) x = 0 is returned. Its eigenvectors
+            are the left eigenvectors of the rotor problem. Default is False.
+
+        Returns
+        -------
+        OPinv : scipy.sparse.linalg.LinearOperator
+            Operator (A - sigma I)^-1 with shape (2 * ndof, 2 * ndof).
+
+        Examples
+        --------
+        >>> rotor = rotor_example()
+        >>> OPinv = rotor._quadratic_shift_invert(speed=0)
+        >>> OPinv.shape
+        (84, 84)
+        >>> x = np.ones(84)
+        >>> A = rotor.A(speed=0)
+        >>> np.allclose((A - np.eye(84)) @ (OPinv @ x), x)
+        True
+        """
+        if frequency is None:
+            frequency = speed
+
+        sparse = self.sparse_assembly
+        M = self.M(frequency, sparse=sparse)
+        D = self.C(frequency, sparse=sparse) + self.G(sparse=sparse) * speed
+        Q = self.K(frequency, sparse=sparse) + sigma * D + sigma**2 * M
+        D_sigma = D + sigma * M
+        size = M.shape[0]
+
+        if transpose:
+            M, D_sigma = M.T, D_sigma.T
+
+        if sparse:
+            lu = las.splu(sps.csc_matrix(Q))
+            solve = lambda b: lu.solve(b, trans="T" if transpose else "N")
+        else:
+            lu = la.lu_factor(Q)
+            solve = lambda b: la.lu_solve(lu, b, trans=int(transpose))
+
+        def matvec(v):
+            a, b = v[:size], v[size:]
+            x = -solve(M @ b + D_sigma @ a)
+            return np.concatenate([x, a + sigma * x])
+
+        return las.LinearOperator(
+            (2 * size, 2 * size), matvec=matvec, dtype=np.result_type(Q.dtype, float)
+        )
+
     def _check_frequency_array(self, frequency_range):
         """Verify if bearing elements coefficients are extrapolated.
 
@@ -1801,8 +2189,10 @@ class Rotor(object):
             Matrix for which eig will be calculated.
             Defaul is the rotor A matrix.
         sparse : bool, optional
-            If True, eigenvalues are computed using ARPACK. If False, they are
-            computed with `scipy.linalg.eig()`. When sparse is False, eigenvalues
+            If True, eigenvalues are computed using ARPACK. If no A matrix is
+            given, ARPACK is applied to the shift-inverted quadratic eigenvalue
+            problem (see `_quadratic_shift_invert`) without forming the state
+            space matrix. If False, they are computed with `scipy.linalg.eig()`. When sparse is False, eigenvalues
             are filtered to exclude rigid body modes. If sparse is None, no filtering
             is applied. Default is None.
         synchronous : bool, optional
@@ -1823,7 +2213,11 @@ class Rotor(object):
         >>> evalues[0].imag # doctest: +ELLIPSIS
         91.796...
         """
-        if A is None:
+        # ARPACK is applied to the shift-inverted quadratic eigenvalue problem,
+        # so that the state space matrix does not need to be formed
+        use_quadratic = A is None and sparse and not synchronous
+
+        if A is None and not use_quadratic:
             A = self.A(speed=speed, frequency=frequency, synchronous=synchronous)
 
         filter_eigenpairs = lambda values, vectors, indices: (
@@ -1841,14 +2235,21 @@ class Rotor(object):
         else:
             if sparse:
                 try:
-                    evalues, evectors = las.eigs(
-                        A,
-                        k=min(2 * num_modes, max(num_modes, A.shape[0] - 2)),
-                        sigma=1,
-                        which="LM",
-                        v0=np.ones(A.shape[0]),
-                    )
+                    if use_quadratic:
+                        evalues, evectors = self._eigs_shift_invert(
+                            speed, num_modes, frequency=frequency
+                        )
+                    else:
+                        evalues, evectors = las.eigs(
+                            A,
+                            k=min(2 * num_modes, max(num_modes, A.shape[0] - 2)),
+                            sigma=1,
+                            which="LM",
+                            v0=np.ones(A.shape[0]),
+                        )
                 except las.ArpackError:
+                    if A is None:
+                        A = self.A(speed=speed, frequency=frequency)
                     evalues, evectors = la.eig(A)
             else:
                 evalues, evectors = la.eig(A)
@@ -1863,6 +2264,216 @@ class Rotor(object):
 
         return evalues, evectors
 
+    def _eigen_continuation(self, speed, num_modes=12, v0=None):
+        """Eigenvalues and eigenvectors warm started from a previous solution.
+
+        The eigenpairs are computed with shift-invert ARPACK as in `_eigen`
+        (sparse=True), but the Arnoldi iteration is started from the
+        eigenvectors found at the previous speed of a sweep instead of a
+        constant vector. Since these are already close to the wanted invariant
+        subspace, fewer restarts and operator applications are needed.
+
+        Parameters
+        ----------
+        speed : float
+            Rotor speed.
+        num_modes : int, optional
+            The number of eigenvalues and eigenvectors to be calculated.
+            Default is 12.
+        v0 : np.ndarray, optional
+            Starting vector, e.g. the one returned for the previous speed.
+            Default is a vector of ones.
+
+        Returns
+        -------
+        evalues : np.ndarray
+            Eigenvalues, filtered and sorted as in `_eigen`.
+        evectors : np.ndarray
+            Eigenvectors, filtered and sorted as in `_eigen`.
+        v0 : np.ndarray
+            Starting vector for the next speed, spanned by the computed
+            eigenvectors.
+
+        Examples
+        --------
+        >>> rotor = rotor_example()
+        >>> evalues, evectors, v0 = rotor._eigen_continuation(0)
+        >>> evalues, evectors, v0 = rotor._eigen_continuation(10, v0=v0)
+        >>> np.allclose(evalues, rotor._eigen(10, sparse=True)[0])
+        True
+        """
+        try:
+            evalues, evectors = self._eigs_shift_invert(speed, num_modes, v0=v0)
+        except las.ArpackError:
+            evalues, evectors = la.eig(self.A(speed=speed))
+
+        idx = np.where(np.abs(evalues) > 1e-1)[0]
+        evalues, evectors = evalues[idx], evectors[:, idx]
+
+        idx = self._index(evalues)
+        evalues, evectors = evalues[idx], evectors[:, idx]
+
+        # ARPACK works in real arithmetic for real operators
+        v0 = np.real(evectors / la.norm(evectors, axis=0)).sum(axis=1)
+
+        return evalues, evectors, v0
+
+    def _eigs_shift_invert(
+        self, speed, num_modes, frequency=None, v0=None, transpose=False
+    ):
+        """Eigenpairs closest to the shift computed with ARPACK.
+
+        Parameters
+        ----------
+        speed : float
+            Rotor speed.
+        num_modes : int
+            Half the number of eigenpairs to be computed.
+        frequency : float, optional
+            Excitation frequency. Default is rotor speed.
+        v0 : np.ndarray, optional
+            Starting vector for the Arnoldi iteration. Default is a vector of
+            ones.
+        transpose : bool, optional
+            If True, the eigenpairs of the transposed problem are computed.
+            Default is False.
+
+        Returns
+        -------
+        evalues : np.ndarray
+            Eigenvalues of the state space matrix.
+        evectors : np.ndarray
+            Eigenvectors of the state space matrix.
+        """
+        sigma = 1
+        OPinv = self._quadratic_shift_invert(
+            speed, frequency=frequency, sigma=sigma, transpose=transpose
+        )
+        size = OPinv.shape[0]
+
+        if v0 is None or v0.shape != (size,):
+            v0 = np.ones(size)
+
+        mu, evectors = las.eigs(
+            OPinv,
+            k=min(2 * num_modes, max(num_modes, size - 2)),
+            which="LM",
+            v0=v0,
+        )
+
+        return sigma + 1 / mu, evectors
+
+    def _left_eigenvectors(self, speed, evalues, num_modes=12, frequency=None):
+        """Left eigenvectors matching a set of eigenvalues.
+
+        The left eigenvectors y of the quadratic problem, which satisfy
+        y^T (lambda^2 M + lambda D + K) = 0, are the eigenvectors of the
+        transposed problem. They are paired with the given eigenvalues by
+        solving an assignment problem on the distance between eigenvalues.
+
+        Parameters
+        ----------
+        speed : float
+            Rotor speed.
+        evalues : np.ndarray
+            Eigenvalues, as returned by `_eigen`.
+        num_modes : int, optional
+            Number of modes used to compute the eigenvalues. Default is 12.
+        frequency : float, optional
+            Excitation frequency. Default is rotor speed.
+
+        Returns
+        -------
+        rows : np.ndarray
+            Indices of the eigenvalues with a matching left eigenvector.
+        left_vectors : np.ndarray
+            Displacement part of the left eigenvectors, with one column for
+            each index in rows.
+        """
+        if frequency is None:
+            frequency = speed
+
+        size = self.ndof
+
+        try:
+            left_values, left_vectors = self._eigs_shift_invert(
+                speed, num_modes, frequency=frequency, transpose=True
+            )
+        except las.ArpackError:
+            M = self.M(frequency)
+            D = self.C(frequency) + self.G() * speed
+            # fmt: off
+            A = np.vstack([np.hstack([np.zeros((size, size)), np.eye(size)]),
+                           np.hstack([la.solve(-M.T, self.K(frequency).T), la.solve(-M.T, D.T)])])
+            # fmt: on
+            left_values, left_vectors = la.eig(A)
+
+        rows, cols = linear_sum_assignment(
+            np.abs(evalues[:, np.newaxis] - left_values[np.newaxis, :])
+        )
+
+        return rows, left_vectors[:size, cols]
+
+    def _eigen_speed_derivative(self, speed, evalues, evectors, num_modes=12):
+        """Derivatives of the eigenvalues with respect to the rotor speed.
+
+        For the quadratic problem (lambda^2 M + lambda D + K) x = 0, with
+        D = C + speed * G and the bearing coefficients evaluated at the rotor
+        speed, the derivative of each eigenvalue is
+
+            dlambda = -y^T (lambda^2 M' + lambda (C' + G) + K') x
+                      / y^T (2 lambda M + D) x
+
+        where ' is the derivative with respect to the speed and y is the
+        eigenvector of the transposed problem (left eigenvector) associated
+        with the same eigenvalue.
+
+        Parameters
+        ----------
+        speed : float
+            Rotor speed.
+        evalues : np.ndarray
+            Eigenvalues at this speed, as returned by `_eigen`.
+        evectors : np.ndarray
+            State space eigenvectors at this speed, as returned by `_eigen`.
+        num_modes : int, optional
+            Number of modes used to compute the eigenvalues. Default is 12.
+
+        Returns
+        -------
+        devalues : np.ndarray
+            Derivatives of the eigenvalues with respect to the speed. They are
+            set to zero for eigenvalues without a matching left eigenvector.
+
+        Examples
+        --------
+        >>> rotor = rotor_example()
+        >>> evalues, evectors = rotor._eigen(100, sparse=True)
+        >>> devalues = rotor._eigen_speed_derivative(100, evalues, evectors)
+        >>> evalues_h = rotor._eigen(100.01, sparse=True)[0]
+        >>> np.allclose(devalues[:4], (evalues_h[:4] - evalues[:4]) / 0.01, rtol=1e-3)
+        True
+        """
+        sparse = self.sparse_assembly
+        size = evectors.shape[0] // 2
+
+        rows, y = self._left_eigenvectors(speed, evalues, num_modes)
+        x = evectors[:size, rows]
+        lam = evalues[rows]
+
+        M = self.M(speed, sparse=sparse)
+        G = self.G(sparse=sparse)
+        D = self.C(speed, sparse=sparse) + G * speed
+        dM, dK, dC = (m[0] for m in self.assemble_matrices(speed, sparse=sparse, nu=1))
+
+        numerator = np.sum(y * (dM @ x * lam**2 + (dC + G) @ x * lam + dK @ x), axis=0)
+        denominator = np.sum(y * (M @ x * 2 * lam + D @ x), axis=0)
+
+        devalues = np.zeros_like(evalues)
+        devalues[rows] = -numerator / denominator
+
+        return devalues
+
     def _lti(self, speed, frequency=None):
         """Continuous-time linear time invariant system.
 
@@ -1881,83 +2492,489 @@ class Rotor(object):
 
         Returns
         -------
-        sys : StateSpaceContinuous
-            Space State Continuos with A, B, C and D matrices
+        sys : StateSpaceContinuous
+            Space State Continuos with A, B, C and D matrices
+
+        Example
+        -------
+        >>> rotor = rotor_example()
+        >>> A = rotor._lti(speed=0).A
+        >>> B = rotor._lti(speed=0).B
+        >>> C = rotor._lti(speed=0).C
+        >>> D = rotor._lti(speed=0).D
+        """
+        Z = np.zeros((self.ndof, self.ndof))
+        I = np.eye(self.ndof)
+
+        # x' = Ax + Bu
+        B2 = I
+        if frequency is None:
+            frequency = speed
+
+        A = self.A(speed=speed, frequency=frequency)
+        M = self.M(frequency)
+
+        # fmt: off
+        B = np.vstack([Z,
+                       la.solve(M, B2)])
+        # fmt: on
+
+        # y = Cx + Du
+        # Observation matrices
+        Cd = I
+        Cv = Z
+        Ca = Z
+
+        # fmt: off
+        C = np.hstack((Cd - Ca @ la.solve(M, self.K(frequency)), Cv - Ca @ la.solve(M, self.C(frequency))))
+        # fmt: on
+        D = Ca @ la.solve(M, B2)
+
+        sys = signal.lti(A, B, C, D)
+
+        return sys
+
+    def transfer_matrix(self, speed=None, frequency=None, modes=None):
+        """Calculate the fer matrix for the frequency response function (FRF).
+
+        Paramenters
+        -----------
+        frequency : float, optional
+            Excitation frequency. Default is rotor speed.
+        speed : float, optional
+            Rotating speed. Default is rotor speed (frequency).
+
+        Returns
+        -------
+        H : matrix
+            System transfer matrix
+
+        Example
+        -------
+        >>> rotor = rotor_example()
+        >>> speed = 100.0
+        >>> H = rotor.transfer_matrix(speed=speed)
+        """
+        if frequency is None:
+            frequency = speed
+
+        sparse = self.sparse_assembly
+
+        Z = (
+            -(frequency**2) * self.M(frequency=speed, sparse=sparse)
+            + 1j
+            * frequency
+            * (self.C(frequency=speed, sparse=sparse) + speed * self.G(sparse=sparse))
+            + self.K(frequency=speed, sparse=sparse)
+        )
+
+        return self._invert_dynamic_stiffness(Z)
+
+    def _invert_dynamic_stiffness(self, Z):
+        """Invert the dynamic stiffness matrix of the rotor.
+
+        Parameters
+        ----------
+        Z : np.ndarray or scipy.sparse matrix
+            Dynamic stiffness matrix (-w²M + jw(C + speed G) + K).
+
+        Returns
+        -------
+        H : np.ndarray
+            System transfer matrix. A zero matrix is returned if Z is singular.
+        """
+        return self._solve_dynamic_stiffness(Z, np.eye(Z.shape[0]))
+
+    @staticmethod
+    def _solve_dynamic_stiffness(Z, F):
+        """Solve the dynamic stiffness equation Z x = F.
+
+        Parameters
+        ----------
+        Z : np.ndarray or scipy.sparse matrix
+            Dynamic stiffness matrix (-w²M + jw(C + speed G) + K).
+        F : np.ndarray
+            Right hand side, with one column for each load case.
+
+        Returns
+        -------
+        x : np.ndarray
+            Response to each column of F. A zero array is returned if Z is
+            singular.
+        """
+        if sps.issparse(Z):
+            try:
+                x = las.splu(sps.csc_matrix(Z)).solve(F.astype(complex))
+            except RuntimeError:
+                # singular dynamic stiffness matrix
+                x = np.full(F.shape, np.nan)
+        else:
+            lu, piv = lu_factor(Z)
+            x = lu_solve((lu, piv), F)
+
+        if np.isnan(x).any():
+            x = np.zeros((x.shape))
+
+        return x
+
+    def _selection_matrix(self, items):
+        """Matrix that selects degrees of freedom or probe directions.
+
+        Parameters
+        ----------
+        items : list
+            Degrees of freedom (int) or ross.Probe objects. Radial probes
+            combine the x and y displacements of the node along the probe
+            angle, axial probes select the z displacement.
+
+        Returns
+        -------
+        S : scipy.sparse.csr_matrix
+            Matrix with shape (len(items), ndof), with one row for each item.
+
+        Examples
+        --------
+        >>> from ross import Probe
+        >>> rotor = rotor_example()
+        >>> S = rotor._selection_matrix([13, Probe(2, 0)])
+        >>> S.toarray()[:, 12:14]
+        array([[0., 1.],
+               [1., 0.]])
+        """
+        rows, cols, values = [], [], []
+
+        for i, item in enumerate(items):
+            try:
+                node, angle, direction = item.info
+            except AttributeError:
+                rows.append(i)
+                cols.append(int(item))
+                values.append(1.0)
+                continue
+
+            if node in self.link_nodes:
+                position_in_link = node - len(self.nodes_pos)
+                dof = len(self.nodes_pos) * self.number_dof + position_in_link * 3
+            else:
+                dof = self.number_dof * node
+
+            if direction == "axial":
+                if self.number_dof < 6:
+                    raise ValueError("Axial probes require a model with 6 dofs.")
+                rows.append(i)
+                cols.append(dof + 2)
+                values.append(1.0)
+            else:
+                if isinstance(angle, str):
+                    raise ValueError(
+                        f"Probe angle '{angle}' is not a direction. Use a numeric "
+                        "angle to select the response."
+                    )
+                rows += [i, i]
+                cols += [dof, dof + 1]
+                values += [np.cos(angle), np.sin(angle)]
+
+        return sps.csr_matrix((values, (rows, cols)), shape=(len(items), self.ndof))
+
+    def _modal_basis(self, speed, modes, frequency=None):
+        """Normalized right and left eigenvectors of a set of modes.
+
+        The eigenvectors of the quadratic problem are scaled so that the
+        transfer matrix is H(s) = sum_r X_r Y_r^T / (s - poles_r), where the
+        sum runs over the modes selected and their complex conjugates. The
+        overdamped modes (real eigenvalues) found with a magnitude up to the
+        largest one of the modes selected are added once, since they have no
+        complex conjugate and are not indexed by `run_modal`.
+
+        Parameters
+        ----------
+        speed : float
+            Rotor speed.
+        modes : array_like
+            Indices of the modes, as ordered by `run_modal`.
+        frequency : float, optional
+            Frequency at which the bearing coefficients are evaluated.
+            Default is rotor speed.
+
+        Returns
+        -------
+        X : np.ndarray
+            Right eigenvectors (displacement part), with shape (ndof, 2 * k).
+        Y : np.ndarray
+            Left eigenvectors divided by y^T (2 lambda M + D) x, with shape
+            (ndof, 2 * k).
+        poles : np.ndarray
+            Eigenvalues of the modes followed by their complex conjugates and
+            by the real eigenvalues of the overdamped modes.
+        """
+        if frequency is None:
+            frequency = speed
+
+        modes = np.asarray(modes, dtype=int)
+        num_modes = max(12, 2 * (modes.max() + 1) + 4)
+
+        evalues, evectors = self._eigen(
+            speed, num_modes=num_modes, frequency=frequency, sparse=True
+        )
+        # same rounding used to sort the eigenvalues in _index
+        wd = np.around(np.imag(evalues), decimals=10)
+        n_modes = np.sum(wd > 0)
+        if modes.max() >= n_modes:
+            raise ValueError(
+                f"Mode {modes.max()} is not available, only {n_modes} modes "
+                f"were found at speed {speed}."
+            )
+
+        overdamped = np.flatnonzero(
+            (wd == 0) & (np.abs(evalues) <= np.abs(evalues[modes]).max())
+        )
+        basis = np.concatenate([modes, overdamped])
+
+        rows, y = self._left_eigenvectors(speed, evalues, num_modes, frequency)
+        if not np.isin(basis, rows).all():
+            raise ValueError("Left eigenvectors not found for all the modes.")
+        y = y[:, np.searchsorted(rows, basis)]
+        x = evectors[: self.ndof, basis]
+        lam = evalues[basis]
+
+        sparse = self.sparse_assembly
+        M = self.M(frequency, sparse=sparse)
+        D = self.C(frequency, sparse=sparse) + self.G(sparse=sparse) * speed
+        y = y / np.sum(y * (M @ x * 2 * lam + D @ x), axis=0)
+
+        # the complex conjugate eigenpairs complete each underdamped mode
+        k = len(modes)
+        X = np.hstack([x[:, :k], x[:, :k].conj(), x[:, k:]])
+        Y = np.hstack([y[:, :k], y[:, :k].conj(), y[:, k:]])
+        poles = np.concatenate([lam[:k], lam[:k].conj(), lam[k:].real])
+
+        return X, Y, poles
+
+    def _constant_modal_basis(self, free_free=False):
+        """Check if the eigenpairs are the same for all the speeds.
+
+        The eigenpairs only change along a speed range with the gyroscopic
+        effect and the bearing coefficients.
+
+        Parameters
+        ----------
+        free_free : bool, optional
+            If True, the rotor is considered as free-free (no rotation and
+            bearing coefficients at zero frequency). Default is False.
+
+        Returns
+        -------
+        bool
+            True if a single eigenvalue solution is valid for all the speeds.
+        """
+        return free_free or (
+            not abs(self.G(sparse=self.sparse_assembly)).max()
+            and all(b.frequency is None for b in self.bearing_elements)
+        )
+
+    def _solve_frequency_range(
+        self,
+        speed_range,
+        force,
+        free_free=False,
+        sparse=None,
+        outputs=None,
+        n_jobs=1,
+        chunk_size=64,
+    ):
+        """Solve the dynamic stiffness equation Z(w) x = F for a speed range.
+
+        The speeds are split in chunks. For each chunk the bearing coefficients
+        are evaluated at once and, for dense matrices, the dynamic stiffness
+        matrices are stacked in a 3-D array and solved with a single batched
+        LAPACK call (numpy.linalg.solve). Chunks can be solved concurrently in
+        a thread pool, since the LAPACK and SuperLU solvers release the GIL.
+
+        Parameters
+        ----------
+        speed_range : array_like
+            Rotor speeds, which are also the excitation frequencies.
+        force : np.ndarray
+            Right hand side with shape (ndof, n_cases), used for all the
+            speeds, or with shape (ndof, n_cases, len(speed_range)).
+        free_free : bool, optional
+            If True, the rotor is considered as free-free (no rotation and
+            bearing coefficients at zero frequency). Default is False.
+        sparse : bool, optional
+            If True, each speed is solved with a sparse LU factorization.
+            Default is the rotor sparse_assembly attribute.
+        outputs : np.ndarray or scipy.sparse matrix, optional
+            Matrix with shape (n_outputs, ndof) applied to the solutions.
+            Default is None, which returns all the degrees of freedom.
+        n_jobs : int, optional
+            Number of threads used to solve the chunks. If -1, all the
+            processors are used. Default is 1.
+        chunk_size : int, optional
+            Number of speeds in each chunk. Default is 64.
+
+        Returns
+        -------
+        response : np.ndarray
+            Complex array with shape (n_outputs, n_cases, len(speed_range)).
+            The response is set to zero at speeds with a singular dynamic
+            stiffness matrix.
 
-        Example
-        -------
+        Examples
+        --------
         >>> rotor = rotor_example()
-        >>> A = rotor._lti(speed=0).A
-        >>> B = rotor._lti(speed=0).B
-        >>> C = rotor._lti(speed=0).C
-        >>> D = rotor._lti(speed=0).D
+        >>> speed = np.linspace(0, 1000, 101)
+        >>> H = rotor._solve_frequency_range(speed, np.eye(rotor.ndof), n_jobs=2)
+        >>> np.allclose(H[..., 50], rotor.transfer_matrix(speed=speed[50]))
+        True
         """
-        Z = np.zeros((self.ndof, self.ndof))
-        I = np.eye(self.ndof)
+        if sparse is None:
+            sparse = self.sparse_assembly
+        if n_jobs == -1:
+            n_jobs = os.cpu_count()
+
+        speed_range = np.asarray(speed_range, dtype=float)
+        force = np.asarray(force, dtype=complex)
+        n_outputs = self.ndof if outputs is None else outputs.shape[0]
+        response = np.empty(
+            (n_outputs, force.shape[1], len(speed_range)), dtype=complex
+        )
 
-        # x' = Ax + Bu
-        B2 = I
-        if frequency is None:
-            frequency = speed
+        G = self.G(sparse=sparse)
+        if free_free:
+            M0, K0, C0 = self.assemble_matrices(0, sparse=sparse)
 
-        A = self.A(speed=speed, frequency=frequency)
-        M = self.M(frequency)
+        def solve_chunk(chunk):
+            speeds = speed_range[chunk]
+            if free_free:
+                M, K, C = M0, K0, C0
+                rotation = np.zeros_like(speeds)
+            else:
+                M, K, C = self.assemble_matrices(speeds, sparse=sparse)
+                rotation = speeds
 
-        # fmt: off
-        B = np.vstack([Z,
-                       la.solve(M, B2)])
-        # fmt: on
+            if force.ndim == 3:
+                F = np.moveaxis(force[..., chunk], -1, 0)
+            else:
+                F = np.broadcast_to(force, (len(chunk), *force.shape))
 
-        # y = Cx + Du
-        # Observation matrices
-        Cd = I
-        Cv = Z
-        Ca = Z
+            if sparse:
+                x = np.empty((len(chunk), self.ndof, force.shape[1]), dtype=complex)
+                for j, (w, r) in enumerate(zip(speeds, rotation)):
+                    k = 0 if free_free else j
+                    Z = -(w**2) * M[k] + 1j * w * (C[k] + r * G) + K[k]
+                    x[j] = self._solve_dynamic_stiffness(Z, F[j])
+            else:
+                w = speeds[:, np.newaxis, np.newaxis]
+                r = rotation[:, np.newaxis, np.newaxis]
+                Z = -(w**2) * M + 1j * w * (C + r * G) + K
+                try:
+                    x = np.linalg.solve(Z, F)
+                except np.linalg.LinAlgError:
+                    x = np.array(
+                        [self._solve_dynamic_stiffness(Zj, Fj) for Zj, Fj in zip(Z, F)]
+                    )
+                # singular dynamic stiffness matrices
+                x[~np.isfinite(x).all(axis=(1, 2))] = 0
 
-        # fmt: off
-        C = np.hstack((Cd - Ca @ la.solve(M, self.K(frequency)), Cv - Ca @ la.solve(M, self.C(frequency))))
-        # fmt: on
-        D = Ca @ la.solve(M, B2)
+            if outputs is not None:
+                x = np.stack([outputs @ xj for xj in x])
+            response[..., chunk] = np.moveaxis(x, 0, -1)
 
-        sys = signal.lti(A, B, C, D)
+        n_chunks = max(int(np.ceil(len(speed_range) / chunk_size)), 1)
+        chunks = np.array_split(np.arange(len(speed_range)), n_chunks)
 
-        return sys
+        if n_jobs is not None and n_jobs > 1:
+            with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                list(executor.map(solve_chunk, chunks))
+        else:
+            for chunk in chunks:
+                solve_chunk(chunk)
 
-    def transfer_matrix(self, speed=None, frequency=None, modes=None):
-        """Calculate the fer matrix for the frequency response function (FRF).
+        return response
 
-        Paramenters
-        -----------
+    def _modal_transfer_matrix(
+        self,
+        speed,
+        frequency_range,
+        modes,
+        frequency=None,
+        residual=False,
+        inputs=None,
+        outputs=None,
+    ):
+        """Transfer matrices from a truncated modal superposition.
+
+        With the right and left eigenvectors x_k and y_k of the quadratic
+        problem, the transfer matrix is approximated by the modes selected
+
+            H(w) = sum_k x_k y_k^T / (a_k (jw - lambda_k)) + c.c.
+
+        with a_k = y_k^T (2 lambda_k M + D) x_k, which only needs one
+        eigenvalue solution for all the excitation frequencies.
+
+        Parameters
+        ----------
+        speed : float
+            Rotor speed.
+        frequency_range : array_like
+            Excitation frequencies at which the transfer matrix is evaluated.
+        modes : array_like
+            Indices of the modes, as ordered by `run_modal`, used in the sum.
         frequency : float, optional
-            Excitation frequency. Default is rotor speed.
-        speed : float, optional
-            Rotating speed. Default is rotor speed (frequency).
+            Frequency at which the bearing coefficients are evaluated.
+            Default is rotor speed.
+        residual : bool, optional
+            If True, the static contribution of the modes left out of the sum
+            (residual flexibility) is added, so that the transfer matrix is
+            exact at zero frequency. Default is False.
+        inputs : np.ndarray or scipy.sparse matrix, optional
+            Matrix with shape (ndof, n_inputs) whose columns are the force
+            directions. Default is all the degrees of freedom.
+        outputs : np.ndarray or scipy.sparse matrix, optional
+            Matrix with shape (n_outputs, ndof) whose rows are the response
+            directions. Default is all the degrees of freedom.
 
         Returns
         -------
-        H : matrix
-            System transfer matrix
+        H : np.ndarray
+            Transfer matrices with shape (n_outputs, n_inputs,
+            len(frequency_range)).
 
-        Example
-        -------
+        Examples
+        --------
         >>> rotor = rotor_example()
-        >>> speed = 100.0
-        >>> H = rotor.transfer_matrix(speed=speed)
+        >>> H = rotor._modal_transfer_matrix(0, [10.0, 20.0], modes=range(6))
+        >>> H.shape
+        (42, 42, 2)
         """
         if frequency is None:
             frequency = speed
 
-        I = np.eye(self.M().shape[0])
-
-        lu, piv = lu_factor(
-            -(frequency**2) * self.M(frequency=speed)
-            + 1j * frequency * (self.C(frequency=speed) + speed * self.G())
-            + self.K(frequency=speed)
-        )
-        H = lu_solve((lu, piv), I)
-
-        if np.isnan(H).any():
-            H = np.zeros((H.shape))
+        frequency_range = np.atleast_1d(np.asarray(frequency_range, dtype=float))
+        X, Y, poles = self._modal_basis(speed, modes, frequency=frequency)
+        sparse = self.sparse_assembly
+
+        if inputs is None:
+            inputs = np.eye(self.ndof)
+        elif sps.issparse(inputs):
+            inputs = inputs.toarray()
+        if outputs is not None:
+            X = outputs @ X
+        Y = inputs.T @ Y
+
+        W = 1 / (1j * frequency_range[np.newaxis, :] - poles[:, np.newaxis])
+        H = np.einsum("ir,rf,jr->ijf", X, W, Y, optimize=True)
+
+        if residual:
+            K = self.K(frequency, sparse=sparse)
+            H_static = self._solve_dynamic_stiffness(K, inputs)
+            if not H_static.any():
+                # rigid body modes: the flexibility of the elastic modes only
+                K = K.toarray() if sps.issparse(K) else K
+                H_static = la.pinv(K) @ inputs
+            if outputs is not None:
+                H_static = outputs @ H_static
+            H += (H_static + (X / poles) @ Y.T)[..., np.newaxis]
 
         return H
 
@@ -1967,12 +2984,21 @@ class Rotor(object):
         speed_range=None,
         modes=None,
         free_free=False,
+        residual_flexibility=False,
+        inputs=None,
+        outputs=None,
+        n_jobs=1,
+        chunk_size=64,
     ):
         """Frequency response for a mdof system.
 
         This method returns the frequency response for a mdof system given a range of
         frequencies and the modes that will be used.
 
+        If inputs or outputs are given, only the transfer functions between them
+        are computed (one solution with a column for each input per frequency),
+        instead of the full ndof x ndof transfer matrices.
+
         Available plotting methods:
             .plot()
             .plot_magnitude()
@@ -1985,11 +3011,34 @@ class Rotor(object):
             Array with the desired range of frequencies.
             Default is 0 to 1.5 x highest damped natural frequency.
         modes : list, optional
-            Modes that will be used to calculate the frequency response
-            (all modes will be used if a list is not given).
+            Modes that will be used to calculate the frequency response, as
+            ordered by `run_modal`. If a list is given, the response is built
+            by modal superposition of these modes, and of the overdamped modes
+            in their frequency band; otherwise the dynamic stiffness matrix is
+            inverted at each frequency.
         free_free : bool, optional
             If True, the method will consider the rotor system as free-free.
             Default is False.
+        residual_flexibility : bool, optional
+            If True, the static contribution of the modes not included in
+            `modes` is added to the modal superposition. Only used if `modes`
+            is given. Default is False.
+        inputs : list, optional
+            Degrees of freedom (int) or ross.Probe objects where the forces are
+            applied. A radial probe applies the force along its angle.
+            Default is all the degrees of freedom.
+        outputs : list, optional
+            Degrees of freedom (int) or ross.Probe objects where the response
+            is measured. Default is all the degrees of freedom.
+            If inputs or outputs are given, the responses have shape
+            (len(outputs), len(inputs), n_freq), see
+            :py:class:`ross.FrequencyResponseResults`.
+        n_jobs : int, optional
+            Number of threads used to solve chunks of frequencies concurrently.
+            If -1, all the processors are used. Default is 1.
+        chunk_size : int, optional
+            Number of frequencies solved in each batched call. Larger chunks
+            use more memory. Default is 64.
 
         Returns
         -------
@@ -2015,7 +3064,7 @@ class Rotor(object):
         Selecting the desirable modes, if you want a reduced model:
         >>> response = rotor.run_freq_response(speed_range=speed, modes=[0, 1, 2, 3, 4])
         >>> abs(response.freq_resp) # doctest: +ELLIPSIS
-        array([[[0.00000000e+00, 1.00261725e-06, 1.01076952e-06, ...
+        array([[[5.30784319e-07, 5.33726447e-07, 5.42834592e-07, ...
 
         Plotting frequency response function:
         >>> fig = response.plot(inp=13, out=13)
@@ -2029,6 +3078,15 @@ class Rotor(object):
 
         Plotting acceleration response
         >>> fig = response.plot(inp=13, out=13, amplitude_units="m/s**2/N")
+
+        Selecting inputs and outputs, the results only store their responses:
+        >>> probe = rs.Probe(2, Q_(45, "deg"), tag="Probe 1")
+        >>> response = rotor.run_freq_response(
+        ...     speed_range=speed, inputs=[13], outputs=[13, probe]
+        ... )
+        >>> response.freq_resp.shape
+        (2, 1, 101)
+        >>> fig = response.plot(inp=0, out=1)
         """
 
         if speed_range is not None:
@@ -2037,10 +3095,20 @@ class Rotor(object):
         if modes is not None:
             modes = tuple(modes)
 
+        if inputs is not None:
+            inputs = tuple(inputs)
+
+        if outputs is not None:
+            outputs = tuple(outputs)
+
         return self._run_freq_response(
             speed_range=speed_range,
             modes=modes,
             free_free=free_free,
+            residual_flexibility=residual_flexibility,
+            inputs=inputs,
+            outputs=outputs,
+            settings=_SolverSettings(n_jobs=n_jobs, chunk_size=chunk_size),
         )
 
     @lru_cache()
@@ -2049,6 +3117,10 @@ class Rotor(object):
         speed_range=None,
         modes=None,
         free_free=False,
+        residual_flexibility=False,
+        inputs=None,
+        outputs=None,
+        settings=None,
     ):
         """Frequency response for a mdof system.
 
@@ -2073,6 +3145,17 @@ class Rotor(object):
             Tolerance (relative) for termination.
         free_free : bool, optional
             If True, the method will consider the rotor system as free-free.
+        residual_flexibility : bool, optional
+            If True, the residual flexibility is added to the modal
+            superposition.
+        inputs : tuple, optional
+            Degrees of freedom or probes where the forces are applied.
+        outputs : tuple, optional
+            Degrees of freedom or probes where the response is measured.
+        settings : _SolverSettings, optional
+            Number of threads and chunk size of the direct solution. All the
+            settings are equal for the cache, since they do not change the
+            response.
 
         Returns
         -------
@@ -2086,27 +3169,51 @@ class Rotor(object):
 
         self._check_frequency_array(speed_range)
 
-        freq_resp = np.empty((self.ndof, self.ndof, len(speed_range)), dtype=complex)
-        velc_resp = np.empty((self.ndof, self.ndof, len(speed_range)), dtype=complex)
-        accl_resp = np.empty((self.ndof, self.ndof, len(speed_range)), dtype=complex)
+        # only the columns of the selected inputs are solved for
+        B = np.eye(self.ndof)
+        if inputs is not None:
+            B = self._selection_matrix(inputs).T.toarray()
+        S = None if outputs is None else self._selection_matrix(outputs)
 
-        if free_free:
-            transfer_matrix = lambda s: self.transfer_matrix(speed=0, frequency=s)
-        else:
-            transfer_matrix = lambda s: self.transfer_matrix(speed=s)
+        n_outputs = self.ndof if outputs is None else len(outputs)
+        freq_resp = np.empty((n_outputs, B.shape[1], len(speed_range)), dtype=complex)
 
-        for i, speed in enumerate(speed_range):
-            H = transfer_matrix(speed)
-            freq_resp[..., i] = H
-            velc_resp[..., i] = 1j * speed * H
-            accl_resp[..., i] = -(speed**2) * H
+        speed_range = np.asarray(speed_range)
+
+        if modes is not None:
+            modal_kwargs = dict(residual=residual_flexibility, inputs=B, outputs=S)
+
+            if self._constant_modal_basis(free_free):
+                freq_resp[:] = self._modal_transfer_matrix(
+                    0,
+                    speed_range,
+                    modes,
+                    frequency=0 if free_free else speed_range[0],
+                    **modal_kwargs,
+                )
+            else:
+                for i, speed in enumerate(speed_range):
+                    freq_resp[..., i] = self._modal_transfer_matrix(
+                        speed, speed, modes, **modal_kwargs
+                    )[..., 0]
+        else:
+            freq_resp[:] = self._solve_frequency_range(
+                speed_range,
+                B,
+                free_free=free_free,
+                outputs=S,
+                **(settings or {}),
+            )
 
+        # velocity and acceleration are derived from the displacement on demand
         results = FrequencyResponseResults(
             freq_resp=freq_resp,
-            velc_resp=velc_resp,
-            accl_resp=accl_resp,
-            speed_range=np.array(speed_range),
+            velc_resp=None,
+            accl_resp=None,
+            speed_range=speed_range,
             number_dof=self.number_dof,
+            inputs=inputs,
+            outputs=outputs,
         )
 
         return results
@@ -2302,6 +3409,86 @@ class Rotor(object):
 
         return results
 
+    def _solve_forced_response(
+        self,
+        force,
+        speed_range,
+        modes=None,
+        free_free=False,
+        n_jobs=1,
+        chunk_size=64,
+    ):
+        """Response to harmonic forces without forming the transfer matrices.
+
+        The equation Z(w) x = F(w) is solved at each speed, with all the load
+        cases of that speed as the right hand side of a single factorization.
+        Rotors with sparse_assembly=True are solved with a sparse LU
+        factorization, and the others with batched dense solves over chunks
+        of speeds. If modes are given, the response is built by modal
+        superposition of these modes.
+
+        Parameters
+        ----------
+        force : np.ndarray
+            Complex forces with shape (ndof, n_cases, len(speed_range)).
+        speed_range : array_like
+            Rotor speeds, which are also the excitation frequencies.
+        modes : list, optional
+            Modes used in the modal superposition, as ordered by `run_modal`.
+            Default is None, which solves the full system.
+        free_free : bool, optional
+            If True, the rotor is considered as free-free. Default is False.
+        n_jobs : int, optional
+            Number of threads used to solve chunks of frequencies concurrently.
+            If -1, all the processors are used. Default is 1.
+        chunk_size : int, optional
+            Number of frequencies solved in each batched call. Larger chunks
+            use more memory. Default is 64.
+
+        Returns
+        -------
+        response : np.ndarray
+            Complex response with the same shape as the forces.
+
+        Examples
+        --------
+        >>> rotor = rotor_example()
+        >>> speed = np.linspace(0, 1000, 11)
+        >>> force = np.stack(
+        ...     [rotor._unbalance_force(n, 0.001, 0.0, speed) for n in (2, 4)], axis=1
+        ... )
+        >>> rotor._solve_forced_response(force, speed).shape
+        (42, 2, 11)
+        """
+        speed_range = np.asarray(speed_range)
+        force = np.asarray(force, dtype=complex)
+        response = np.empty(force.shape, dtype=complex)
+
+        if modes is None:
+            response[:] = self._solve_frequency_range(
+                speed_range,
+                force,
+                free_free=free_free,
+                n_jobs=n_jobs,
+                chunk_size=chunk_size,
+            )
+
+        elif self._constant_modal_basis(free_free):
+            X, Y, poles = self._modal_basis(
+                0, modes, frequency=0 if free_free else speed_range[0]
+            )
+            W = 1 / (1j * speed_range[np.newaxis, :] - poles[:, np.newaxis])
+            modal_force = np.einsum("ir,icf->rcf", Y, force)
+            response[:] = np.einsum("ir,rf,rcf->icf", X, W, modal_force)
+
+        else:
+            for i, speed in enumerate(speed_range):
+                X, Y, poles = self._modal_basis(speed, modes)
+                modal_force = Y.T @ force[..., i] / (1j * speed - poles)[:, np.newaxis]
+                response[..., i] = X @ modal_force
+
+        return response
+
     @check_units
     def run_forced_response(
         self,
@@ -2309,6 +3496,8 @@ class Rotor(object):
         speed_range=None,
         modes=None,
         unbalance=None,
+        n_jobs=1,
+        chunk_size=64,
     ):
         """Forced response for a mdof system.
 
@@ -2333,13 +3522,19 @@ class Rotor(object):
         speed_range : list, array, pint.Quantity
             Array with the desired range of frequencies
         modes : list, optional
-            Modes that will be used to calculate the frequency response
-            (all modes will be used if a list is not given).
+            Modes that will be used to calculate the response by modal
+            superposition (the full system is solved if a list is not given).
         unbalance : array, optional
             Array with the unbalance data (node, magnitude and phase) to be plotted
             with deflected shape. This argument is set only if running an unbalance
             response analysis.
             Default is None.
+        n_jobs : int, optional
+            Number of threads used to solve chunks of frequencies concurrently.
+            If -1, all the processors are used. Default is 1.
+        chunk_size : int, optional
+            Number of frequencies solved in each batched call. Larger chunks
+            use more memory. Default is 64.
 
         Returns
         -------
@@ -2360,16 +3555,19 @@ class Rotor(object):
             modal = self.run_modal(0)
             speed_range = np.linspace(0, max(modal.evalues.imag) * 1.5, 1000)
 
-        freq_resp = self.run_freq_response(speed_range, modes)
-
-        forced_resp = np.zeros((self.ndof, len(freq_resp.speed_range)), dtype=complex)
-        velc_resp = np.zeros((self.ndof, len(freq_resp.speed_range)), dtype=complex)
-        accl_resp = np.zeros((self.ndof, len(freq_resp.speed_range)), dtype=complex)
+        self._check_frequency_array(speed_range)
+        speed_range = np.asarray(speed_range)
 
-        for i in range(len(freq_resp.speed_range)):
-            forced_resp[:, i] = freq_resp.freq_resp[..., i] @ force[..., i]
-            velc_resp[:, i] = freq_resp.velc_resp[..., i] @ force[..., i]
-            accl_resp[:, i] = freq_resp.accl_resp[..., i] @ force[..., i]
+        force = np.asarray(force)
+        forced_resp = self._solve_forced_response(
+            force[:, np.newaxis, :],
+            speed_range,
+            modes=modes,
+            n_jobs=n_jobs,
+            chunk_size=chunk_size,
+        )[:, 0, :]
+        velc_resp = 1j * speed_range * forced_resp
+        accl_resp = -(speed_range**2) * forced_resp
 
         forced_resp = ForcedResponseResults(
             rotor=self,
@@ -2501,6 +3699,8 @@ class Rotor(object):
         unbalance_phase,
         frequency=None,
         modes=None,
+        n_jobs=1,
+        chunk_size=64,
     ):
         """Unbalanced response for a mdof system.
 
@@ -2532,6 +3732,12 @@ class Rotor(object):
         modes : list, optional
             Modes that will be used to calculate the frequency response
             (all modes will be used if a list is not given).
+        n_jobs : int, optional
+            Number of threads used to solve chunks of frequencies concurrently.
+            If -1, all the processors are used. Default is 1.
+        chunk_size : int, optional
+            Number of frequencies solved in each batched call. Larger chunks
+            use more memory. Default is 64.
 
         Returns
         -------
@@ -2610,11 +3816,109 @@ class Rotor(object):
             speed_range=frequency,
             modes=modes,
             unbalance=ub,
+            n_jobs=n_jobs,
+            chunk_size=chunk_size,
         )
         # fmt: on
 
         return forced_response
 
+    @check_units
+    def run_influence_coefficients(
+        self,
+        probes,
+        nodes=None,
+        frequency=None,
+        n_jobs=1,
+        chunk_size=64,
+    ):
+        """Unbalance influence coefficients.
+
+        This method returns the response at each probe to a unit unbalance
+        (1 kg.m at 0 rad) at each candidate node. The dynamic stiffness matrix
+        is factored once per frequency, with the unbalances of all the nodes
+        as right hand sides, so that the response to any number of unbalance
+        scenarios is evaluated afterwards as a linear combination of the
+        coefficients (see :py:class:`ross.InfluenceCoefficientResults`).
+
+        Parameters
+        ----------
+        probes : list
+            Degrees of freedom (int) or ross.Probe objects where the response
+            is measured. The probe angle must be numeric.
+        nodes : list, optional
+            Candidate nodes for the unbalance. Default is all the nodes.
+        frequency : list, pint.Quantity
+            List with the desired range of frequencies (rad/s).
+            Default is 0 to 1.5 x highest damped natural frequency.
+        n_jobs : int, optional
+            Number of threads used to solve chunks of frequencies concurrently.
+            If -1, all the processors are used. Default is 1.
+        chunk_size : int, optional
+            Number of frequencies solved in each batched call. Larger chunks
+            use more memory. Default is 64.
+
+        Returns
+        -------
+        results : ross.InfluenceCoefficientResults
+            For more information on attributes and methods available see:
+            :py:class:`ross.InfluenceCoefficientResults`
+
+        Examples
+        --------
+        >>> import ross as rs
+        >>> rotor = rs.rotor_example()
+        >>> speed = np.linspace(0, 1000, 101)
+        >>> ic = rotor.run_influence_coefficients([18, 19], frequency=speed)
+        >>> ic.influence.shape
+        (2, 7, 101)
+        >>> response = ic.unbalance_response([3], [10.0], [0.0])
+        >>> unbalance = rotor.run_unbalance_response(3, 10.0, 0.0, frequency=speed)
+        >>> np.allclose(response, unbalance.forced_resp[18:20])
+        True
+        """
+        if frequency is None:
+            modal = self.run_modal(0)
+            frequency = np.linspace(0, max(modal.evalues.imag) * 1.5, 1000)
+
+        self._check_frequency_array(frequency)
+        frequency = np.asarray(frequency, dtype=float)
+
+        if nodes is None:
+            nodes = range(len(self.nodes_pos))
+        nodes = np.atleast_1d(np.asarray(nodes, dtype=int))
+
+        # unit unbalance forces without the w² factor, one column per node
+        B = np.zeros((self.ndof, len(nodes)), dtype=complex)
+        cols = np.arange(len(nodes))
+        B[self.number_dof * nodes, cols] = 1.0
+        B[self.number_dof * nodes + 1, cols] = -1j
+
+        influence = self._solve_frequency_range(
+            frequency,
+            B,
+            outputs=self._selection_matrix(probes),
+            n_jobs=n_jobs,
+            chunk_size=chunk_size,
+        )
+        influence *= frequency**2
+
+        labels = [
+            (
+                probe.tag or probe.get_label(i + 1)
+                if isinstance(probe, Probe)
+                else f"dof {probe}"
+            )
+            for i, probe in enumerate(probes)
+        ]
+
+        return InfluenceCoefficientResults(
+            influence=influence,
+            speed_range=frequency,
+            nodes=nodes,
+            probes=labels,
+        )
+
     def magnetic_bearing_controller(
         self, step, magnetic_bearings, time_step, disp_resp, **kwargs
     ):
@@ -2788,7 +4092,7 @@ class Rotor(object):
             M = self.M()
             num_dof = self.number_dof
 
-        gravity = np.zeros(len(M))
+        gravity = np.zeros(M.shape[0])
         gravity[idx[direction] :: num_dof] = g
 
         return M @ gravity
@@ -2843,6 +4147,24 @@ class Rotor(object):
             length as the degrees of freedom of the rotor system `rotor.ndof`. This function
             allows for the incorporation of supplementary terms or external effects in the rotor
             system dynamics beyond the specified force input during the time integration process.
+            A `ross.utils.ForceKernel` can be given instead, to be evaluated in the compiled loop.
+            If `add_to_RHS` has a `jacobian` attribute, returning the derivatives of the force
+            with respect to the displacements and velocities (see `newmark`), they are used by
+            the robust Newmark method, unless there are magnetic bearings.
+        output_file : str, pathlib.Path, optional
+            If given, the response is written in chunks to this .npy file while the system is
+            integrated, instead of being kept in memory, and a `ross.utils.TimeResponseStore`
+            that reads the file lazily is returned as `yout`. Default is None.
+        output_dofs : list of int, optional
+            Degrees of freedom of the full model stored in `output_file`. Default is all of them.
+        output_decimation : int, optional
+            Only every `output_decimation` time steps are stored in `output_file`, and the
+            returned time array is decimated accordingly. Default is 1.
+        jit : bool, optional
+            If True, the simple Newmark method runs in a loop compiled with numba whenever
+            the system matrices are dense (dense assembly or model reduction), there are no
+            magnetic bearings, the bearing coefficients do not vary along a speed array and
+            `add_to_RHS` is None or a `ross.utils.ForceKernel`. Default is True.
 
         Returns
         -------
@@ -2942,16 +4264,115 @@ class Rotor(object):
                 )
             )
 
-        rotor_system, rhs_func = self._rotor_system_for_integrate(
-            rotor, speed, t, reduction, forces, **kwargs
-        )
+        # Derivatives of the additional forces, if available, are used by the
+        # Newton-Raphson iterations of the robust Newmark method
+        force_jacobian = getattr(add_to_RHS, "jacobian", None)
+        if force_jacobian is not None and not len(xout):
+            forces.jacobian = lambda step, **curr_state: tuple(
+                None if dF is None else reduction[0](dF)
+                for dF in force_jacobian(
+                    step,
+                    time_step=curr_state.get("time_step"),
+                    disp_resp=reduction[2](curr_state.get("disp_resp")),
+                    velc_resp=reduction[2](curr_state.get("velc_resp")),
+                    accl_resp=reduction[2](curr_state.get("accl_resp")),
+                    args=curr_state.get("args"),
+                )
+            )
+
+        # Stream the response to a file instead of keeping it in memory
+        output_file = kwargs.pop("output_file", None)
+        decimation = kwargs.pop("output_decimation", 1)
+        output_dofs = kwargs.pop("output_dofs", None)
+        if output_file is not None:
+            transform = reduction[2](np.eye(F.shape[1])) if model_reduction else None
+            kwargs["output"] = TimeResponseStore(
+                output_file,
+                len(t),
+                self.ndof,
+                dofs=output_dofs,
+                decimation=decimation,
+                transform=transform,
+            )
+
+        if self._use_compiled_integration(speed, xout, bool(model_reduction), **kwargs):
+            M, C1, C2, K1, K2 = self._integration_matrices(
+                rotor, speed, reduction[0], **kwargs
+            )
+            accel = np.gradient(speed, t) if speed_is_array else 0.0
+            T = None
+            if add_to_RHS is not None:
+                T = reduction[2](np.eye(F.shape[1]))[add_to_RHS.dofs]
+
+            response = newmark_compiled(
+                M,
+                C1,
+                C2,
+                K1,
+                K2,
+                speed,
+                accel,
+                F,
+                t,
+                force_kernel=add_to_RHS,
+                T=T,
+                **kwargs,
+            )
+        else:
+            rotor_system, rhs_func = self._rotor_system_for_integrate(
+                rotor, speed, t, reduction, forces, **kwargs
+            )
+
+            size = F.shape[1]
+            response = newmark(rotor_system, rhs_func, t, size, **kwargs)
+
+        if output_file is not None:
+            return t[::decimation], response, xout
 
-        size = F.shape[1]
-        response = newmark(rotor_system, rhs_func, t, size, **kwargs)
         yout = reduction[2](response.T).T
 
         return t, yout, xout
 
+    def _use_compiled_integration(self, speed, xout, reduced, **kwargs):
+        """Check if the time integration can run in the compiled Newmark loop.
+
+        The compiled loop is used for the simple Newmark method with dense
+        matrices (dense assembly or a reduced model), when the matrices do not depend on the bearing coefficients
+        at each speed, there are no magnetic bearings (xout is empty) and the
+        additional forces, if any, are given by a ross.utils.ForceKernel.
+        """
+        if (
+            not kwargs.get("jit", True)
+            or kwargs.get("newmark_type", "simple") != "simple"
+            or "progress_interval" in kwargs
+            or (self.sparse_assembly and not reduced)
+            or len(xout)
+            or not isinstance(kwargs.get("add_to_RHS"), (ForceKernel, type(None)))
+        ):
+            return False
+
+        return not (
+            isinstance(speed, Iterable)
+            and any(brg.frequency is not None for brg in self.bearing_elements)
+        )
+
+    def _integration_matrices(self, rotor, speed, reduce_matrix, **kwargs):
+        """Matrices M, C1, C2, K1 and K2 of the equation of motion.
+
+        The damping and stiffness matrices are C1 + speed * C2 and
+        K1 + accel * K2, where C1 and K1 are evaluated at the mean speed.
+        """
+        speed_ref = np.mean(speed) if isinstance(speed, Iterable) else speed
+
+        sparse = self.sparse_assembly
+        M = reduce_matrix(kwargs.get("M", self.M(sparse=sparse)))
+        C1 = reduce_matrix(kwargs.get("C", rotor.C(speed_ref, sparse=sparse)))
+        C2 = reduce_matrix(kwargs.get("G", self.G(sparse=sparse)))
+        K1 = reduce_matrix(kwargs.get("K", rotor.K(speed_ref, sparse=sparse)))
+        K2 = reduce_matrix(kwargs.get("Ksdt", self.Ksdt(sparse=sparse)))
+
+        return M, C1, C2, K1, K2
+
     def _rotor_system_for_integrate(
         self, rotor, speed, t, reduce_model, forces, **kwargs
     ):
@@ -2962,9 +4383,10 @@ class Rotor(object):
 
         # Assemble matrices
         reduce_matrix = reduce_model[0]
-        M = reduce_matrix(kwargs.get("M", self.M()))
-        C2 = reduce_matrix(kwargs.get("G", self.G()))
-        K2 = reduce_matrix(kwargs.get("Ksdt", self.Ksdt()))
+        sparse = self.sparse_assembly
+        M, C1, C2, K1, K2 = self._integration_matrices(
+            rotor, speed, reduce_matrix, **kwargs
+        )
 
         # Depending on the conditions of the analysis,
         # one of the three options below will be chosen.
@@ -2981,9 +4403,14 @@ class Rotor(object):
                         "The bearing coefficients vary with speed. Therefore, C and K matrices are not being replaced by the matrices defined as input arguments."
                     )
 
+                # only the blocks of the bearings with variable coefficients
+                # are updated at each step
+                bearing_matrices = rotor._speed_varying_bearings(
+                    speed, reduce_model, M.shape[0], sparse
+                )
+
                 def rotor_system(step, **current_state):
-                    C1 = reduce_matrix(self.C(speed[step]))
-                    K1 = reduce_matrix(self.K(speed[step]))
+                    C1, K1 = bearing_matrices(step)
 
                     return (
                         M,
@@ -2993,9 +4420,6 @@ class Rotor(object):
                     )
 
             else:  # Option 2
-                C1 = reduce_matrix(kwargs.get("C", rotor.C(speed_ref)))
-                K1 = reduce_matrix(kwargs.get("K", rotor.K(speed_ref)))
-
                 rotor_system = lambda step, **current_state: (
                     M,
                     C1 + C2 * speed[step],
@@ -3004,18 +4428,158 @@ class Rotor(object):
                 )
 
         else:  # Option 3
-            C1 = reduce_matrix(kwargs.get("C", rotor.C(speed_ref)))
-            K1 = reduce_matrix(kwargs.get("K", rotor.K(speed_ref)))
+            # the same matrices are returned at every step, so that the
+            # integrator factorizes the Jacobian only once
+            C = C1 + C2 * speed_ref
 
             rotor_system = lambda step, **current_state: (
                 M,
-                C1 + C2 * speed_ref,
+                C,
                 K1,
                 forces(step, **current_state),
             )
 
         return rotor_system, forces
 
+    def _bearing_frequency_ratios(self):
+        """Ratios between the frequency of each bearing element and the rotor speed.
+
+        Returns
+        -------
+        ratios : np.ndarray
+            Ratio for each bearing element, in the order of `bearing_elements`.
+        """
+        return np.ones(len(self.bearing_elements))
+
+    def _speed_varying_base(self, speed, varying, sparse):
+        """Damping and stiffness matrices without the varying bearings.
+
+        Parameters
+        ----------
+        speed : float
+            Rotor speed.
+        varying : list
+            Boolean for each bearing element, True if its blocks are left out.
+        sparse : bool
+            If True, sparse matrices are returned.
+
+        Returns
+        -------
+        C, K : np.ndarray or scipy.sparse.csr_matrix
+            Damping and stiffness matrices.
+        """
+        base = []
+        for matrix, base_matrix in (("C", self._C0), ("K", self._K0)):
+            blocks = [getattr(brg, matrix)(speed) for brg in self.bearing_elements]
+            blocks = [
+                0 * block if var else block for block, var in zip(blocks, varying)
+            ]
+            base.append(self._assemble_bearings(base_matrix, blocks, sparse))
+
+        return tuple(base)
+
+    def _speed_varying_bearings(self, speed, reduce_model, size, sparse, chunk=1000):
+        """Damping and stiffness matrices along a speed array.
+
+        The matrices are split into base matrices, with all the elements but
+        the bearings with frequency dependent coefficients, which are
+        assembled (see `_speed_varying_base`) and reduced only once, and the
+        blocks of those bearings, evaluated at the speed times the ratios of
+        `_bearing_frequency_ratios`.
+        The bearing coefficients are evaluated in chunks of `chunk` speeds at
+        once and, with a model reduction, the blocks are projected with the
+        rows of the reduction basis at the bearing dofs. Hence, the cost of
+        each step depends on the number of bearing dofs and on the size of the
+        reduced model, instead of assembling and reducing the full matrices.
+
+        Parameters
+        ----------
+        speed : np.ndarray
+            Rotor speed at each time step.
+        reduce_model : list
+            Functions to reduce a matrix, reduce a vector and revert a vector,
+            as in `integrate_system`.
+        size : int
+            Size of the (reduced) system matrices.
+        sparse : bool
+            If True and there is no model reduction, sparse matrices are
+            returned.
+        chunk : int, optional
+            Number of speeds at which the coefficients are evaluated at once.
+            Default is 1000.
+
+        Returns
+        -------
+        bearing_matrices : callable
+            Function of the time step that returns the matrices (C, K). Dense
+            matrices of a model without reduction are updated in place, so they
+            are only valid until the next call.
+        """
+        varying = [brg.frequency is not None for brg in self.bearing_elements]
+        bearings = [brg for brg, var in zip(self.bearing_elements, varying) if var]
+        ratios = self._bearing_frequency_ratios()[varying]
+
+        base = [
+            reduce_model[0](matrix)
+            for matrix in self._speed_varying_base(speed[0], varying, sparse)
+        ]
+
+        # blocks of all the varying bearings are scattered in a small matrix
+        # with the dofs they share
+        brg_dofs = [list(brg.dof_global_index.values()) for brg in bearings]
+        dofs, local_dofs = np.unique(np.concatenate(brg_dofs), return_inverse=True)
+        local_dofs = np.split(local_dofs, np.cumsum([len(d) for d in brg_dofs])[:-1])
+        pattern = ScatterPattern(local_dofs, len(dofs))
+
+        reduced = size != self.ndof
+        if reduced:
+            basis = reduce_model[2](np.eye(size))[dofs]
+        else:
+            rows = np.repeat(dofs, len(dofs))
+            cols = np.tile(dofs, len(dofs))
+
+            # dense matrices are updated in place at the bearing dofs
+            block_index = np.ix_(dofs, dofs)
+            work = [None if sps.issparse(A) else A.copy() for A in base]
+            base_blocks = [None if sps.issparse(A) else A[block_index] for A in base]
+
+        cache = {}
+
+        def bearing_matrices(step):
+            start = step - step % chunk
+            if cache.get("start") != start:
+                frequency = speed[start : start + chunk]
+                cache["start"] = start
+                cache["blocks"] = [
+                    pattern.to_dense_stack(
+                        [
+                            brg.matrices(coefficient, frequency * ratio)
+                            for brg, ratio in zip(bearings, ratios)
+                        ]
+                    )
+                    for coefficient in ("c", "k")
+                ]
+
+            matrices = []
+            for i, (base_matrix, blocks) in enumerate(zip(base, cache["blocks"])):
+                block = blocks[step - start]
+                if reduced:
+                    matrices.append(base_matrix + basis.T @ block @ basis)
+                elif sps.issparse(base_matrix):
+                    matrices.append(
+                        base_matrix
+                        + sps.csr_matrix(
+                            (block.ravel(), (rows, cols)), shape=base_matrix.shape
+                        )
+                    )
+                else:
+                    work[i][block_index] = base_blocks[i] + block
+                    matrices.append(work[i])
+
+            return tuple(matrices)
+
+        return bearing_matrices
+
     def _init_ambs_for_integrate(self, t, xout, **kwargs):
         """
         Prepare the magnetic bearing components and force function used during
@@ -4006,7 +5570,12 @@ class Rotor(object):
 
     @check_units
     def run_campbell(
-        self, speed_range, frequencies=6, frequency_type="wd", torsional_analysis=False
+        self,
+        speed_range,
+        frequencies=6,
+        frequency_type="wd",
+        torsional_analysis=False,
+        continuation=False,
     ):
         """Calculate the Campbell diagram.
 
@@ -4032,6 +5601,11 @@ class Rotor(object):
             respective modes in the Campbell diagram. In this case, a system
             with only torsional degrees of freedom is considered, thus
             disregarding coupled modes (lateral + torsional). Default is False.
+        continuation : bool, optional
+            If True, the eigenvalue problem at each speed is warm started from
+            the eigenvectors found at the previous speed, which reduces the
+            number of iterations needed by the eigensolver along the sweep.
+            Default is False.
 
         Returns
         -------
@@ -4051,6 +5625,11 @@ class Rotor(object):
         Diagram with damped natural frequencies
         >>> camp = rotor1.run_campbell(speed)
 
+        Speed continuation along the sweep
+        >>> camp_cont = rotor1.run_campbell(speed, continuation=True)
+        >>> np.allclose(camp_cont.wd, camp.wd)
+        True
+
         Plotting Campbell Diagram
         >>> fig = camp.plot()
         """
@@ -4061,34 +5640,32 @@ class Rotor(object):
 
         results = np.zeros([len(speed_range), frequencies, 4])
 
-        # MAC criterion to track modes
-        def MAC(u, v):
-            H = lambda a: a.T.conj()
-            return np.absolute((H(u) @ v) ** 2 / ((H(u) @ u) * (H(v) @ v)))
-
         num_modes = 2 * (frequencies + 2)  # ensure to get the right modes
         evec_size = int(num_modes / 2)
         mode_order = np.arange(evec_size)
         threshold = 0.9
         evec_u = []
+        v0 = None
 
         modal_results = {}
         for i, w in enumerate(speed_range):
-            modal = self.run_modal(speed=w, num_modes=num_modes)
+            if continuation:
+                evalues, evectors, v0 = self._eigen_continuation(
+                    w, num_modes=num_modes, v0=v0
+                )
+                modal = self._modal_results(w, evalues, evectors, num_modes)
+            else:
+                modal = self.run_modal(speed=w, num_modes=num_modes)
             modal_results[w] = modal
 
             evec_v = modal.evectors[:, :evec_size]
 
             if i > 0:
-                macs = np.zeros((evec_size, evec_size))
-                for u in enumerate(evec_u.T):
-                    for v in enumerate(evec_v.T):
-                        macs[u[0], v[0]] = MAC(u[1], v[1])
-
-                mask = macs > threshold
-                found_order = np.where(
-                    mask.any(axis=1), np.argmax(macs * mask, axis=1), -1
-                )
+                # MAC criterion to track modes, each mode being matched to a
+                # different mode of the previous speed
+                macs = mac_matrix(evec_u, evec_v)
+                rows, found_order = linear_sum_assignment(macs, maximize=True)
+                found_order[macs[rows, found_order] <= threshold] = -1
                 modes_not_found = np.where(found_order == -1)[0]
 
                 if len(modes_not_found):
@@ -4102,7 +5679,6 @@ class Rotor(object):
                     modal.wn = modal.wn[found_order]
                     modal.log_dec = modal.log_dec[found_order]
                     modal.damping_ratio = modal.damping_ratio[found_order]
-                    modal.shapes = list(np.array(modal.shapes)[found_order])
 
             evec_u = modal.evectors[:, :evec_size]
 
@@ -4124,6 +5700,7 @@ class Rotor(object):
                 speed_range=speed_range,
                 frequencies=int(frequencies / 6),
                 frequency_type=frequency_type,
+                continuation=continuation,
             )
 
         results = CampbellResults(
@@ -4484,7 +6061,7 @@ class Rotor(object):
             results = AmbTimeResponseResults(self, t_, yout, xout)
 
         else:
-            results = TimeResponseResults(self, t, yout, xout)
+            results = TimeResponseResults(self, t_, yout, xout)
 
         return results
 
@@ -4496,6 +6073,7 @@ class Rotor(object):
         harmonic_forces,
         gravity=False,
         n_harmonics=1,
+        crack=None,
     ):
         """
         Compute the steady-state response of the rotor using the Harmonic Balance
@@ -4532,6 +6110,9 @@ class Rotor(object):
         n_harmonics : int, optional
             Number of harmonics to consider in the Harmonic Balance solution.
             Default is 1 (only fundamental harmonic is considered).
+        crack : ross.Crack, optional
+            Crack with the Gasch or Mayes model on a shaft element of this rotor.
+            Default is None.
 
         Returns
         -------
@@ -4574,6 +6155,7 @@ class Rotor(object):
             t=t,
             forces=harmonic_forces,
             gravity=gravity,
+            crack=crack,
         )
 
         return results
@@ -4849,6 +6431,7 @@ class Rotor(object):
         t,
         crack_model="Mayes",
         cross_divisions=None,
+        exact_breathing=False,
         **kwargs,
     ):
         """Run analysis for the rotor system with crack given an unbalance force.
@@ -4881,6 +6464,10 @@ class Rotor(object):
         cross_divisions: float, optional
             Number of square divisions into which the cross-section of the cracked element
             will be divided in the analysis conducted for the Flex Breathing model.
+        exact_breathing : bool, optional
+            If True, the open and closed parts of the crack of the Flex Breathing
+            model are computed at each time step instead of interpolated from a table.
+            Default is False.
         **kwargs : optional
             Additional keyword arguments can be passed to define the parameters
             of the Newmark method if it is used (e.g. gamma, beta, tol, ...).
@@ -4924,7 +6511,9 @@ class Rotor(object):
         ...     yaxis_type="log",
         ... )
         """
-        fault = Crack(self, n, depth_ratio, crack_model, cross_divisions)
+        fault = Crack(
+            self, n, depth_ratio, crack_model, cross_divisions, exact_breathing
+        )
 
         results = fault.run(
             node, unbalance_magnitude, unbalance_phase, speed, t, **kwargs
@@ -5187,12 +6776,23 @@ class Rotor(object):
             aux_brg.append(BearingElement(n=elm.n, n_link=n_link, kxx=1e20, cxx=0))
             aux_brg_1.append(BearingElement(n=elm.n, n_link=n_link, kxx=0, cxx=0))
 
-        aux_rotor = Rotor(self.shaft_elements, self.disk_elements, aux_brg)
-        aux_rotor_1 = Rotor(self.shaft_elements, self.disk_elements, aux_brg_1)
+        sparse = self.sparse_assembly
+        aux_rotor = Rotor(
+            self.shaft_elements,
+            self.disk_elements,
+            aux_brg,
+            sparse_assembly=sparse,
+        )
+        aux_rotor_1 = Rotor(
+            self.shaft_elements,
+            self.disk_elements,
+            aux_brg_1,
+            sparse_assembly=sparse,
+        )
 
-        aux_M = aux_rotor.M(0)
-        aux_K = aux_rotor.K(0)
-        aux1_K = aux_rotor_1.K(0)
+        aux_M = aux_rotor.M(0, sparse=sparse)
+        aux_K = aux_rotor.K(0, sparse=sparse)
+        aux1_K = aux_rotor_1.K(0, sparse=sparse)
 
         # convert to 4 dof
         num_dof = 4
@@ -5205,7 +6805,10 @@ class Rotor(object):
         weight = self.gravitational_force(g=g, M=aux_M, num_dof=num_dof)
 
         # calculates u, for [K]*(u) = (F)
-        displacement = (la.solve(aux_K, weight)).flatten()
+        if sparse:
+            displacement = las.spsolve(aux_K.tocsc(), weight).flatten()
+        else:
+            displacement = (la.solve(aux_K, weight)).flatten()
         displacement_y = displacement[1::num_dof]
 
         # calculate forces
@@ -5632,6 +7235,8 @@ class Rotor(object):
         unbalance_phase,
         frequency=None,
         modes=None,
+        n_jobs=1,
+        chunk_size=64,
     ):
         """
         Perform clearance analysis using unbalance response.
@@ -5669,6 +7274,12 @@ class Rotor(object):
             Modes passed to :meth:`run_unbalance_response` (and then to
             :meth:`run_forced_response`). Use this to control which modes
             enter the frequency response calculation.
+        n_jobs : int, optional
+            Number of threads used to solve chunks of frequencies concurrently.
+            If -1, all the processors are used. Default is 1.
+        chunk_size : int, optional
+            Number of frequencies solved in each batched call. Larger chunks
+            use more memory. Default is 64.
 
         Returns
         -------
@@ -5726,6 +7337,8 @@ class Rotor(object):
             unbalance_phase,
             frequency,
             modes=modes,
+            n_jobs=n_jobs,
+            chunk_size=chunk_size,
         )
 
         bearing_probes = [
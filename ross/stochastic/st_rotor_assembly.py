@@ -19,6 +19,7 @@ from ross.stochastic.st_results import (
 )
 from ross.stochastic.st_shaft_element import ST_ShaftElement
 from ross.units import check_units
+from ross.utils import lsim_ensemble, newmark_ensemble
 
 __all__ = ["ST_Rotor", "st_rotor_example"]
 
@@ -548,9 +549,12 @@ class ST_Rotor(object):
         # Monte Carlo - results storage
         for i, rotor in enumerate(iter(self)):
             results = rotor.run_freq_response(speed_range, modes)
-            freq_resp[:, i] = results.freq_resp[inp, out, :]
-            velc_resp[:, i] = results.velc_resp[inp, out, :]
-            accl_resp[:, i] = results.accl_resp[inp, out, :]
+            freq_resp[:, i] = results.freq_resp[out, inp, :]
+
+        # velocity and acceleration of the selected pair only
+        speed_range = np.asarray(speed_range)
+        velc_resp[:] = 1j * speed_range[:, np.newaxis] * freq_resp
+        accl_resp[:] = -(speed_range[:, np.newaxis] ** 2) * freq_resp
 
         results = ST_FrequencyResponseResults(
             speed_range, freq_resp, velc_resp, accl_resp
@@ -558,13 +562,18 @@ class ST_Rotor(object):
 
         return results
 
-    def run_time_response(self, speed, force, time_range, ic=None):
+    def run_time_response(
+        self, speed, force, time_range, ic=None, method="default", **kwargs
+    ):
         """Stochastic time response for multiples rotor systems.
 
         This function will take a rotor object and plot its time response
         given a force and a time. This method displays the amplitude vs time or the
         rotor orbits.
         The force and ic parameters can be passed as random variables.
+        All rotor systems are integrated together as an ensemble, with batched
+        matrix operations at each time step (see `ross.utils.lsim_ensemble`
+        and `ross.utils.newmark_ensemble`).
 
         Parameters
         ----------
@@ -579,9 +588,15 @@ class ST_Rotor(object):
         time_range : 1-dimensional array
             Time array.
         ic : 1-dimensional array, 2-dimensional array, optional
-            The initial conditions on the state vector (zero by default).
+            The initial conditions on the state vector, the displacements
+            followed by the velocities (zero by default).
             Inputing a 2-dimensional array, the method considers the
             initial condition as a random variable.
+        method : str, optional
+            The systems are simulated in the state space by default. The
+            Newmark method can be chosen by setting `method='newmark'`.
+        **kwargs : optional
+            Parameters of the Newmark method (gamma and beta).
 
         Returns
         -------
@@ -629,26 +644,30 @@ class ST_Rotor(object):
         link_nodes = self.link_nodes
         nodes_pos = self.nodes_pos
 
-        xout = np.zeros((RV_size, t_size, 2 * ndof))
-        yout = np.zeros((RV_size, t_size, ndof))
-
         # force is not a random variable
         if len(force.shape) == 2:
-            # Monte Carlo - results storage
-            for i, rotor in enumerate(iter(self)):
-                t_, y, x = rotor.time_response(speed, force, time_range, ic)
-                xout[i] = x
-                yout[i] = y
+            force = np.broadcast_to(force, (RV_size, t_size, ndof))
 
-        # force is a random variable
-        if len(force.shape) == 3:
-            # Monte Carlo - results storage
-            i = 0
-            for rotor, F in zip(iter(self), force):
-                t_, y, x = rotor.time_response(speed, F, time_range, ic)
-                xout[i] = x
-                yout[i] = y
-                i += 1
+        rotors = list(iter(self))
+
+        if method.lower() == "newmark":
+            M = np.array([rotor.M(speed) for rotor in rotors])
+            C = np.array([rotor.C(speed) + rotor.G() * speed for rotor in rotors])
+            K = np.array([rotor.K(speed) for rotor in rotors])
+
+            yout, ydout = newmark_ensemble(
+                M, C, K, force, time_range, return_velocity=True, X0=ic, **kwargs
+            )
+            xout = np.concatenate((yout, ydout), axis=2)
+
+        else:
+            lti = [rotor._lti(speed) for rotor in rotors]
+            t_, yout, xout = lsim_ensemble(
+                *(np.array([getattr(sys, A) for sys in lti]) for A in "ABCD"),
+                force,
+                time_range,
+                X0=ic,
+            )
 
         results = ST_TimeResponseResults(
             time_range,
@@ -154,6 +154,48 @@ def test_bearing1_matrices(bearing1):
     assert_allclose(bearing1.M(314.2), M, rtol=1e-5)
 
 
+def test_bearing1_stacked_matrices(bearing1):
+    frequency = np.array([314.2, 600.0, 1151.9])
+    K = bearing1.matrices("k", frequency)
+    C = bearing1.matrices("c", frequency)
+    M = bearing1.matrices("m", frequency)
+
+    assert K.shape == (3, 3, 3)
+    for i, f in enumerate(frequency):
+        assert_allclose(K[i], bearing1.K(f))
+        assert_allclose(C[i], bearing1.C(f))
+        assert_allclose(M[i], bearing1.M(f))
+
+    b0 = BearingElement(n=0, n_link=3, kxx=1, cxx=1)
+    assert_allclose(b0.matrices("k", frequency)[1], b0.K(600.0))
+
+
+def test_bearing1_coefficient_table(bearing1):
+    table = bearing1.coefficient_table
+    frequency = np.linspace(0, 2000, 11)
+    values = table(frequency)
+
+    assert values.shape == (len(frequency), 15)
+    assert_allclose(values[:, table.index["kxx"]], bearing1.kxx_interpolated(frequency))
+    assert_allclose(values[:, table.index["cyy"]], bearing1.cyy_interpolated(frequency))
+    assert np.shape(bearing1.kxx_interpolated(314.2)) == ()
+
+    unpickled = pickle.loads(pickle.dumps(bearing1))
+    assert_allclose(unpickled.K(600.0), bearing1.K(600.0))
+    assert_allclose(unpickled.coefficient_table(frequency), values)
+
+
+def test_bearing1_coefficient_derivative(bearing1):
+    frequency = np.linspace(100, 1900, 7)
+    h = 1e-3
+    dK = bearing1.matrices("k", frequency, nu=1)
+    dK_fd = (
+        bearing1.matrices("k", frequency + h) - bearing1.matrices("k", frequency - h)
+    ) / (2 * h)
+
+    assert_allclose(dK, dK_fd, rtol=1e-5, atol=1e-3)
+
+
 def test_bearing_error_speed_not_given():
     speed = np.linspace(0, 10000, 5)
     kx = 1e8 * speed
@@ -99,6 +99,101 @@ def test_crack_mayes(rotor):
     assert_allclose(crack.Kc, Kc, rtol=1e-6, atol=1e-7)
 
 
+def test_crack_stiffness_vectorized(rotor):
+    ap = np.linspace(0, 4 * np.pi, 50)
+
+    for model in ["Mayes", "Gasch"]:
+        crack = Crack(rotor, n=18, depth_ratio=0.2, crack_model=model)
+        K = crack._crack_model(ap)
+
+        assert K.shape == (len(ap), 12, 12)
+        assert_allclose(K[7], crack._crack_model(ap[7]))
+
+        Ko, Kn = crack.stiffness_fourier_coefficients(40)
+        K_fourier = Ko / 2 + np.sum(
+            np.real(Kn * np.exp(1j * np.arange(1, 41) * ap[:, None, None, None])),
+            axis=-1,
+        )
+        assert_allclose(
+            K_fourier, K - crack.K_elem, atol=1e-9 * np.abs(crack.K_elem).max()
+        )
+
+
+def test_crack_harmonic_balance(rotor):
+    crack = Crack(rotor, n=18, depth_ratio=0.2, crack_model="Mayes")
+
+    node = rotor.disk_elements[0].n
+    speed = 125.66370614359172
+    dt = 5e-4
+    t = np.arange(0, 8, dt)
+
+    hb = rotor.run_harmonic_balance_response(
+        speed=speed,
+        t=t[:100],
+        harmonic_forces=[
+            {
+                "node": node,
+                "magnitudes": [5e-4 * speed**2],
+                "phases": [-np.pi / 2],
+                "harmonics": [1],
+            }
+        ],
+        gravity=True,
+        n_harmonics=4,
+        crack=crack,
+    )
+    results = crack.run([node], [5e-4], [-np.pi / 2], speed, t)
+
+    # 1x and 2x amplitudes at steady state, over the last 80 revolutions
+    dofs = [6 * node, 6 * node + 1, 6 * 18, 6 * 18 + 1]
+    n = len(t) // 2
+    spectrum = 2 * np.abs(np.fft.rfft(results.yout[-n:, dofs], axis=0)) / n
+    frequency = np.fft.rfftfreq(n, dt)
+
+    for harmonic in (1, 2):
+        i = np.argmin(np.abs(frequency - harmonic * speed / (2 * np.pi)))
+        amplitude = np.abs(hb.dQ[dofs, harmonic - 1])
+        assert_allclose(spectrum[i], amplitude, rtol=5e-2, atol=0.1 * amplitude.max())
+
+
+def test_crack_flex_breathing_table(rotor):
+    crack = Crack(
+        rotor, n=18, depth_ratio=0.2, crack_model="Flex Breathing", cross_divisions=10
+    )
+    n_points = crack.n_breathing_points
+
+    exact = Crack(
+        rotor,
+        n=18,
+        depth_ratio=0.2,
+        crack_model="Flex Breathing",
+        cross_divisions=10,
+        exact_breathing=True,
+    )
+
+    disp_resp = np.zeros(12)
+    disp_resp[[9, 10]] = 1e-4
+
+    for fault in (crack, exact):
+        fault.disp_resp = disp_resp
+
+    assert crack._get_breathing_table().shape == (2, 4, n_points)
+
+    for ap in 2 * np.pi * np.arange(0, n_points, n_points // 8) / n_points:
+        K_exact = exact.flex_breathing(ap)
+        assert_allclose(
+            crack.flex_breathing(ap),
+            K_exact,
+            rtol=1e-6,
+            atol=1e-9 * np.abs(K_exact).max(),
+        )
+
+    # between the table points, the error is bounded by the table spacing
+    K = crack.flex_breathing(0.1)
+    K_exact = exact.flex_breathing(0.1)
+    assert_allclose(K, K_exact, rtol=0, atol=1e-2 * np.abs(K_exact).max())
+
+
 @pytest.fixture
 def run_crack_mayes(rotor):
     n1 = rotor.disk_elements[0].n
@@ -154,3 +154,51 @@ def test_mesh_params(mesh):
         rtol=1e-6,
         atol=1e-5,
     )
+
+
+def test_tvms_stiffness_quadrature(gear_tvms):
+    from scipy.integrate import quad
+
+    angles = np.linspace(
+        gear_tvms.pr_angles_dict["start_point"], gear_tvms.pr_angles_dict["addendum"], 7
+    )
+    k = gear_tvms._compute_stiffness(angles)
+
+    assert k.shape == angles.shape
+    assert_allclose(k[3], gear_tvms._compute_stiffness(angles[3]), rtol=1e-12)
+
+    # axial compliance integrated with adaptive quadrature
+    beta = gear_tvms._to_tau(angles[3])
+    integrand = lambda curve, diff: (
+        lambda angle: (
+            np.sin(beta) ** 2 / (gear_tvms.material.E * curve(angle)[2]) * diff(angle)
+        )
+    )
+    inv_ka = (
+        quad(
+            integrand(gear_tvms._compute_transition_curve, gear_tvms._diff_gamma),
+            np.pi / 2,
+            gear_tvms.pr_angle,
+        )[0]
+        + quad(
+            integrand(gear_tvms._compute_involute_curve, gear_tvms._diff_tau),
+            gear_tvms.tau_c,
+            beta,
+        )[0]
+    )
+    assert_allclose(gear_tvms._inv_ka(beta), inv_ka, rtol=1e-8)
+
+
+def test_mesh_stiffness_table_cache(gear_tvms, tmp_path, monkeypatch):
+    monkeypatch.setenv("ROSS_CACHE_DIR", str(tmp_path))
+
+    mesh = Mesh(gear_tvms, deepcopy(gear_tvms))
+    theta, cr, table = mesh.generate_stiffness_table("equivalent", n_points=20)
+
+    assert len(list((tmp_path / "mesh_stiffness").glob("*.npy"))) == 1
+    assert_allclose(
+        table[7, 11], mesh.get_variable_equivalent_stiffness(theta[7], cr[11])
+    )
+
+    _, _, cached_table = mesh.generate_stiffness_table("equivalent", n_points=20)
+    assert_allclose(cached_table, table)
@@ -4,6 +4,10 @@ from numpy.testing import assert_allclose
 
 import ross as rs
 from ross import Q_, Probe, MisalignmentFlex, MisalignmentRigid
+from ross.faults.misalignment import (
+    _misalignment_rigid_force,
+    _misalignment_rigid_jacobian,
+)
 
 from numpy.testing import assert_allclose
 
@@ -236,6 +240,31 @@ def test_mis_rigid(rotor):
     assert int(misalignment.kt2) == 70133
 
 
+def test_mis_rigid_jacobian(rotor):
+    misalignment = MisalignmentRigid(rotor, n=0, mis_distance=2e-4)
+
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=12) * 1e-4
+    ydot = np.zeros(12)
+    params = misalignment._kernel_params()
+    ang_pos = np.array([1.2])
+
+    dF_dy, dF_dydot = _misalignment_rigid_jacobian(0, y, ydot, params, ang_pos)
+
+    # central differences, with phi of the previous evaluation kept constant
+    h = 1e-8
+    dF_dy_fd = np.zeros((12, 12))
+    for i in range(12):
+        dy = np.zeros(12)
+        dy[i] = h
+        F_plus = _misalignment_rigid_force(0, y + dy, ydot, params.copy(), ang_pos)
+        F_minus = _misalignment_rigid_force(0, y - dy, ydot, params.copy(), ang_pos)
+        dF_dy_fd[:, i] = (F_plus - F_minus) / (2 * h)
+
+    assert not dF_dydot.any()
+    assert_allclose(dF_dy, dF_dy_fd, atol=1e-6 * np.abs(dF_dy).max())
+
+
 def test_mis_rigid_resp(mis_rigid):
     probe1 = Probe(12, Q_(45, "deg"))
     probe2 = Probe(20, Q_(90, "deg"))
@@ -6,9 +6,30 @@ from numpy.testing import assert_allclose
 import ross as rs
 
 
-@pytest.fixture
-def multi_rotor():
-    """A spur geared two-shaft rotor system."""
+def build_multi_rotor(bearing_frequency=None, **kwargs):
+    """A spur geared two-shaft rotor system.
+
+    Parameters
+    ----------
+    bearing_frequency : array, optional
+        If given, the bearing coefficients vary linearly over these
+        frequencies. Default is None, for constant coefficients.
+    **kwargs
+        Additional arguments passed to MultiRotor.
+    """
+
+    def bearing(n, kxx, kyy, cxx):
+        if bearing_frequency is None:
+            return rs.BearingElement(n=n, kxx=kxx, kyy=kyy, cxx=cxx)
+
+        scale = 1 + np.asarray(bearing_frequency) / max(bearing_frequency)
+        return rs.BearingElement(
+            n=n,
+            kxx=kxx * scale,
+            kyy=kyy * scale,
+            cxx=cxx * scale,
+            frequency=bearing_frequency,
+        )
 
     material = rs.Material(name="mat_steel", rho=7800, E=207e9, G_s=79.5e9)
 
@@ -62,8 +83,8 @@ def multi_rotor():
         material=material,
     )
 
-    bearing1 = rs.BearingElement(n=0, kxx=183.9e6, kyy=200.4e6, cxx=3e3)
-    bearing2 = rs.BearingElement(n=3, kxx=183.9e6, kyy=200.4e6, cxx=3e3)
+    bearing1 = bearing(n=0, kxx=183.9e6, kyy=200.4e6, cxx=3e3)
+    bearing2 = bearing(n=3, kxx=183.9e6, kyy=200.4e6, cxx=3e3)
 
     rotor1 = rs.Rotor(
         shaft1,
@@ -107,8 +128,8 @@ def multi_rotor():
 
     turbine = rs.DiskElement(n=2, m=7.45, Id=0.0745, Ip=0.149)
 
-    bearing3 = rs.BearingElement(n=1, kxx=10.1e6, kyy=41.6e6, cxx=3e3)
-    bearing4 = rs.BearingElement(n=3, kxx=10.1e6, kyy=41.6e6, cxx=3e3)
+    bearing3 = bearing(n=1, kxx=10.1e6, kyy=41.6e6, cxx=3e3)
+    bearing4 = bearing(n=3, kxx=10.1e6, kyy=41.6e6, cxx=3e3)
 
     rotor2 = rs.Rotor(
         shaft2,
@@ -122,9 +143,15 @@ def multi_rotor():
         coupled_nodes=(4, 0),
         orientation_angle=0.0,
         position="below",
+        **kwargs,
     )
 
 
+@pytest.fixture
+def multi_rotor():
+    return build_multi_rotor()
+
+
 def test_mesh(multi_rotor):
     assert_allclose(
         multi_rotor.mesh.contact_ratio, 1.6377334309511222, rtol=1e-6, atol=1e-5
@@ -410,3 +437,140 @@ def test_mesh_with_backlash(multi_rotor_with_backlash):
     assert_allclose(np.mean(mesh_results["center_distance"]), d, rtol=1e-2)
     assert_allclose(np.mean(mesh_results["pressure_angle"]), alpha, rtol=1e-2)
     assert_allclose(np.mean(mesh_results["contact_ratio"]), cr, rtol=1e-2)
+
+
+def test_backlash_event_refinement(multi_rotor_with_backlash):
+    speed = rs.Q_(1000, "RPM").to("rad/s").m
+    t = np.linspace(0, 0.02, 401)
+    dt = t[1] - t[0]
+
+    num_dof = multi_rotor_with_backlash.number_dof
+    node = multi_rotor_with_backlash.disk_elements[0].n
+    F = np.zeros((len(t), multi_rotor_with_backlash.ndof))
+    F[:, node * num_dof + 5] = 300 * np.sin(2 * np.pi * 200 * t)
+
+    identity = lambda array: array
+    rotor_system, forces = multi_rotor_with_backlash._rotor_system_for_integrate(
+        multi_rotor_with_backlash,
+        speed,
+        t,
+        [identity] * 3,
+        lambda step, **state: F[step],
+    )
+
+    event = forces.event
+    event_times = []
+
+    def recorded_event(step, **state):
+        event_times.append(state["time"])
+        return event(step, **state)
+
+    forces.event = recorded_event
+
+    backlash = multi_rotor_with_backlash.mesh.backlash
+    compute_force = backlash.compute_force
+    force_states = []
+
+    def recorded_force(step, disp_resp, velc_resp, time, angular_pos, speed):
+        force_states.append((time, angular_pos))
+        return compute_force(step, disp_resp, velc_resp, time, angular_pos, speed)
+
+    backlash.compute_force = recorded_force
+    yout = rs.utils.newmark(
+        rotor_system, forces, t, multi_rotor_with_backlash.ndof, newmark_type="robust"
+    )
+    del backlash.compute_force
+
+    # the contact force is evaluated at the angular position of the sub-steps
+    force_times, angular_pos = np.array(force_states).T
+    assert not np.isin(np.round(force_times / dt, 6) % 1, 0).all()
+    assert_allclose(angular_pos, speed * force_times)
+
+    velc = np.zeros(multi_rotor_with_backlash.ndof)
+    gap = np.array(
+        [event(i, disp_resp=y, velc_resp=velc, time=t[i]) for i, y in enumerate(yout)]
+    )
+    changes = np.flatnonzero(np.sign(gap[1:]) != np.sign(gap[:-1]))
+    assert len(changes) > 0
+
+    # the teeth separate and re-engage within sub-steps shorter than
+    # event_tol times the time step
+    event_times = np.unique(np.round(np.array(event_times) / dt, 6))
+    for step in changes:
+        sub_steps = event_times[(event_times >= step) & (event_times <= step + 1)]
+        assert np.diff(sub_steps).min() <= 1e-2
+
+
+@pytest.mark.parametrize("bearing_frequency", [None, np.linspace(0, 1000, 11)])
+def test_time_varying_mesh_stiffness(bearing_frequency):
+    multi_rotor = build_multi_rotor(
+        bearing_frequency,
+        update_mesh_stiffness=True,
+        square_varying_stiffness={"enable": True, "amplitude_ratio": 0.275},
+    )
+
+    speed = 100.0
+    t = np.linspace(0, 0.05, 501)
+    F = np.zeros((len(t), multi_rotor.ndof))
+    F[:, multi_rotor.number_dof * 4 + 1] = 1e3 * np.sin(speed * t)
+
+    identity = lambda array: array
+    rotor_system, forces = multi_rotor._rotor_system_for_integrate(
+        multi_rotor, speed, t, [identity] * 3, lambda step, **state: F[step]
+    )
+    assert hasattr(rotor_system, "low_rank_stiffness")
+
+    M, C, K, RHS = rotor_system(200)
+    assert_allclose(K, multi_rotor.K(speed), rtol=1e-10)
+
+    # the low rank update of the factorization gives the same response
+    # as factorizing the Jacobian at every step
+    yout = rs.utils.newmark(rotor_system, forces, t, multi_rotor.ndof)
+    yout_ref = rs.utils.newmark(
+        lambda step, **state: rotor_system(step, **state),
+        forces,
+        t,
+        multi_rotor.ndof,
+    )
+    assert_allclose(yout, yout_ref, rtol=1e-6, atol=1e-14)
+
+
+@pytest.mark.parametrize("sparse_assembly", [False, True])
+def test_time_varying_mesh_stiffness_speed_array(sparse_assembly):
+    multi_rotor = build_multi_rotor(
+        np.linspace(0, 1000, 11),
+        update_mesh_stiffness=True,
+        sparse_assembly=sparse_assembly,
+    )
+
+    t = np.linspace(0, 0.05, 501)
+    speed = np.linspace(50, 150, len(t))
+    F = np.zeros((len(t), multi_rotor.ndof))
+
+    identity = lambda array: array
+    rotor_system, forces = multi_rotor._rotor_system_for_integrate(
+        multi_rotor, speed, t, [identity] * 3, lambda step, **state: F[step]
+    )
+    assert not hasattr(rotor_system, "low_rank_stiffness")
+
+    # driven bearings are evaluated at the speed of the driven rotor
+    G = multi_rotor.G()
+    Ksdt = multi_rotor.Ksdt()
+    accel = np.gradient(speed, t)
+    for step in (0, 250, 500):
+        M, C, K, RHS = rotor_system(step)
+        if sparse_assembly:
+            C, K = C.toarray(), K.toarray()
+
+        assert_allclose(
+            C,
+            multi_rotor.C(speed[step]) + G * speed[step],
+            rtol=1e-10,
+            atol=1e-8,
+        )
+        assert_allclose(
+            K,
+            multi_rotor.K(speed[step]) + Ksdt * accel[step],
+            rtol=1e-10,
+            atol=1e-4,
+        )
@@ -222,20 +222,20 @@ def thrust_pad_results():
 def _expected_frf_magnitude(freq_response, inp, out, amplitude_units="m/N"):
     dummy_var = Q_(1, amplitude_units)
     if dummy_var.check("[length]/[force]"):
-        magnitude = np.abs(freq_response.freq_resp[inp, out, :])
+        magnitude = np.abs(freq_response.freq_resp[out, inp, :])
         magnitude = Q_(magnitude, "m/N").to(amplitude_units).m
     elif dummy_var.check("[speed]/[force]"):
-        magnitude = np.abs(freq_response.velc_resp[inp, out, :])
+        magnitude = np.abs(freq_response.velc_resp[out, inp, :])
         magnitude = Q_(magnitude, "m/s/N").to(amplitude_units).m
     else:
-        magnitude = np.abs(freq_response.accl_resp[inp, out, :])
+        magnitude = np.abs(freq_response.accl_resp[out, inp, :])
         magnitude = Q_(magnitude, "m/s**2/N").to(amplitude_units).m
     frequency = Q_(freq_response.speed_range, "rad/s").to("rad/s").m
     return frequency, magnitude
 
 
 def _expected_frf_phase(freq_response, inp, out, phase_units="rad"):
-    phase = np.angle(freq_response.freq_resp[inp, out, :])
+    phase = np.angle(freq_response.freq_resp[out, inp, :])
     phase = Q_(phase, "rad").to(phase_units).m
     if phase_units in ["rad", "radian", "radians"]:
         phase = np.array([value + 2 * np.pi if value < 0 else value for value in phase])
@@ -267,6 +267,55 @@ def test_orbit_calculate_amplitude():
     assert_allclose(orb.calculate_amplitude("major")[0], 2.8284271247461903)
 
 
+def test_modal_results_lazy_shapes(rotor1):
+    modal = rotor1.run_modal(speed=0, num_modes=14)
+    assert len(modal.shapes._cache) == 0
+
+    shape = modal.shapes[2]
+    assert modal.shapes[2] is shape
+    assert len(modal.shapes) == len(modal.wn)
+    assert len(modal.shapes[:3]) == 3
+
+    modal.shapes.maxsize = 2
+    [shape.mode_type for shape in modal.shapes]
+    assert len(modal.shapes._cache) == 2
+
+    # reassigning the eigenvectors discards the cached shapes
+    modal.evectors = modal.evectors[:, ::-1]
+    assert len(modal.shapes._cache) == 0
+
+
+def test_modal_results_vectorized_orbits(rotor1):
+    modal = rotor1.run_modal(speed=Q_(4000, "RPM"), num_modes=14)
+
+    whirl = modal.whirl_direction()
+    for mode, shape in enumerate(modal.shapes):
+        assert whirl[mode] == shape.whirl
+        if shape.orbits is None:
+            continue
+
+        orbits = shape.orbits
+        assert_allclose(modal.kappa_mode(mode), [orb.kappa for orb in orbits])
+        assert_allclose(
+            modal.kappa(1, mode)["Major axis"], orbits[1].major_axis, rtol=1e-10
+        )
+        assert_allclose(
+            modal.kappa(1, mode)["Minor axis"],
+            orbits[1].minor_axis,
+            rtol=1e-6,
+            atol=1e-12,
+        )
+
+    # the orbit axes are the sum and difference of the whirl components
+    data = modal._orbits_data()
+    assert_allclose(data["major_axis"], data["forward"] + data["backward"])
+
+    assert_allclose(
+        modal.whirl_to_cmap(["Forward", "Mixed", "Backward", "None"]),
+        [0.0, 0.5, 1.0, np.nan],
+    )
+
+
 def test_plot_orbit_lateral_mode(rotor1):
     modal = rotor1.run_modal(speed=Q_(4000, "RPM"), num_modes=14)
     lateral_mode = next(
@@ -625,6 +625,16 @@ def test_campbell(rotor4):
     assert_allclose(camp_calculated, camp_desired)
 
 
+def test_campbell_continuation(rotor4):
+    speed = np.linspace(0, 300, 7)
+    camp = rotor4.run_campbell(speed)
+    camp_continuation = rotor4.run_campbell(speed, continuation=True)
+
+    assert_allclose(camp_continuation.wd, camp.wd, rtol=1e-6)
+    assert_allclose(camp_continuation.log_dec, camp.log_dec, rtol=1e-4, atol=1e-8)
+    assert_allclose(camp_continuation.whirl_values, camp.whirl_values)
+
+
 @pytest.mark.skip(reason="Needs investigation. It fails depending on system.")
 def test_freq_response(rotor4):
     magdb_exp = np.array(
@@ -695,6 +705,113 @@ def test_freq_response(rotor4):
     assert_allclose(magdb[:4, :4, :4], magdb_exp_modes_4)
 
 
+def test_freq_response_modal_superposition(rotor3):
+    omega = np.linspace(10.0, 1000.0, 51)
+    freq_resp = rotor3.run_freq_response(speed_range=omega, free_free=True)
+
+    modal_resp = rotor3.run_freq_response(
+        speed_range=omega, modes=list(range(8)), free_free=True
+    )
+    assert_allclose(
+        modal_resp.freq_resp[13, 13],
+        freq_resp.freq_resp[13, 13],
+        atol=1e-3 * abs(freq_resp.freq_resp[13, 13]).max(),
+    )
+    assert_allclose(modal_resp.velc_resp, 1j * omega * modal_resp.freq_resp)
+
+    # the residual flexibility corrects the truncation below the modes used
+    low = omega < 80.0
+    modal_resp = rotor3.run_freq_response(
+        speed_range=omega, modes=[0, 1], free_free=True, residual_flexibility=True
+    )
+    truncated = rotor3.run_freq_response(
+        speed_range=omega, modes=[0, 1], free_free=True
+    )
+    error_truncated = abs(truncated.freq_resp - freq_resp.freq_resp)[13, 13, low]
+    error_residual = abs(modal_resp.freq_resp - freq_resp.freq_resp)[13, 13, low]
+    assert error_residual.max() < 0.1 * error_truncated.max()
+
+    speed_resp = rotor3.run_freq_response(speed_range=omega[:5])
+    speed_modal = rotor3.run_freq_response(
+        speed_range=omega[:5], modes=list(range(10)), residual_flexibility=True
+    )
+    assert_allclose(
+        speed_modal.freq_resp[13, 13],
+        speed_resp.freq_resp[13, 13],
+        rtol=1e-4,
+    )
+
+
+def test_freq_response_modal_overdamped(rotor3):
+    # heavily damped supports have overdamped modes with real eigenvalues
+    bearings = [BearingElement(n, kxx=1e6, kyy=0.8e6, cxx=1e4) for n in (0, 6)]
+    rotor = Rotor(rotor3.shaft_elements, rotor3.disk_elements, bearings)
+
+    evalues, _ = rotor._eigen(0, sparse=True)
+    assert (evalues.imag == 0).any()
+
+    omega = np.linspace(10.0, 1000.0, 51)
+    freq_resp = rotor.run_freq_response(speed_range=omega)
+    modal_resp = rotor.run_freq_response(
+        speed_range=omega, modes=list(range(8)), residual_flexibility=True
+    )
+    assert_allclose(
+        modal_resp.freq_resp[13, 13],
+        freq_resp.freq_resp[13, 13],
+        atol=1e-4 * abs(freq_resp.freq_resp[13, 13]).max(),
+    )
+
+
+def test_freq_response_selected_dofs(rotor3):
+    omega = np.linspace(0.0, 1000.0, 21)
+    freq_resp = rotor3.run_freq_response(speed_range=omega)
+
+    probe = Probe(2, Q_(45, "deg"), tag="Probe 1")
+    selected = rotor3.run_freq_response(
+        speed_range=omega, inputs=[13, 18], outputs=[13, probe]
+    )
+    assert selected.freq_resp.shape == (2, 2, 21)
+    assert selected.outputs == ["node 2 | dof: y", "Probe 1"]
+    assert_allclose(selected.freq_resp[0], freq_resp.freq_resp[13, [13, 18]])
+    assert_allclose(
+        selected.freq_resp[1, 0],
+        (freq_resp.freq_resp[12, 13] + freq_resp.freq_resp[13, 13]) / np.sqrt(2),
+    )
+    assert_allclose(selected.velc_resp, 1j * omega * selected.freq_resp)
+    assert_allclose(selected.accl_resp, -(omega**2) * selected.freq_resp)
+
+    modal = rotor3.run_freq_response(speed_range=omega, modes=list(range(6)))
+    modal_selected = rotor3.run_freq_response(
+        speed_range=omega, modes=list(range(6)), inputs=[13], outputs=[18]
+    )
+    assert_allclose(modal_selected.freq_resp[0, 0], modal.freq_resp[18, 13])
+
+
+def test_freq_response_selected_non_symmetric(rotor3):
+    # cross-coupled bearings make the transfer matrix non-symmetric
+    bearings = [
+        BearingElement(n, kxx=1e6, kyy=0.8e6, kxy=5e5, kyx=-5e5, cxx=1e2)
+        for n in (0, 6)
+    ]
+    rotor = Rotor(rotor3.shaft_elements, rotor3.disk_elements, bearings)
+
+    omega = np.linspace(10.0, 1000.0, 11)
+    inp = 2 * rotor.number_dof
+    out = 4 * rotor.number_dof + 1
+
+    freq_resp = rotor.run_freq_response(speed_range=omega)
+    selected = rotor.run_freq_response(speed_range=omega, inputs=[inp], outputs=[out])
+
+    H = freq_resp.freq_resp
+    assert not np.allclose(H[out, inp], H[inp, out])
+    assert_allclose(H[..., 5], rotor.transfer_matrix(speed=omega[5]))
+    assert_allclose(selected.freq_resp[0, 0], H[out, inp])
+
+    full_fig = freq_resp.plot_phase(inp=inp, out=out)
+    selected_fig = selected.plot_phase(inp=0, out=0)
+    assert_allclose(full_fig.data[0].y, selected_fig.data[0].y)
+
+
 def test_freq_response_w_force(rotor4):
     mag_exp = np.array(
         [
@@ -746,6 +863,139 @@ def test_freq_response_w_force(rotor4):
     assert_allclose(mag[3:5, :], mag_exp_2_unb[2:4, :])
 
 
+def test_forced_response_direct_solve(rotor3):
+    omega = np.linspace(10.0, 1000.0, 11)
+    freq_resp = rotor3.run_freq_response(speed_range=omega).freq_resp
+
+    # several load cases share the factorization of each frequency
+    force = np.stack(
+        [rotor3._unbalance_force(node, 0.001, 0.0, omega) for node in (2, 4)], axis=1
+    )
+    response = rotor3._solve_forced_response(force, omega)
+    expected = np.einsum("ijf,jcf->icf", freq_resp, force)
+    assert_allclose(response, expected, rtol=1e-8, atol=1e-14)
+
+    modal_resp = rotor3.run_freq_response(speed_range=omega, modes=list(range(6)))
+    response = rotor3._solve_forced_response(force, omega, modes=list(range(6)))
+    expected = np.einsum("ijf,jcf->icf", modal_resp.freq_resp, force)
+    assert_allclose(response, expected, rtol=1e-8, atol=1e-14)
+
+    unbalance = rotor3.run_unbalance_response(2, 0.001, 0.0, frequency=omega)
+    assert_allclose(
+        unbalance.forced_resp,
+        np.einsum("ijf,jf->if", freq_resp, force[:, 0]),
+        rtol=1e-8,
+        atol=1e-14,
+    )
+
+
+def test_freq_response_batched_chunks(rotor3):
+    omega = np.linspace(10.0, 1000.0, 37)
+    freq_resp = rotor3.run_freq_response(speed_range=omega)
+
+    # the execution settings are not part of the cached arguments
+    chunked = rotor3.run_freq_response(speed_range=omega, n_jobs=2, chunk_size=5)
+    assert chunked is freq_resp
+    assert not hasattr(rotor3, "_freq_response_settings")
+
+    H = rotor3._solve_frequency_range(
+        omega, np.eye(rotor3.ndof), n_jobs=2, chunk_size=5
+    )
+    assert_allclose(H, freq_resp.freq_resp, rtol=1e-10, atol=1e-16)
+
+    H = rotor3._solve_frequency_range(
+        omega, np.eye(rotor3.ndof), sparse=True, n_jobs=-1, chunk_size=8
+    )
+    assert_allclose(H, freq_resp.freq_resp, rtol=1e-8, atol=1e-14)
+
+    force = rotor3._unbalance_force(2, 0.001, 0.0, omega)
+    response = rotor3.run_forced_response(force, omega, n_jobs=2, chunk_size=4)
+    assert_allclose(
+        response.forced_resp,
+        np.einsum("ijf,jf->if", freq_resp.freq_resp, force),
+        rtol=1e-8,
+        atol=1e-14,
+    )
+
+
+def test_freq_response_settings(rotor3, monkeypatch):
+    omega = np.linspace(10.0, 1000.0, 11)
+    solve_frequency_range = rotor3._solve_frequency_range
+    settings = []
+
+    def spy(*args, **kwargs):
+        settings.append((kwargs["n_jobs"], kwargs["chunk_size"]))
+        return solve_frequency_range(*args, **kwargs)
+
+    monkeypatch.setattr(rotor3, "_solve_frequency_range", spy)
+    rotor3.run_freq_response(speed_range=omega, n_jobs=2, chunk_size=3)
+    rotor3.run_freq_response(speed_range=omega[1:], inputs=[2])
+    assert settings == [(2, 3), (1, 64)]
+
+
+def test_forced_response_dense(rotor3, monkeypatch):
+    rotor_sparse = Rotor(
+        rotor3.shaft_elements,
+        rotor3.disk_elements,
+        rotor3.bearing_elements,
+        sparse_assembly=True,
+    )
+    omega = np.linspace(10.0, 1000.0, 21)
+    force = rotor3._unbalance_force(2, 0.001, 0.0, omega)[:, np.newaxis]
+
+    calls = {False: 0, True: 0}
+    for rotor in (rotor3, rotor_sparse):
+
+        def spy(
+            Z, F, sparse=rotor.sparse_assembly, solve=rotor._solve_dynamic_stiffness
+        ):
+            calls[sparse] += 1
+            return solve(Z, F)
+
+        monkeypatch.setattr(rotor, "_solve_dynamic_stiffness", spy)
+
+    response = rotor3._solve_forced_response(force, omega, chunk_size=8)
+    response_sparse = rotor_sparse._solve_forced_response(force, omega)
+
+    # the dense rotor is solved in batches, and the sparse one speed by speed
+    assert calls == {False: 0, True: len(omega)}
+    assert_allclose(response, response_sparse, rtol=1e-8, atol=1e-14)
+
+
+def test_influence_coefficients(rotor3):
+    omega = np.linspace(10.0, 1000.0, 21)
+    probes = [Probe(2, 0), Probe(2, np.pi / 2), Probe(4, Q_(45, "deg"))]
+    ic = rotor3.run_influence_coefficients(probes, nodes=[2, 4], frequency=omega)
+    assert ic.influence.shape == (3, 2, 21)
+
+    S = rotor3._selection_matrix(probes)
+    expected = rotor3.run_unbalance_response(
+        [2, 4], [0.001, 0.002], [0.0, 1.0], frequency=omega
+    ).forced_resp
+    response = ic.unbalance_response([2, 4], [0.001, 0.002], [0.0, 1.0])
+    assert_allclose(response, S @ expected, rtol=1e-8, atol=1e-14)
+
+    # many scenarios are evaluated at once
+    magnitude = np.array([[0.001, 0.0], [0.0, 0.002], [0.001, 0.002]])
+    phase = np.zeros_like(magnitude)
+    response = ic.unbalance_response([2, 4], magnitude, phase)
+    assert response.shape == (3, 3, 21)
+    assert_allclose(response[2], response[0] + response[1])
+
+    # the corrections cancel the unbalances that caused the response
+    magnitude, phase = ic.balance(response, node=[2, 4])
+    assert_allclose(magnitude, [[0.001, 0.0], [0.0, 0.002], [0.001, 0.002]], atol=1e-12)
+    assert_allclose(abs(phase[2]), [np.pi, np.pi])
+
+    magnitude, phase = ic.balance(
+        response[2][:, [5, 10]], node=[2, 4], speed=omega[[5, 10]]
+    )
+    assert_allclose(magnitude, [0.001, 0.002])
+
+    with pytest.raises(ValueError):
+        ic.unbalance_response([3], [0.001], [0.0])
+
+
 def test_mesh_convergence(rotor3):
     rotor3.convergence(n_eigval=0, err_max=1e-08)
     modal3 = rotor3.run_modal(speed=0)
@@ -1160,6 +1410,32 @@ def test_static_bearing_with_disks(rotor3):
     assert_allclose(fig.data[1]["y"], expected_deformation)
 
 
+def test_eigen_speed_derivative(rotor_6dof):
+    frequency = np.array([0, 400, 800])
+    bearings = [
+        BearingElement(
+            n=b.n,
+            kxx=[1e6, 1.5e6, 2.5e6],
+            kyy=[8e5, 1.2e6, 2e6],
+            kxy=[0, 1e5, 3e5],
+            cxx=[2e3, 1.5e3, 1e3],
+            frequency=frequency,
+        )
+        for b in rotor_6dof.bearing_elements
+    ]
+    rotor = Rotor(rotor_6dof.shaft_elements, rotor_6dof.disk_elements, bearings)
+
+    speed, h = 300.0, 1e-3
+    evalues, evectors = rotor._eigen(speed, num_modes=8, sparse=True)
+    devalues = rotor._eigen_speed_derivative(speed, evalues, evectors, num_modes=8)
+
+    evalues_plus = rotor._eigen(speed + h, num_modes=8, sparse=True)[0]
+    evalues_minus = rotor._eigen(speed - h, num_modes=8, sparse=True)[0]
+    devalues_fd = (evalues_plus - evalues_minus) / (2 * h)
+
+    assert_allclose(devalues[:6], devalues_fd[:6], rtol=1e-4, atol=1e-5)
+
+
 def test_run_critical_speed(rotor5, rotor6):
     results5 = rotor5.run_critical_speed(num_modes=12, rtol=0.005)
     results6 = rotor6.run_critical_speed(num_modes=12, rtol=0.005)
@@ -1867,6 +2143,82 @@ def test_modal_6dof(rotor_6dof):
     assert_almost_equal(modal.wd[:5], wd, decimal=2)
 
 
+def test_sparse_assembly_matrices(rotor_6dof):
+    for speed in [0, 100.0]:
+        for matrix in ["M", "K", "C"]:
+            dense = getattr(rotor_6dof, matrix)(speed)
+            sparse = getattr(rotor_6dof, matrix)(speed, sparse=True)
+            assert sparse.format == "csr"
+            assert_allclose(sparse.toarray(), dense, rtol=1e-12, atol=1e-6)
+
+    assert_allclose(rotor_6dof.G(sparse=True).toarray(), rotor_6dof.G())
+    assert_allclose(rotor_6dof.Ksdt(sparse=True).toarray(), rotor_6dof.Ksdt())
+    assert_allclose(
+        rotor_6dof.M(synchronous=True, sparse=True).toarray(),
+        rotor_6dof.M(synchronous=True),
+    )
+
+
+def test_eigen_quadratic_shift_invert(rotor_6dof):
+    # eigenvalues from the quadratic problem match the dense state space ones
+    evalues, evectors = rotor_6dof._eigen(speed=300.0, num_modes=6, sparse=True)
+    A = rotor_6dof.A(speed=300.0)
+    evalues_dense = np.linalg.eigvals(A)
+
+    for value in evalues:
+        assert np.min(np.abs(evalues_dense - value)) < 1e-8 * np.abs(value)
+
+    residual = A @ evectors - evectors * evalues
+    assert_allclose(residual, 0, atol=1e-6 * np.abs(evalues).max())
+
+
+def test_sparse_assembly_analyses(rotor_6dof):
+    rotor_sparse = Rotor(
+        rotor_6dof.shaft_elements,
+        rotor_6dof.disk_elements,
+        rotor_6dof.bearing_elements,
+        sparse_assembly=True,
+    )
+
+    modal = rotor_6dof.run_modal(speed=100.0)
+    modal_sparse = rotor_sparse.run_modal(speed=100.0)
+    assert_allclose(modal_sparse.wd[:5], modal.wd[:5], rtol=1e-6)
+
+    assert_allclose(
+        rotor_sparse.transfer_matrix(speed=100.0, frequency=50.0),
+        rotor_6dof.transfer_matrix(speed=100.0, frequency=50.0),
+        atol=1e-14,
+    )
+
+    rotor_6dof.run_static()
+    rotor_sparse.run_static()
+    assert_allclose(
+        list(rotor_sparse.bearing_forces_tag.values()),
+        list(rotor_6dof.bearing_forces_tag.values()),
+    )
+
+    t = np.linspace(0, 0.1, 101)
+    F = np.zeros((len(t), rotor_6dof.ndof))
+    F[:, 6 * 3 + 1] = 10 * np.sin(20 * t)
+    _, yout, _ = rotor_6dof.integrate_system(100.0, F, t)
+    _, yout_sparse, _ = rotor_sparse.integrate_system(100.0, F, t)
+    assert_allclose(yout_sparse, yout, atol=1e-15)
+
+
+def test_assemble_matrices(rotor8):
+    frequencies = np.linspace(0, 800, 7)
+    M, K, C = rotor8.assemble_matrices(frequencies)
+    M_sparse, K_sparse, C_sparse = rotor8.assemble_matrices(frequencies, sparse=True)
+
+    assert K.shape == (len(frequencies), rotor8.ndof, rotor8.ndof)
+    for i, frequency in enumerate(frequencies):
+        assert_allclose(M[i], rotor8.M(frequency))
+        assert_allclose(K[i], rotor8.K(frequency))
+        assert_allclose(C[i], rotor8.C(frequency))
+        assert_allclose(K_sparse[i].toarray(), K[i])
+        assert_allclose(C_sparse[i].toarray(), C[i])
+
+
 def test_modal_damping():
     #  Rotor with modal damping with 6 shaft elements 2 disks and 2 bearings
     i_d = 0
@@ -3,6 +3,8 @@ import pytest
 
 import ross as rs
 from ross import Q_, Probe, Rubbing
+from ross.faults.rubbing import _rubbing_force, _rubbing_jacobian
+from ross.utils import ForceKernel
 
 from numpy.testing import assert_allclose
 
@@ -110,6 +112,43 @@ def test_rubbing(rotor):
     assert round(rubbing.shaft_elem.L, 2) == 0.01
 
 
+def test_rubbing_jacobian(rotor):
+    rubbing = Rubbing(
+        rotor,
+        n=12,
+        distance=7.95e-5,
+        contact_stiffness=1.1e6,
+        contact_damping=40,
+        friction_coeff=0.3,
+        torque=True,
+    )
+
+    rng = np.random.default_rng(0)
+    y = np.zeros(rotor.ndof)
+    ydot = np.zeros(rotor.ndof)
+    y[rubbing.dofs] = rng.normal(size=12) * 1e-4
+    ydot[rubbing.dofs] = rng.normal(size=12) * 1e-2
+    speed = np.full(2, 125.0)
+
+    force = ForceKernel(_rubbing_force, rubbing.dofs, rubbing._kernel_params(), speed)
+    force_jac = ForceKernel(
+        _rubbing_force,
+        rubbing.dofs,
+        rubbing._kernel_params(),
+        speed,
+        jacobian=_rubbing_jacobian,
+    )
+
+    for dF, dF_fd in zip(
+        force_jac.jacobian(1, disp_resp=y, velc_resp=ydot),
+        force.jacobian(1, disp_resp=y, velc_resp=ydot),
+    ):
+        assert dF.nnz
+        assert_allclose(
+            dF.toarray(), dF_fd.toarray(), atol=1e-6 * np.abs(dF.toarray()).max()
+        )
+
+
 def test_rubbing_resp(run_rubbing):
     probe1 = Probe(12, Q_(45, "deg"))
     probe2 = Probe(20, Q_(90, "deg"))
@@ -519,3 +519,38 @@ def test_time_response(rotor1):
     dofs_4, dofs_6 = get_dofs(rotor1.ndof)
     assert results.yout.shape == (2, 5, 7 * rotor1.number_dof)
     assert_allclose(results.yout[:, :, dofs_4[:8]], yout, atol=1e-8)
+
+
+def test_time_response_ensemble(rotor1):
+    size = 201
+    ndof = rotor1.ndof
+    node = 3
+    speed = 250.0
+    t = np.linspace(0, 0.2, size)
+    F = np.zeros((size, ndof))
+    F[:, rotor1.number_dof * node] = 10 * np.cos(2 * t)
+    F[:, rotor1.number_dof * node + 1] = 10 * np.sin(2 * t)
+
+    results = rotor1.run_time_response(speed, F, t)
+    results_newmark = rotor1.run_time_response(speed, F, t, method="newmark")
+
+    for i, rotor in enumerate(iter(rotor1)):
+        t_, yout, xout = rotor.time_response(speed, F, t)
+        assert_allclose(results.yout[i], yout, rtol=1e-6, atol=1e-14)
+        assert_allclose(results.xout[i], xout, rtol=1e-6, atol=1e-14)
+
+        yout = rotor.time_response(speed, F, t, method="newmark")[1]
+        assert_allclose(results_newmark.yout[i], yout, rtol=1e-6, atol=1e-14)
+
+    # free response from an initial displacement
+    t = np.linspace(0, 0.01, 1001)
+    F = np.zeros((len(t), ndof))
+    ic = np.zeros(2 * ndof)
+    ic[rotor1.number_dof * node] = 1e-5
+    results = rotor1.run_time_response(speed, F, t, ic=ic)
+    results_newmark = rotor1.run_time_response(speed, F, t, ic=ic, method="newmark")
+
+    assert_allclose(results_newmark.xout[:, 0], results.xout[:, 0])
+    assert_allclose(
+        results_newmark.yout, results.yout, atol=2e-2 * np.abs(results.yout).max()
+    )
@@ -1,13 +1,17 @@
 import pytest
+from copy import deepcopy
 from numpy.testing import assert_allclose
 import numpy as np
+from numba import njit
 from scipy import integrate
 
 from ross.bearing_seal_element import BearingElement
 from ross.disk_element import DiskElement
 from ross.materials import steel
+from ross.model_reduction import ModelReduction
 from ross.rotor_assembly import Rotor
 from ross.shaft_element import ShaftElement
+from ross.utils import ForceKernel, TimeResponseStore, newmark
 
 
 @pytest.fixture
@@ -269,3 +273,363 @@ def test_for_var_speed_2(rotor2):
 
     assert_allclose(freq, 68.96552, rtol=1e-3, atol=1e-2)
     assert_allclose(abs_max, 0.000153, rtol=1e-3, atol=1e-6)
+
+
+def test_speed_varying_bearings(rotor2):
+    speed = np.linspace(50, 500, 25)
+    identity = lambda array: array
+    mr = ModelReduction(rotor=rotor2, speed=275.0, method="pseudomodal", num_modes=12)
+
+    for reduction, sparse in (
+        ([identity] * 3, False),
+        ([identity] * 3, True),
+        ([mr.reduce_matrix, mr.reduce_vector, mr.revert_vector], False),
+    ):
+        size = reduction[0](rotor2.M()).shape[0]
+        bearing_matrices = rotor2._speed_varying_bearings(
+            speed, reduction, size, sparse, chunk=10
+        )
+
+        for step in (0, 11, 24, 3):
+            C, K = bearing_matrices(step)
+            C_ref = reduction[0](rotor2.C(speed[step], sparse=sparse))
+            K_ref = reduction[0](rotor2.K(speed[step], sparse=sparse))
+
+            if sparse:
+                C, K, C_ref, K_ref = (A.toarray() for A in (C, K, C_ref, K_ref))
+
+            assert_allclose(C, C_ref, rtol=1e-10, atol=1e-8)
+            assert_allclose(K, K_ref, rtol=1e-10, atol=1e-4)
+
+
+def test_newmark_factorization_reuse(rotor1, monkeypatch):
+    from ross import utils
+
+    t = np.linspace(0, 0.5, 501)
+    speed = 50.0
+    F = unbalance_force(rotor1, speed, t)
+
+    factorizations = []
+    factorize = utils._factorize_newmark
+
+    def counting_factorize(*args):
+        factorizations.append(args[-1])
+        return factorize(*args)
+
+    monkeypatch.setattr(utils, "_factorize_newmark", counting_factorize)
+
+    # constant matrices and time step: the Jacobian is factorized once
+    response = rotor1.run_time_response(speed, F, t, method="newmark", jit=False)
+    assert len(factorizations) == 1
+
+    # a new factorization is done when the time step changes
+    factorizations.clear()
+    t2 = np.concatenate([t[:251], t[250] + np.cumsum(np.full(250, 5e-4))])
+    rotor1.run_time_response(speed, F, t2, method="newmark", jit=False)
+    assert len(factorizations) == 2
+
+    # new matrices with the same values reuse the factorization
+    M = rotor1.M(speed)
+    C = rotor1.C(speed) + rotor1.G() * speed
+    K = rotor1.K(speed)
+    factorizations.clear()
+    yout = utils.newmark(
+        lambda step, **state: (M, C.copy(), K.copy(), F[step, :]),
+        lambda step, **state: F[step, :],
+        t,
+        rotor1.ndof,
+    )
+    assert len(factorizations) == 1
+    assert_allclose(yout, response.yout, rtol=1e-8, atol=1e-14)
+
+    # matrices changing at each step are factorized at each step
+    factorizations.clear()
+    utils.newmark(
+        lambda step, **state: (M, C, K * (1 + 1e-3 * step), F[step, :]),
+        lambda step, **state: F[step, :],
+        t,
+        rotor1.ndof,
+    )
+    assert len(factorizations) == len(t) - 1
+
+    # matrices changed in place are factorized again
+    def stiffness(step):
+        return K * (2.0 if t[step] >= 0.25 else 1.0)
+
+    K_inplace = K.copy()
+
+    def system_inplace(step, **state):
+        K_inplace[:] = stiffness(step)
+        return M, C, K_inplace, F[step, :]
+
+    for newmark_type in ("simple", "generalized_alpha"):
+        factorizations.clear()
+        reference = utils.newmark(
+            lambda step, **state: (M, C, stiffness(step), F[step, :]),
+            lambda step, **state: F[step, :],
+            t,
+            rotor1.ndof,
+            newmark_type=newmark_type,
+        )
+        n_factorizations = len(factorizations)
+
+        factorizations.clear()
+        yout = utils.newmark(
+            system_inplace,
+            lambda step, **state: F[step, :],
+            t,
+            rotor1.ndof,
+            newmark_type=newmark_type,
+        )
+        assert len(factorizations) == n_factorizations > 1
+        assert_allclose(yout, reference, rtol=1e-8, atol=1e-14)
+
+
+def test_newmark_compiled_loop(rotor1):
+    t = np.linspace(0, 0.5, 1001)
+    speed = np.linspace(50, 500, len(t))
+    F = unbalance_force(rotor1, speed, t)
+    reduction = {"num_modes": 12}
+
+    resp_jit = rotor1.run_time_response(speed, F, t, model_reduction=reduction)
+    resp_python = rotor1.run_time_response(
+        speed, F, t, model_reduction=reduction, jit=False
+    )
+    assert_allclose(resp_jit.yout, resp_python.yout, rtol=1e-8, atol=1e-14)
+
+    # jitted force kernels give the same response as the Python fallback
+    @njit
+    def spring(step, y, ydot, params, signal):
+        return -params[0] * signal[step] * y
+
+    dofs = [18, 19]
+    kernel = ForceKernel(spring, dofs, [1e5], speed / 500)
+    resp_jit = rotor1.run_time_response(speed, F, t, add_to_RHS=kernel)
+
+    def python_spring(step, **state):
+        force = np.zeros(rotor1.ndof)
+        force[dofs] = -1e5 * speed[step] / 500 * state["disp_resp"][dofs]
+        return force
+
+    resp_python = rotor1.run_time_response(speed, F, t, add_to_RHS=python_spring)
+    assert_allclose(resp_jit.yout, resp_python.yout, rtol=1e-8, atol=1e-14)
+    assert_allclose(
+        kernel.forces[:, 1:],
+        -1e5 * speed[1:] / 500 * resp_jit.yout[:-1, dofs].T,
+        rtol=1e-8,
+        atol=1e-14,
+    )
+
+
+def test_time_response_store(rotor1, tmp_path):
+    t = np.linspace(0, 0.5, 2501)
+    speed = np.linspace(50, 500, len(t))
+    F = unbalance_force(rotor1, speed, t)
+    dofs = [18, 19, 30, 31]
+
+    for options in (
+        {},
+        {"jit": False},
+        {"model_reduction": {"num_modes": 12}},
+        {"newmark_type": "generalized_alpha"},
+    ):
+        reference = rotor1.run_time_response(speed, F, t, **deepcopy(options))
+        response = rotor1.run_time_response(
+            speed,
+            F,
+            t,
+            output_file=tmp_path / "response.npy",
+            output_dofs=dofs,
+            output_decimation=7,
+            **deepcopy(options),
+        )
+
+        assert isinstance(response.yout, TimeResponseStore)
+        assert_allclose(response.t, t[::7])
+        assert_allclose(response.yout[:, dofs], reference.yout[::7, dofs])
+
+    stored = np.load(tmp_path / "response.npy", mmap_mode="r")
+    assert stored.shape == (len(t[::7]), len(dofs))
+
+    with pytest.raises(IndexError):
+        response.yout[:, 0]
+
+
+def test_robust_newmark_force_jacobian(rotor1):
+    t = np.linspace(0, 0.2, 401)
+    speed = 200.0
+    F = unbalance_force(rotor1, speed, t)
+
+    @njit
+    def cubic_spring(step, y, ydot, params, signal):
+        return -params[0] * y - params[1] * y**3 - params[2] * ydot
+
+    @njit
+    def cubic_spring_jacobian(step, y, ydot, params, signal):
+        dF_dy = np.diag(-params[0] - 3 * params[1] * y**2)
+        dF_dydot = -params[2] * np.eye(len(y))
+        return dF_dy, dF_dydot
+
+    dofs = [18, 19]
+    params = [1e5, 1e15, 50.0]
+    signal = np.zeros(len(t))
+    analytic = ForceKernel(cubic_spring, dofs, params, signal, cubic_spring_jacobian)
+    kernel = ForceKernel(cubic_spring, dofs, params, signal)
+
+    # the finite differences of the kernel match the analytic derivatives
+    y = np.zeros(rotor1.ndof)
+    y[dofs] = [1e-5, -2e-5]
+    ydot = np.full(rotor1.ndof, 1e-3)
+    for dF, dF_fd in zip(
+        analytic.jacobian(0, disp_resp=y, velc_resp=ydot),
+        kernel.jacobian(0, disp_resp=y, velc_resp=ydot),
+    ):
+        assert_allclose(dF_fd.toarray(), dF.toarray(), rtol=1e-6)
+
+    calls = []
+
+    def python_force(step, **state):
+        calls.append(step)
+        return kernel(step, **state)
+
+    resp_fd = rotor1.run_time_response(
+        speed, F, t, method="newmark", add_to_RHS=python_force, newmark_type="robust"
+    )
+    n_calls_fd = len(calls)
+
+    calls.clear()
+    python_force.jacobian = analytic.jacobian
+    resp_analytic = rotor1.run_time_response(
+        speed, F, t, method="newmark", add_to_RHS=python_force, newmark_type="robust"
+    )
+
+    assert len(calls) < n_calls_fd / 2
+    assert_allclose(
+        resp_analytic.yout, resp_fd.yout, atol=1e-6 * np.abs(resp_fd.yout).max()
+    )
+
+
+def test_robust_newmark_stiff_force():
+    # a hardening spring loaded by a step force, for which the finite
+    # differences of the predictor alone do not converge
+    t = np.linspace(0, 0.5, 51)
+    k, kn, F0 = (4 * np.pi) ** 2, 1e8, 1e3
+    M, C, K = np.array([[1.0]]), np.array([[0.5]]), np.array([[k]])
+    F = np.where(t > 0.1, F0, 1.0)
+
+    system_func = lambda step, **state: (M, C, K, F[step : step + 1])
+
+    def force(step, disp_resp, **state):
+        return F[step : step + 1] - kn * disp_resp**3
+
+    yout = newmark(system_func, force, t, 1, newmark_type="robust")
+
+    # the work of the step force bounds the peak displacement:
+    # F0 y = k y² / 2 + kn y⁴ / 4
+    roots = np.roots([kn / 4, 0, k / 2, -F0, 0])
+    y_max = roots[(abs(roots.imag) < 1e-12) & (roots.real > 0)].real[0]
+
+    assert np.isfinite(yout).all()
+    assert 0.5 * y_max < np.abs(yout).max() < 1.05 * y_max
+
+
+def test_robust_newmark_event():
+    # the sub-steps refined at the sign changes of the event end at the grid
+    # points, so the response matches the one without the event
+    t = np.linspace(0, 1, 1001)
+    M = np.array([[1.0]])
+    C = np.array([[0.5]])
+    K = np.array([[(4 * np.pi) ** 2]])
+    F = 1e3 * np.sin(6 * np.pi * t)
+
+    system_func = lambda step, **state: (M, C, K, np.zeros(1))
+
+    def force(step, **state):
+        return F[step : step + 1]
+
+    yout_ref = newmark(system_func, force, t, 1, newmark_type="robust")
+
+    force.event = lambda step, disp_resp, **state: disp_resp[0]
+    yout = newmark(system_func, force, t, 1, newmark_type="robust")
+
+    assert_allclose(yout, yout_ref, atol=1e-3 * np.abs(yout_ref).max())
+
+
+def test_generalized_alpha(rotor1):
+    from ross.utils import newmark
+
+    t = np.linspace(0, 0.5, 5001)
+    speed = 200.0
+    F = unbalance_force(rotor1, speed, t)
+
+    reference = rotor1.run_time_response(speed, F, t, method="newmark").yout
+    amplitude = np.abs(reference).max()
+
+    for options in [
+        {"newmark_type": "generalized_alpha"},
+        {"newmark_type": "generalized_alpha", "rho_inf": 0.5},
+        {"newmark_type": "hht", "rho_inf": 0.8},
+    ]:
+        response = rotor1.run_time_response(
+            speed, F, t, method="newmark", **options
+        ).yout
+        assert_allclose(response, reference, atol=2e-2 * amplitude)
+
+    with pytest.raises(ValueError):
+        rotor1.run_time_response(
+            speed, F, t, method="newmark", newmark_type="hht", rho_inf=0.3
+        )
+
+    # steps longer than the output grid when the response is smooth
+    M = rotor1.M(speed)
+    C = rotor1.C(speed) + rotor1.G() * speed
+    K = rotor1.K(speed)
+    F_static = np.zeros((len(t), rotor1.ndof))
+    F_static[:, [18, 19]] = 100.0
+
+    steps = []
+
+    def system_func(step, **state):
+        steps.append(step)
+        return M, C, K, F_static[step]
+
+    yout = newmark(
+        system_func,
+        lambda step, **state: F_static[step],
+        t,
+        rotor1.ndof,
+        newmark_type="generalized_alpha",
+        rho_inf=0.5,
+        dt_max=t[-1] - t[0],
+    )
+    assert len(steps) < len(t) / 2
+    reference = newmark(
+        lambda step, **state: (M, C, K, F_static[step]), None, t, rotor1.ndof
+    )
+    assert_allclose(yout, reference, atol=2e-2 * np.abs(reference).max())
+
+
+@pytest.mark.parametrize("dt_max", [None, 1.0])
+def test_generalized_alpha_late_force(dt_max):
+    t = np.linspace(0, 1, 1001)
+    M = np.array([[1.0]])
+    C = np.array([[0.5]])
+    K = np.array([[(2 * np.pi) ** 2]])
+    options = {} if dt_max is None else {"dt_max": dt_max}
+
+    # a short pulse and a sine that is switched on after a quiet start
+    pulse = np.zeros((len(t), 1))
+    pulse[500:506] = 1e3
+    sine = np.where(t >= 0.3, np.sin(2 * np.pi * 50 * t), 0.0)[:, np.newaxis]
+
+    for F, rtol in ((pulse, 5e-2), (sine, 1e-1)):
+        yout = newmark(
+            lambda step, **state: (M, C, K, F[step]),
+            lambda step, **state: F[step],
+            t,
+            1,
+            newmark_type="generalized_alpha",
+            **options,
+        )
+        reference = newmark(lambda step, **state: (M, C, K, F[step]), None, t, 1)
+        assert_allclose(yout, reference, atol=rtol * np.abs(reference).max())
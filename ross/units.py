@@ -5,6 +5,7 @@ import warnings
 from functools import wraps
 from pathlib import Path
 
+import numpy as np
 import pint
 
 new_units_path = Path(__file__).parent / "new_units.txt"
@@ -95,6 +96,9 @@ for i, unit in zip(["k", "c", "m"], ["N/m", "N*s/m", "kg"]):
             units["".join([i, j, k])] = unit
 
 
+_plain_types = (int, float, np.integer, np.floating)
+
+
 def check_units(func):
     """Wrapper to check and convert units to base_units.
 
@@ -127,12 +131,18 @@ def check_units(func):
     0.0127
     """
 
+    args_names = inspect.getfullargspec(func)[0]
+
     @wraps(func)
     def inner(*args, **kwargs):
         base_unit_args = []
-        args_names = inspect.getfullargspec(func)[0]
 
         for arg_name, arg_value in zip(args_names, args):
+            if isinstance(arg_value, _plain_types):
+                # plain numbers are already assumed to be in base units
+                base_unit_args.append(arg_value)
+                continue
+
             names = arg_name.split("_")
             if "units" in names:
                 base_unit_args.append(arg_value)
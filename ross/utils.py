@@ -7,6 +7,7 @@ import numpy as np
 import pandas as pd
 
 from collections.abc import Iterable
+from functools import partial
 from pathlib import Path
 from numba import njit
 from numpy.fft import fft
@@ -14,6 +15,9 @@ from numpy import linalg as la
 from plotly import graph_objects as go
 from copy import deepcopy as copy
 from scipy.integrate import cumulative_trapezoid as integrate
+from scipy.linalg import expm, lu_factor, lu_solve
+from scipy.sparse import coo_matrix, csc_matrix, issparse
+from scipy.sparse.linalg import splu
 
 
 class NumpyEncoder(json.JSONEncoder):
@@ -733,6 +737,163 @@ def get_data_from_figure(fig):
     return df
 
 
+class TimeResponseStore:
+    """Time response written in chunks to a .npy file on disk.
+
+    A store can be passed as the `output` option of `newmark` (or created by
+    `Rotor.integrate_system` with the `output_file` option), so that long
+    transients do not need to fit in memory. The integrator writes the state
+    of each time step, which is buffered and saved in chunks, optionally only
+    for some degrees of freedom and every `decimation` steps.
+
+    After the integration, the store is read lazily from the file: indexing
+    it with the global degrees of freedom, as in `store[:, dof]`, reads only
+    the requested data.
+
+    Parameters
+    ----------
+    file : str, pathlib.Path
+        Path of the .npy file.
+    n_steps : int
+        Number of time steps of the integration.
+    size : int
+        Number of degrees of freedom of the stored response.
+    dofs : array_like, optional
+        Degrees of freedom to be stored. Default is all of them.
+    decimation : int, optional
+        Only every `decimation` time steps are stored. Default is 1.
+    transform : np.ndarray, optional
+        Matrix with shape (size, y_size) that maps the state vector of the
+        integrator to the stored degrees of freedom (e.g. the transformation
+        matrix of a model reduction). Default is the identity.
+    chunk_size : int, optional
+        Number of time steps kept in memory before being written to the file.
+        Default is 1000.
+
+    Attributes
+    ----------
+    shape : tuple
+        Shape (number of stored time steps, size) of the response.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> t = np.linspace(0, 1, 101)
+    >>> file = Path(tempfile.mkdtemp()) / "response.npy"
+    >>> store = TimeResponseStore(file, len(t), 3, dofs=[0, 2], decimation=10)
+    >>> for step in range(len(t)):
+    ...     store[step] = [t[step], 1.0, -t[step]]
+    >>> store.flush()
+    >>> store.shape
+    (11, 3)
+    >>> store[-2:, 2]
+    memmap([-0.9, -1. ])
+    """
+
+    def __init__(
+        self,
+        file,
+        n_steps,
+        size,
+        dofs=None,
+        decimation=1,
+        transform=None,
+        chunk_size=1000,
+    ):
+        self.file = Path(file)
+        self.n_steps = n_steps
+        self.size = size
+        self.dofs = np.arange(size) if dofs is None else np.asarray(dofs, dtype=int)
+        self.decimation = int(decimation)
+        self.transform = None if transform is None else transform[self.dofs]
+
+        # chunks start at multiples of the decimation
+        self.chunk_size = -(-int(chunk_size) // self.decimation) * self.decimation
+        self.shape = ((n_steps - 1) // self.decimation + 1, size)
+
+        self._columns = np.full(size, -1)
+        self._columns[self.dofs] = np.arange(len(self.dofs))
+
+        self._data = np.lib.format.open_memmap(
+            self.file, mode="w+", shape=(self.shape[0], len(self.dofs))
+        )
+        self._buffer = None
+        self._chunk_start = 0
+        self._chunk_end = 0
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __setitem__(self, key, value):
+        """Write the state of a time step, or of consecutive steps."""
+        if isinstance(key, tuple):
+            key = key[0]
+
+        if isinstance(key, slice):
+            steps = range(*key.indices(self.n_steps))
+            value = np.atleast_2d(value)
+        else:
+            steps = [key]
+            value = [value]
+
+        for step, y in zip(steps, value):
+            if step >= self._chunk_start + self.chunk_size:
+                self._write_chunk()
+                self._chunk_start = step - step % self.chunk_size
+
+            if self._buffer is None:
+                self._buffer = np.zeros((self.chunk_size, np.size(y)))
+
+            self._buffer[step - self._chunk_start] = y
+            self._chunk_end = max(self._chunk_end, step - self._chunk_start + 1)
+
+    def __getitem__(self, key):
+        """Read the stored response, indexed by time step and global dof."""
+        rows, cols = key if isinstance(key, tuple) else (key, slice(None))
+
+        if isinstance(cols, slice):
+            cols = np.arange(self.size)[cols]
+
+        columns = self._columns[cols]
+        if np.any(columns < 0):
+            raise IndexError(
+                f"Degrees of freedom {np.setdiff1d(cols, self.dofs)} were not stored."
+            )
+
+        if np.ndim(columns):
+            return self._data[rows][..., columns]
+
+        return self._data[rows, columns]
+
+    def __array__(self, dtype=None, copy=None):
+        """Full response in memory, with NaN for the degrees of freedom not stored."""
+        array = np.full(self.shape, np.nan)
+        array[:, self.dofs] = self._data
+        return array if dtype is None else array.astype(dtype)
+
+    def _write_chunk(self):
+        """Write the buffered time steps to the file."""
+        if self._buffer is None or not self._chunk_end:
+            return
+
+        chunk = self._buffer[: self._chunk_end : self.decimation]
+        if self.transform is None:
+            chunk = chunk[:, self.dofs]
+        else:
+            chunk = chunk @ self.transform.T
+
+        start = self._chunk_start // self.decimation
+        self._data[start : start + len(chunk)] = chunk
+
+        self._buffer[:] = 0.0
+        self._chunk_end = 0
+
+    def flush(self):
+        """Write the remaining buffered time steps and flush the file."""
+        self._write_chunk()
+        self._data.flush()
+
+
 def newmark(system_func, rhs_func, t, y_size, newmark_type="simple", **options):
     """Transient solution of the dynamic behavior of the system.
 
@@ -749,33 +910,77 @@ def newmark(system_func, rhs_func, t, y_size, newmark_type="simple", **options):
         step, `dt` is the current time step in seconds, `y` is a ndarray of current state of the system,
         `ydot` and `y2dot` are its first and second time derivatives. `M`, `C`, `K` are ndarrays with
         `np.shape(M) = (y_size, y_size)` and `RHS` is a ndarray with `len(RHS) = y_size`.
+        The Jacobian is only factorized again when the time step or the values of the
+        matrices change, so the same arrays can be returned at each step, even if they
+        are changed in place. If `system_func` has a `low_rank_stiffness` attribute `(K_ref, U, coefficient)`,
+        the simple method takes `K = K_ref + U @ np.diag(coefficient(step)) @ U.T`, where U is
+        a dense array with a few columns, and only factorizes the Jacobian with K_ref, updating
+        the solution at each step with the low rank term.
     rhs_func : callable
         A function that calculates the right-hand side (RHS) vector at each time step. It should take at
         least one argument `(step, dt=None, y=None, ydot=None, y2dot=None)` and return a ndarray with
-        `len(RHS) = y_size`.
+        `len(RHS) = y_size`. If `rhs_func` has a `jacobian` attribute, it is called with the same
+        arguments and returns a tuple `(dF_dy, dF_dydot)` with the derivatives of the RHS with
+        respect to the displacements and velocities (ndarrays, sparse matrices or None). The robust
+        method then uses them in the Newton-Raphson iterations instead of finite differences,
+        which are otherwise evaluated once per time step and again only if the residual
+        does not decrease.
     t : array_like
         Time array.
     y_size : int
         Size of the state vector.
+    newmark_type : str, optional
+        Integration scheme. Options are:
+            "simple": Newmark method with a fixed time step.
+            "robust": Newmark method with Newton-Raphson iterations on the nonlinear
+                forces and time step control from the number of iterations.
+            "generalized_alpha": generalized-alpha method with adjustable numerical
+                dissipation and time step control from the local truncation error.
+            "hht": HHT-alpha method, with the same time step control.
+        Default is "simple".
     **options
         Options passed for controlling the integration parameters. All options available are
         listed below.
     gamma : float, optional
         Parameter of the integration algorithm related to the velocity interpolation equation.
-        Default is 0.5.
+        Default is 0.5. Not used by the alpha methods.
     beta : float, optional
         Parameter of the integration algorithm related to the displacement interpolation equation.
-        Default is 0.25.
+        Default is 0.25. Not used by the alpha methods.
     tol : float, optional
         Convergence tolerance for the Newton-Raphson iterations. Default is 1e-6.
     progress_interval : float, optional
         Time interval at which progress is printed. Default is to not show progress.
+    rho_inf : float, optional
+        Spectral radius at infinite frequency of the alpha methods. Lower values damp
+        more the high frequency modes. It ranges from 0 to 1 for the generalized-alpha
+        method and from 0.5 to 1 for the HHT-alpha method. Default is 0.9.
+    rtol, atol : float, optional
+        Relative and absolute tolerances of the local truncation error of the
+        displacements, used by the alpha methods. Default is 1e-4 and 1e-10.
+    event_tol : float, optional
+        If `rhs_func` has an `event` attribute, called with the same arguments plus the
+        `time` of the state and returning a scalar whose sign changes at events of the
+        force (e.g. contact and separation), the robust method halves the sub-steps
+        where the sign changes until they are smaller than `event_tol` times the time
+        step, and calls `rhs_func` with the `time` of each sub-step. Only used by the
+        robust method, the other methods ignore the `event` attribute. Default is 1e-2.
+    dt_min, dt_max : float, optional
+        Minimum and maximum time steps of the alpha methods. If `dt_max` is larger
+        than the spacing of `t`, the response at the skipped times is interpolated.
+        The forces are only evaluated at the end of the accepted steps, so the
+        forces between them are not seen, and a step only skips points of the grid
+        where the force is linear in time. Default is 1e-4 times the first time
+        step and the first time step.
+    output : TimeResponseStore, optional
+        Store where the response is written in chunks, instead of an array
+        kept in memory. Default is None.
 
     Returns
     -------
-    yout : ndarray
+    yout : ndarray or TimeResponseStore
         System response. It is an array containing the state variables at each time step of `t` with
-        `np.shape(yout) = (len(t), y_size)`
+        `np.shape(yout) = (len(t), y_size)`, or the `output` store if given.
 
     References
     ----------
@@ -813,11 +1018,29 @@ def newmark(system_func, rhs_func, t, y_size, newmark_type="simple", **options):
     tol = options.get("tol", 1e-6)
     progress_interval = options.get("progress_interval", t[-1] + 1)
     args = options.get("args", [])
+    output = options.get("output")
 
     n_steps = len(t)
     ny = y_size
 
-    if newmark_type == "robust":
+    if newmark_type in ("generalized_alpha", "hht"):
+        rho_inf = options.get("rho_inf", 0.9)
+        yout = _converge_generalized_alpha(
+            system_func,
+            rhs_func,
+            args,
+            ny,
+            t,
+            progress_interval,
+            _generalized_alpha_parameters(newmark_type, rho_inf),
+            options.get("rtol", 1e-4),
+            options.get("atol", 1e-10),
+            options.get("dt_min", (t[1] - t[0]) * 1e-4),
+            options.get("dt_max", t[1] - t[0]),
+            tol,
+            output,
+        )
+    elif newmark_type == "robust":
         yout = _converge_robust_newmark(
             system_func,
             rhs_func,
@@ -830,6 +1053,8 @@ def newmark(system_func, rhs_func, t, y_size, newmark_type="simple", **options):
             beta,
             epsilon,
             tol,
+            output,
+            options.get("event_tol", 1e-2),
         )
     else:
         yout = _converge_simple_newmark(
@@ -843,8 +1068,12 @@ def newmark(system_func, rhs_func, t, y_size, newmark_type="simple", **options):
             gamma,
             beta,
             tol,
+            output,
         )
 
+    if output is not None:
+        output.flush()
+
     return yout
 
 
@@ -867,55 +1096,169 @@ def _update_newmark(y, ydot, y2dot, dy2dot, gamma, beta, dt):
     return y, ydot, y2dot
 
 
-@njit(fastmath=True)
-def _simple_loop_newmark(
-    y0, ydot0, y2dot0, y, ydot, y2dot, RHS, M, C, K, gamma, beta, dt, tol
+def _is_sparse_system(M, C, K):
+    return issparse(M) or issparse(C) or issparse(K)
+
+
+def _residual_newmark_sparse(RHS, M, C, K, y, ydot, y2dot):
+    return RHS - (M @ y2dot + C @ ydot + K @ y)
+
+
+def _jacobian_newmark_sparse(M, C, K, gamma, beta, dt):
+    return csc_matrix(M + C * gamma * dt + K * beta * (dt**2))
+
+
+def _columns_to_sparse(columns, col_index, shape):
+    rows = np.tile(np.arange(shape[0]), len(col_index))
+    cols = np.repeat(col_index, shape[0])
+
+    return csc_matrix((columns.ravel(order="F"), (rows, cols)), shape=shape)
+
+
+def _tangent_newmark(J0, derivatives, gamma, beta, dt):
+    """Newmark Jacobian with the contribution of the force derivatives."""
+    J = J0 if issparse(J0) else J0.copy()
+
+    for dF, factor in zip(derivatives, (beta * (dt**2), gamma * dt)):
+        if dF is None:
+            continue
+        if issparse(J):
+            J = J - dF * factor
+        elif issparse(dF):
+            dF = dF.tocoo()
+            np.subtract.at(J, (dF.row, dF.col), dF.data * factor)
+        else:
+            J -= dF * factor
+
+    return J
+
+
+def _finite_difference_newmark(
+    rhs_func, RHS, step, y, ydot, y2dot, active_dofs, gamma, beta, dt, epsilon, args
 ):
-    y2dot[:] = 0.0
-    ydot[:] = ydot0 + y2dot0 * (1.0 - gamma) * dt
-    y[:] = y0 + ydot0 * dt + y2dot0 * (0.5 - beta) * (dt**2)
+    """Contribution of the forces to the Newmark Jacobian by finite differences.
 
-    res = _residual_newmark(RHS, M, C, K, y, ydot, y2dot)
-    J = _jacobian_newmark(M, C, K, gamma, beta, dt)
+    Each active dof is perturbed in its acceleration, and the displacement
+    and velocity are updated accordingly.
+    """
+    dJ = np.zeros((len(y), len(active_dofs)))
 
-    nr_iter = 0
+    for k, i in enumerate(active_dofs):
+        y_i, ydot_i, y2dot_i = y[i], ydot[i], y2dot[i]
 
-    while la.norm(res) >= tol:
-        nr_iter += 1
-        if nr_iter > 50:
-            raise RuntimeError(
-                """Newton-Raphson algorithm diverged. Maximum number of iterations reached. 
-                Try decreasing the time step or using robust integration."""
-            )
+        y[i], ydot[i], y2dot[i] = _update_newmark(
+            y[i], ydot[i], y2dot[i], epsilon, gamma, beta, dt
+        )
 
-        dy2dot = la.solve(J, res)
-        y[:], ydot[:], y2dot[:] = _update_newmark(
-            y, ydot, y2dot, dy2dot, gamma, beta, dt
+        F_pert = rhs_func(
+            step,
+            time_step=dt,
+            disp_resp=y,
+            velc_resp=ydot,
+            accl_resp=y2dot,
+            args=args,
         )
 
+        dJ[:, k] = (F_pert - RHS) / epsilon
+
+        y[i], ydot[i], y2dot[i] = y_i, ydot_i, y2dot_i
+
+    return _columns_to_sparse(dJ, active_dofs, (len(y), len(y)))
+
+
+def _factorize(J):
+    """Factorize J and return a function that solves J x = b."""
+    if issparse(J):
+        return splu(csc_matrix(J)).solve
+
+    lu_piv = lu_factor(J)
+    return lambda res: lu_solve(lu_piv, res)
+
+
+def _factorize_newmark(M, C, K, gamma, beta, dt):
+    """Factorize the Newmark Jacobian and return a function that solves J x = b."""
+    if _is_sparse_system(M, C, K):
+        return _factorize(_jacobian_newmark_sparse(M, C, K, gamma, beta, dt))
+
+    return _factorize(_jacobian_newmark(M, C, K, gamma, beta, dt))
+
+
+def _same_matrices(matrices, previous):
+    """Check if the system matrices have the values of the factorized ones."""
+    for A, B in zip(matrices, previous):
+        if B is None or A.shape != B.shape:
+            return False
+        if issparse(A) or issparse(B):
+            if not (issparse(A) and issparse(B)) or (A != B).nnz:
+                return False
+        elif not np.array_equal(A, B):
+            return False
+
+    return True
+
+
+def _low_rank_solve(solve, U, Z, UtZ, d):
+    """Solve (J0 + U @ diag(d) @ U.T) x = b with the factorization of J0.
+
+    The Woodbury identity is used in a form that also holds for singular
+    diag(d), with Z = J0^-1 U and UtZ = U.T Z, so that only a system with the
+    rank of U is solved.
+    """
+    A = np.eye(len(d)) + d[:, np.newaxis] * UtZ
+
+    def low_rank_solve(res):
+        x = solve(res)
+        return x - Z @ la.solve(A, d * (U.T @ x))
+
+    return low_rank_solve
+
+
+def _simple_step_newmark(y0, ydot0, y2dot0, RHS, M, C, K, gamma, beta, dt, tol, solve):
+    y2dot = np.zeros_like(y0)
+    ydot = ydot0 + y2dot0 * (1.0 - gamma) * dt
+    y = y0 + ydot0 * dt + y2dot0 * (0.5 - beta) * (dt**2)
+
+    if _is_sparse_system(M, C, K):
+        res = _residual_newmark_sparse(RHS, M, C, K, y, ydot, y2dot)
+    else:
         res = _residual_newmark(RHS, M, C, K, y, ydot, y2dot)
 
-    y0[:] = y[:]
-    ydot0[:] = ydot[:]
-    y2dot0[:] = y2dot[:]
+    # RHS is fixed during the step, so the system is linear and a single
+    # solution with the Jacobian gives the converged accelerations
+    if la.norm(res) >= tol:
+        y, ydot, y2dot = _update_newmark(y, ydot, y2dot, solve(res), gamma, beta, dt)
 
-    return y0, ydot0, y2dot0
+    return y, ydot, y2dot
 
 
 def _converge_simple_newmark(
-    system_func, rhs_func, args, ny, n_steps, t, progress_interval, gamma, beta, tol
+    system_func,
+    rhs_func,
+    args,
+    ny,
+    n_steps,
+    t,
+    progress_interval,
+    gamma,
+    beta,
+    tol,
+    output=None,
 ):
     y0 = np.zeros(ny)
     ydot0 = np.zeros(ny)
     y2dot0 = np.zeros(ny)
 
-    y = np.zeros(ny)
-    ydot = np.zeros(ny)
-    y2dot = np.zeros(ny)
-
-    yout = np.zeros((n_steps, ny))
+    yout = np.zeros((n_steps, ny)) if output is None else output
     yout[0, :] = y0
 
+    # K = K_ref + U @ diag(coefficient(step)) @ U.T, with U of low rank
+    low_rank = getattr(system_func, "low_rank_stiffness", None)
+
+    # the Jacobian is only factorized again if dt or the matrices change
+    solve = None
+    dt_fact = None
+    matrices_fact = (None, None, None)
+
     for step in range(1, n_steps):
         aux = round(t[step] / progress_interval, 9)
         if aux - int(aux) == 0:
@@ -932,8 +1275,30 @@ def _converge_simple_newmark(
             args=args,
         )
 
-        y0[:], ydot0[:], y2dot0[:] = _simple_loop_newmark(
-            y0, ydot0, y2dot0, y, ydot, y2dot, RHS, M, C, K, gamma, beta, dt, tol
+        matrices = (M, C, K if low_rank is None else low_rank[0])
+
+        if (
+            solve is None
+            or not np.isclose(dt, dt_fact, rtol=1e-9, atol=0.0)
+            or not _same_matrices(matrices, matrices_fact)
+        ):
+            solve = _factorize_newmark(*matrices, gamma, beta, dt)
+            dt_fact = dt
+            matrices_fact = tuple(A.copy() for A in matrices)
+
+            if low_rank is not None:
+                U = low_rank[1]
+                Z = solve(U)
+                UtZ = U.T @ Z
+
+        step_solve = solve
+        if low_rank is not None:
+            step_solve = _low_rank_solve(
+                solve, U, Z, UtZ, low_rank[2](step) * beta * dt**2
+            )
+
+        y0[:], ydot0[:], y2dot0[:] = _simple_step_newmark(
+            y0, ydot0, y2dot0, RHS, M, C, K, gamma, beta, dt, tol, step_solve
         )
 
         yout[step, :] = y0
@@ -941,6 +1306,526 @@ def _converge_simple_newmark(
     return yout
 
 
+class ForceKernel:
+    """Nonlinear force evaluated by a jitted kernel.
+
+    Force kernels let the time integration run entirely in nopython mode
+    (see `newmark_compiled`). A ForceKernel can also be passed as the
+    `add_to_RHS` function of `Rotor.integrate_system`, which uses the compiled
+    loop when possible and calls the kernel from Python otherwise.
+
+    Parameters
+    ----------
+    kernel : callable
+        Function compiled with numba.njit, with signature
+        `kernel(step, y, ydot, params, signal)`, where `y` and `ydot` are the
+        displacements and velocities of `dofs`. It returns the force on `dofs`.
+    dofs : array_like
+        Global degrees of freedom where the force is applied.
+    params : array_like
+        Parameters of the kernel. Kernels with internal state update it in
+        place.
+    signal : array_like
+        Signal with one value for each time step (e.g. speed or angular
+        position).
+    jacobian : callable, optional
+        Function compiled with numba.njit, with the same signature of
+        `kernel`, that returns a tuple `(dF_dy, dF_dydot)` with the derivatives
+        of the force with respect to `y` and `ydot`. If not given, the
+        derivatives are computed by finite differences of the kernel.
+
+    Attributes
+    ----------
+    forces : np.ndarray
+        Force on `dofs` at each time step, with shape (len(dofs), len(signal)).
+
+    Examples
+    --------
+    >>> @njit
+    ... def spring(step, y, ydot, params, signal):
+    ...     return -params[0] * y
+    >>> force = ForceKernel(spring, dofs=[0, 1], params=[1e3], signal=np.zeros(10))
+    >>> force(1, disp_resp=np.ones(4), velc_resp=np.zeros(4))
+    array([-1000., -1000.,     0.,     0.])
+    >>> dF_dy, dF_dydot = force.jacobian(1, disp_resp=np.ones(4), velc_resp=np.zeros(4))
+    >>> np.round(dF_dy.toarray())
+    array([[-1000.,     0.,     0.,     0.],
+           [    0., -1000.,     0.,     0.],
+           [    0.,     0.,     0.,     0.],
+           [    0.,     0.,     0.,     0.]])
+    """
+
+    def __init__(self, kernel, dofs, params, signal, jacobian=None):
+        self.kernel = kernel
+        self.dofs = np.asarray(dofs, dtype=np.int64)
+        self.params = np.asarray(params, dtype=np.float64)
+        self.signal = np.asarray(signal, dtype=np.float64)
+        self.jacobian_kernel = jacobian
+        self.forces = np.zeros((len(self.dofs), len(self.signal)))
+
+    def __call__(self, step, **state):
+        disp_resp = state.get("disp_resp")
+        velc_resp = state.get("velc_resp")
+
+        f = self.kernel(
+            step, disp_resp[self.dofs], velc_resp[self.dofs], self.params, self.signal
+        )
+        self.forces[:, step] = f
+
+        F = np.zeros(len(disp_resp))
+        F[self.dofs] = f
+
+        return F
+
+    def jacobian(self, step, **state):
+        """Derivatives of the force with respect to the displacements and velocities.
+
+        The kernel is evaluated with a copy of the parameters, so that its
+        internal state is not changed. The derivatives are returned as sparse
+        matrices with the size of the state vector, following the `jacobian`
+        protocol of the `rhs_func` argument of `newmark`.
+        """
+        disp_resp = state.get("disp_resp")
+        velc_resp = state.get("velc_resp")
+
+        y = np.array(disp_resp[self.dofs], dtype=np.float64)
+        ydot = np.array(velc_resp[self.dofs], dtype=np.float64)
+
+        if self.jacobian_kernel is not None:
+            dF_dy, dF_dydot = self.jacobian_kernel(
+                step, y, ydot, self.params.copy(), self.signal
+            )
+        else:
+            dF_dy, dF_dydot = self._finite_difference(step, y, ydot)
+
+        n = len(self.dofs)
+        rows = np.repeat(self.dofs, n)
+        cols = np.tile(self.dofs, n)
+        shape = (len(disp_resp), len(disp_resp))
+
+        return (
+            coo_matrix((np.ravel(dF_dy), (rows, cols)), shape=shape),
+            coo_matrix((np.ravel(dF_dydot), (rows, cols)), shape=shape),
+        )
+
+    def _finite_difference(self, step, y, ydot):
+        """Derivatives of the kernel by forward differences on its own dofs."""
+        f0 = self.kernel(step, y, ydot, self.params.copy(), self.signal)
+
+        derivatives = []
+        for x in (y, ydot):
+            dF_dx = np.zeros((len(f0), len(x)))
+            h = np.sqrt(np.finfo(float).eps) * np.maximum(np.abs(x), 1e-6)
+
+            for i in range(len(x)):
+                x_i = x[i]
+                x[i] += h[i]
+                f = self.kernel(step, y, ydot, self.params.copy(), self.signal)
+                dF_dx[:, i] = (f - f0) / h[i]
+                x[i] = x_i
+
+            derivatives.append(dF_dx)
+
+        return derivatives
+
+
+@njit
+def _no_force(step, y, ydot, params, signal):
+    return np.zeros(0)
+
+
+def newmark_compiled(
+    M, C1, C2, K1, K2, speed, accel, F, t, force_kernel=None, T=None, **options
+):
+    """Transient solution with the Newmark method compiled in nopython mode.
+
+    Integrate the equation of motion
+    M * y'' + (C1 + speed * C2) * y' + (K1 + accel * K2) * y = F(t) + T^T f(T y)
+    where f is an optional nonlinear force kernel. As in the simple Newmark
+    method, the right-hand side of each step is computed with the state of
+    the previous step. The Jacobian is inverted again only when the time step
+    or the speed changes.
+
+    Parameters
+    ----------
+    M, C1, C2, K1, K2 : np.ndarray
+        Dense system matrices.
+    speed : float or array_like
+        Speed that multiplies C2, constant or one value for each time step.
+    accel : float or array_like
+        Acceleration that multiplies K2, constant or one value for each time
+        step.
+    F : np.ndarray
+        Force array with shape (len(t), y_size).
+    t : array_like
+        Time array.
+    force_kernel : ross.utils.ForceKernel, optional
+        Nonlinear force. Its `forces` attribute is filled with the force at
+        each time step. Default is None.
+    T : np.ndarray, optional
+        Matrix with shape (len(force_kernel.dofs), y_size) that maps the state
+        vector to the degrees of freedom of the force kernel. Default is the
+        rows of the identity matrix of the force kernel dofs.
+    **options
+        gamma, beta, tol and output, as in `newmark`.
+
+    Returns
+    -------
+    yout : ndarray or TimeResponseStore
+        System response, with `np.shape(yout) = (len(t), y_size)`, or the
+        `output` store if given.
+
+    Examples
+    --------
+    >>> import ross as rs
+    >>> rotor = rs.rotor_example()
+    >>> t = np.linspace(0, 1, 1001)
+    >>> F = np.zeros((len(t), rotor.ndof))
+    >>> F[:, 18] = 10 * np.cos(100 * t)
+    >>> M, K, C = rotor.M(), rotor.K(0), rotor.C(0)
+    >>> G, Ksdt = rotor.G(), rotor.Ksdt()
+    >>> yout = newmark_compiled(M, C, G, K, Ksdt, 100.0, 0.0, F, t)
+    >>> system_func = lambda i, **state: (M, C + 100.0 * G, K, F[i])
+    >>> np.allclose(yout, newmark(system_func, None, t, rotor.ndof))
+    True
+    """
+    gamma = options.get("gamma", 0.5)
+    beta = options.get("beta", 0.25)
+    tol = options.get("tol", 1e-6)
+
+    t = np.asarray(t, dtype=np.float64)
+    speed = np.broadcast_to(np.asarray(speed, dtype=np.float64), t.shape).copy()
+    accel = np.broadcast_to(np.asarray(accel, dtype=np.float64), t.shape).copy()
+    matrices = [np.ascontiguousarray(A, dtype=np.float64) for A in (M, C1, C2, K1, K2)]
+    F = np.ascontiguousarray(F, dtype=np.float64)
+
+    if force_kernel is None:
+        kernel, params, signal = _no_force, np.zeros(0), np.zeros(0)
+        T = np.zeros((0, len(M)))
+        forces = np.zeros((0, len(t)))
+    else:
+        kernel = force_kernel.kernel
+        params, signal = force_kernel.params, force_kernel.signal
+        if T is None:
+            T = np.eye(len(M))[force_kernel.dofs]
+        forces = force_kernel.forces
+
+    T = np.ascontiguousarray(T, dtype=np.float64)
+    Tt = np.ascontiguousarray(T.T)
+
+    n_steps, ny = F.shape
+    output = options.get("output")
+    chunk_size = n_steps if output is None else output.chunk_size
+
+    # state of the integration carried from one chunk to the next one,
+    # fact holds the time step, speed and acceleration of J_inv
+    state = (np.zeros(ny), np.zeros(ny), np.zeros(ny))
+    J_inv = np.zeros((ny, ny))
+    fact = np.array([0.0, speed[0], accel[0]])
+
+    for start in range(0, n_steps, chunk_size):
+        yout = np.zeros((min(chunk_size, n_steps - start), ny))
+        _newmark_loop_compiled(
+            *matrices,
+            speed,
+            accel,
+            F,
+            t,
+            gamma,
+            beta,
+            tol,
+            kernel,
+            params,
+            signal,
+            T,
+            Tt,
+            forces,
+            *state,
+            J_inv,
+            fact,
+            start,
+            yout,
+        )
+
+        if output is None:
+            return yout
+
+        output[start : start + len(yout)] = yout
+
+    output.flush()
+
+    return output
+
+
+@njit(fastmath=True)
+def _newmark_loop_compiled(
+    M,
+    C1,
+    C2,
+    K1,
+    K2,
+    speed,
+    accel,
+    F,
+    t,
+    gamma,
+    beta,
+    tol,
+    kernel,
+    params,
+    signal,
+    T,
+    Tt,
+    forces,
+    y0,
+    ydot0,
+    y2dot0,
+    J_inv,
+    fact,
+    start,
+    yout,
+):
+    """Integrate the time steps from start to start + len(yout).
+
+    The state y0, ydot0, y2dot0, the inverse of the Jacobian J_inv and its
+    time step, speed and acceleration in fact are updated in place, so that
+    the integration can continue in the next call. A time step of zero in
+    fact forces the inversion of the Jacobian.
+    """
+    ny = len(y0)
+
+    C = C1 + C2 * fact[1]
+    K = K1 + K2 * fact[2]
+
+    if start == 0:
+        yout[0, :] = y0
+
+    for step in range(max(start, 1), start + len(yout)):
+        dt = t[step] - t[step - 1]
+
+        changed_matrices = speed[step] != fact[1] or accel[step] != fact[2]
+        if changed_matrices:
+            C = C1 + C2 * speed[step]
+            K = K1 + K2 * accel[step]
+            fact[1] = speed[step]
+            fact[2] = accel[step]
+
+        if changed_matrices or abs(dt - fact[0]) > 1e-9 * abs(dt):
+            J = _jacobian_newmark(M, C, K, gamma, beta, dt)
+            J_inv[:] = np.linalg.inv(J)
+            fact[0] = dt
+
+        RHS = F[step].copy()
+        if T.shape[0]:
+            f = kernel(step, T @ y0, T @ ydot0, params, signal)
+            forces[:, step] = f
+            RHS += Tt @ f
+
+        y2dot = np.zeros(ny)
+        ydot = ydot0 + y2dot0 * (1.0 - gamma) * dt
+        y = y0 + ydot0 * dt + y2dot0 * (0.5 - beta) * (dt**2)
+
+        res = _residual_newmark(RHS, M, C, K, y, ydot, y2dot)
+        if la.norm(res) >= tol:
+            y, ydot, y2dot = _update_newmark(
+                y, ydot, y2dot, J_inv @ res, gamma, beta, dt
+            )
+
+        y0[:] = y
+        ydot0[:] = ydot
+        y2dot0[:] = y2dot
+        yout[step - start, :] = y
+
+
+def newmark_ensemble(
+    M, C, K, F, t, gamma=0.5, beta=0.25, return_velocity=False, X0=None
+):
+    """Transient solution of an ensemble of linear systems with the Newmark method.
+
+    Integrate B independent systems with the same number of degrees of freedom
+    M_b * y_b'' + C_b * y_b' + K_b * y_b = F_b(t), b = 0, ..., B - 1
+    advancing all of them together, with state arrays shaped (B, y_size).
+    The Jacobians of the ensemble are inverted in a single batched call, and
+    again only when the time step changes, so that each time step costs a few
+    stacked matrix products instead of one Python iteration per system.
+
+    Parameters
+    ----------
+    M, C, K : np.ndarray
+        Dense system matrices with shape (B, y_size, y_size), or
+        (y_size, y_size) if they are the same for all systems.
+    F : np.ndarray
+        Force array with shape (B, len(t), y_size).
+    t : array_like
+        Time array.
+    gamma, beta : float, optional
+        Parameters of the Newmark method, as in `newmark`. Default is 0.5
+        and 0.25.
+    return_velocity : bool, optional
+        If True, the velocities are also returned. Default is False.
+    X0 : np.ndarray, optional
+        Initial displacements followed by the initial velocities, with shape
+        (2 * y_size,) or (B, 2 * y_size). The initial accelerations are then
+        in equilibrium with the forces at t[0]. Default is zero.
+
+    Returns
+    -------
+    yout : np.ndarray
+        System responses, with `np.shape(yout) = (B, len(t), y_size)`.
+    ydout : np.ndarray
+        Velocities, with the same shape of yout, if `return_velocity` is True.
+
+    Examples
+    --------
+    >>> import ross as rs
+    >>> rotor = rs.rotor_example()
+    >>> t = np.linspace(0, 1, 1001)
+    >>> F = np.zeros((2, len(t), rotor.ndof))
+    >>> F[:, :, 18] = np.array([[10.0], [20.0]]) * np.cos(100 * t)
+    >>> M, C, K = rotor.M(), rotor.C(100.0) + 100.0 * rotor.G(), rotor.K(100.0)
+    >>> yout = newmark_ensemble(M, C, K, F, t)
+    >>> system_func = lambda i, **state: (M, C, K, F[1, i])
+    >>> np.allclose(yout[1], newmark(system_func, None, t, rotor.ndof))
+    True
+    """
+    F = np.asarray(F, dtype=float)
+    n_cases, n_steps, ny = F.shape
+    M, C, K = (np.asarray(A, dtype=float) for A in (M, C, K))
+
+    y0 = np.zeros((n_cases, ny))
+    ydot0 = np.zeros((n_cases, ny))
+    y2dot0 = np.zeros((n_cases, ny))
+
+    if X0 is not None:
+        X0 = np.broadcast_to(np.asarray(X0, dtype=float), (n_cases, 2 * ny))
+        y0 = X0[:, :ny].copy()
+        ydot0 = X0[:, ny:].copy()
+
+        res = F[:, 0] - (C @ ydot0[..., None] + K @ y0[..., None])[..., 0]
+        y2dot0 = np.linalg.solve(M, res[..., None])[..., 0]
+
+    yout = np.zeros((n_cases, n_steps, ny))
+    ydout = np.zeros((n_cases, n_steps, ny))
+    yout[:, 0] = y0
+    ydout[:, 0] = ydot0
+
+    # the Jacobians are only inverted again if dt changes
+    J_inv = None
+    dt_fact = 0.0
+
+    for step in range(1, n_steps):
+        dt = t[step] - t[step - 1]
+
+        if J_inv is None or abs(dt - dt_fact) > 1e-9 * abs(dt):
+            J_inv = np.linalg.inv(_jacobian_newmark(M, C, K, gamma, beta, dt))
+            dt_fact = dt
+
+        ydot = ydot0 + y2dot0 * (1.0 - gamma) * dt
+        y = y0 + ydot0 * dt + y2dot0 * (0.5 - beta) * (dt**2)
+
+        res = F[:, step] - (C @ ydot[..., None] + K @ y[..., None])[..., 0]
+        y2dot = (J_inv @ res[..., None])[..., 0]
+
+        y0 = y + y2dot * beta * (dt**2)
+        ydot0 = ydot + y2dot * gamma * dt
+        y2dot0 = y2dot
+
+        yout[:, step] = y0
+        ydout[:, step] = ydot0
+
+    if return_velocity:
+        return yout, ydout
+
+    return yout
+
+
+def lsim_ensemble(A, B, C, D, U, t, X0=None):
+    """Simulate an ensemble of continuous-time linear systems.
+
+    Batched counterpart of `scipy.signal.lsim` for B independent state-space
+    systems of the same size. As in `lsim`, the input is linearly
+    interpolated between time steps and the systems are discretized exactly
+    with the matrix exponential, here computed for all systems in a single
+    call. The inputs are mapped to the states with stacked matrix products
+    over all time steps, so only the recursion of the states is left in the
+    time loop.
+
+    Parameters
+    ----------
+    A, B, C, D : np.ndarray
+        State-space matrices with shape (B, n, m) or (n, m) if they are the
+        same for all systems.
+    U : np.ndarray
+        Input array with shape (B, len(t), n_inputs).
+    t : array_like
+        Time array. It must be equally spaced.
+    X0 : np.ndarray, optional
+        Initial states with shape (n_states,) or (B, n_states). Default is
+        zero.
+
+    Returns
+    -------
+    t : np.ndarray
+        Time values for the output.
+    yout : np.ndarray
+        Systems responses, with shape (B, len(t), n_outputs).
+    xout : np.ndarray
+        Time evolution of the state vectors, with shape
+        (B, len(t), n_states).
+
+    Examples
+    --------
+    >>> import ross as rs
+    >>> from scipy import signal
+    >>> rotor = rs.rotor_example()
+    >>> lti = rotor._lti(100.0)
+    >>> t = np.linspace(0, 0.1, 101)
+    >>> U = np.zeros((2, len(t), rotor.ndof))
+    >>> U[:, :, 18] = np.array([[10.0], [20.0]]) * np.cos(100 * t)
+    >>> t_, yout, xout = lsim_ensemble(lti.A, lti.B, lti.C, lti.D, U, t)
+    >>> np.allclose(yout[1], signal.lsim(lti, U[1], t)[1])
+    True
+    """
+    t = np.asarray(t, dtype=float)
+    U = np.asarray(U, dtype=float)
+    n_cases, n_steps, n_inputs = U.shape
+
+    A = np.broadcast_to(A, (n_cases,) + np.shape(A)[-2:])
+    B = np.broadcast_to(B, (n_cases,) + np.shape(B)[-2:])
+    n_states = A.shape[-1]
+
+    xout = np.zeros((n_cases, n_steps, n_states))
+    if X0 is not None:
+        xout[:, 0] = X0
+
+    if n_steps > 1:
+        dt = t[1] - t[0]
+        if not np.allclose(np.diff(t), dt):
+            raise ValueError("Time steps are not equally spaced.")
+
+        # exact discretization with linear interpolation of the input:
+        # exp([[A dt, B dt, 0], [0, 0, I], [0, 0, 0]])
+        size = n_states + 2 * n_inputs
+        Ms = np.zeros((n_cases, size, size))
+        Ms[:, :n_states, :n_states] = A * dt
+        Ms[:, :n_states, n_states : n_states + n_inputs] = B * dt
+        Ms[:, n_states : n_states + n_inputs, n_states + n_inputs :] = np.eye(n_inputs)
+
+        expMT = expm(np.swapaxes(Ms, 1, 2))
+        Ad = expMT[:, :n_states, :n_states]
+        Bd1 = expMT[:, n_states + n_inputs :, :n_states]
+        Bd0 = expMT[:, n_states : n_states + n_inputs, :n_states] - Bd1
+
+        Ux = U[:, :-1] @ Bd0 + U[:, 1:] @ Bd1
+
+        for step in range(1, n_steps):
+            xout[:, step] = (xout[:, step - 1, None] @ Ad)[:, 0] + Ux[:, step - 1]
+
+    yout = xout @ np.swapaxes(C, -1, -2) + U @ np.swapaxes(D, -1, -2)
+
+    return t, yout, xout
+
+
 def _converge_robust_newmark(
     system_func,
     rhs_func,
@@ -953,16 +1838,30 @@ def _converge_robust_newmark(
     beta,
     epsilon,
     tol,
+    output=None,
+    event_tol=1e-2,
 ):
+    """Robust Newmark integration with Newton-Raphson iterations.
+
+    The time steps of `t` are split in sub-steps whose size is controlled by
+    the number of iterations. If `rhs_func` has an `event` attribute, the
+    sub-steps are also halved where the sign of the event changes, until they
+    are smaller than `event_tol` times the time step, and `rhs_func` is called
+    with the `time` of the sub-step. The other Newmark methods do not refine
+    the steps at events and ignore the `event` attribute.
+    """
     y0 = np.zeros(ny)
     ydot0 = np.zeros(ny)
     y2dot0 = np.zeros(ny)
 
+    # sign changes of the event function are located by halving the sub-steps
+    event = getattr(rhs_func, "event", None)
+
     y = np.zeros(ny)
     ydot = np.zeros(ny)
     y2dot = np.zeros(ny)
 
-    yout = np.zeros((n_steps, ny))
+    yout = np.zeros((n_steps, ny)) if output is None else output
     yout[0, :] = y0
 
     for step in range(1, n_steps):
@@ -986,13 +1885,25 @@ def _converge_robust_newmark(
             args=args,
         )
         active_dofs = np.where(RHS != 0)[0]
+        force_jacobian = getattr(rhs_func, "jacobian", None)
+
+        sparse_system = _is_sparse_system(M, C, K)
+        if sparse_system:
+            residual = _residual_newmark_sparse
+            jacobian = _jacobian_newmark_sparse
+        else:
+            residual = _residual_newmark
+            jacobian = _jacobian_newmark
+
+        while t_target - t_curr > 1e-9 * dt_min:
+            # forces with events are evaluated at the time of the sub-step
+            rhs = rhs_func if event is None else partial(rhs_func, time=t_curr + dt)
 
-        while t_curr < t_target:
             y2dot[:] = 0.0
             ydot[:] = ydot0 + y2dot0 * (1.0 - gamma) * dt
             y[:] = y0 + ydot0 * dt + y2dot0 * (0.5 - beta) * (dt**2)
 
-            RHS = rhs_func(
+            RHS = rhs(
                 step,
                 time_step=dt,
                 disp_resp=y,
@@ -1001,49 +1912,66 @@ def _converge_robust_newmark(
                 args=args,
             )
 
-            res = _residual_newmark(RHS, M, C, K, y, ydot, y2dot)
-            J0 = _jacobian_newmark(M, C, K, gamma, beta, dt)
+            res = residual(RHS, M, C, K, y, ydot, y2dot)
+            res_norm = la.norm(res)
+            J0 = jacobian(M, C, K, gamma, beta, dt)
+            dJ = None
+            solve = None
 
             nr_iter = 0
             converged = True
 
-            while la.norm(res) >= tol:
+            while res_norm >= tol:
                 nr_iter += 1
 
                 if nr_iter > 15:
                     converged = False
                     break
 
-                # Update Jacobian with perturbation
-                F_base = RHS
-                J = J0.copy()
-
-                for i in active_dofs:
-                    y_i, ydot_i, y2dot_i = y[i], ydot[i], y2dot[i]
-
-                    y[i], ydot[i], y2dot[i] = _update_newmark(
-                        y[i], ydot[i], y2dot[i], epsilon, gamma, beta, dt
+                if force_jacobian is not None:
+                    J = _tangent_newmark(
+                        J0,
+                        force_jacobian(
+                            step,
+                            time_step=dt,
+                            disp_resp=y,
+                            velc_resp=ydot,
+                            accl_resp=y2dot,
+                            args=args,
+                        ),
+                        gamma,
+                        beta,
+                        dt,
                     )
-
-                    F_pert = rhs_func(
+                    solve = _factorize(J)
+
+                elif dJ is None:
+                    # finite differences are evaluated once per step and the
+                    # factorization is reused by the next iterations, while
+                    # they reduce the residual
+                    dJ = _finite_difference_newmark(
+                        rhs,
+                        RHS,
                         step,
-                        time_step=dt,
-                        disp_resp=y,
-                        velc_resp=ydot,
-                        accl_resp=y2dot,
-                        args=args,
+                        y,
+                        ydot,
+                        y2dot,
+                        active_dofs,
+                        gamma,
+                        beta,
+                        dt,
+                        epsilon,
+                        args,
                     )
+                    solve = _factorize(J0 - dJ if sparse_system else J0 - dJ.toarray())
 
-                    J[:, i] -= (F_pert - F_base) / epsilon
-
-                    y[i], ydot[i], y2dot[i] = y_i, ydot_i, y2dot_i
+                dy2dot = solve(res)
 
-                dy2dot = la.solve(J, res)
                 y[:], ydot[:], y2dot[:] = _update_newmark(
                     y, ydot, y2dot, dy2dot, gamma, beta, dt
                 )
 
-                RHS = rhs_func(
+                RHS = rhs(
                     step,
                     time_step=dt,
                     disp_resp=y,
@@ -1051,7 +1979,21 @@ def _converge_robust_newmark(
                     accl_resp=y2dot,
                     args=args,
                 )
-                res = _residual_newmark(RHS, M, C, K, y, ydot, y2dot)
+                res = residual(RHS, M, C, K, y, ydot, y2dot)
+
+                res_norm_prev, res_norm = res_norm, la.norm(res)
+                if res_norm >= res_norm_prev:
+                    # the frozen Jacobian stalled, it is rebuilt at this state
+                    dJ = None
+
+            if converged and event is not None and dt > event_tol * dt_max:
+                state = dict(time_step=dt, accl_resp=y2dot, args=args)
+                g0 = event(step, disp_resp=y0, velc_resp=ydot0, time=t_curr, **state)
+                g = event(step, disp_resp=y, velc_resp=ydot, time=t_curr + dt, **state)
+
+                if np.sign(g) != np.sign(g0):
+                    dt *= 0.5
+                    continue
 
             if converged:
                 y0[:] = y[:]
@@ -1063,6 +2005,9 @@ def _converge_robust_newmark(
                     dt = min(dt * 2.0, dt_max)
                 elif nr_iter >= 10:
                     dt = max(dt * 0.5, dt_min)
+
+                # the sub-steps end exactly at the time of the grid point
+                dt = min(dt, t_target - t_curr)
             else:
                 dt *= 0.25
                 if dt < dt_min:
@@ -1077,6 +2022,274 @@ def _converge_robust_newmark(
     return yout
 
 
+def _generalized_alpha_parameters(method, rho_inf):
+    """Parameters alpha_m, alpha_f, gamma and beta of the alpha methods.
+
+    References
+    ----------
+    Chung, J., Hulbert, G. M. (1993). A time integration algorithm for
+    structural dynamics with improved numerical dissipation: the
+    generalized-alpha method. Journal of Applied Mechanics, 60(2), 371-375.
+
+    Hilber, H. M., Hughes, T. J. R., Taylor, R. L. (1977). Improved numerical
+    dissipation for time integration algorithms in structural dynamics.
+    Earthquake Engineering & Structural Dynamics, 5(3), 283-292.
+    """
+    if method == "hht":
+        if not 0.5 <= rho_inf <= 1:
+            raise ValueError("rho_inf must be between 0.5 and 1 for the HHT method.")
+        alpha_m = 0.0
+        alpha_f = (1 - rho_inf) / (1 + rho_inf)
+    else:
+        if not 0 <= rho_inf <= 1:
+            raise ValueError("rho_inf must be between 0 and 1.")
+        alpha_m = (2 * rho_inf - 1) / (rho_inf + 1)
+        alpha_f = rho_inf / (rho_inf + 1)
+
+    gamma = 0.5 - alpha_m + alpha_f
+    beta = 0.25 * (1 - alpha_m + alpha_f) ** 2
+
+    return alpha_m, alpha_f, gamma, beta
+
+
+def _hermite_interpolation(s, h, y0, ydot0, y1, ydot1):
+    """Cubic Hermite interpolation of the displacements inside a time step."""
+    s = s[:, np.newaxis]
+    return (
+        (2 * s**3 - 3 * s**2 + 1) * y0
+        + (s**3 - 2 * s**2 + s) * h * ydot0
+        + (3 * s**2 - 2 * s**3) * y1
+        + (s**3 - s**2) * h * ydot1
+    )
+
+
+def _forces_change(force_sample, t, start, end, rtol):
+    """Check if the forces inside a range of the grid are not linear in time.
+
+    Parameters
+    ----------
+    force_sample : callable
+        Function of the index of a point of the grid returning the force.
+    t : np.ndarray
+        Time array.
+    start, end : int
+        Indices of the points of the grid at the ends of the range.
+    rtol : float
+        Tolerance relative to the largest force in the range.
+
+    Returns
+    -------
+    bool
+        True if the force at any point differs from the linear interpolation
+        of the forces at the ends of the range.
+    """
+    forces = np.array([force_sample(i) for i in range(start, end + 1)])
+    s = ((t[start : end + 1] - t[start]) / (t[end] - t[start]))[:, np.newaxis]
+    linear = (1 - s) * forces[0] + s * forces[-1]
+
+    return np.abs(forces - linear).max() > rtol * np.abs(forces).max()
+
+
+def _converge_generalized_alpha(
+    system_func,
+    rhs_func,
+    args,
+    ny,
+    t,
+    progress_interval,
+    parameters,
+    rtol,
+    atol,
+    dt_min,
+    dt_max,
+    tol,
+    output=None,
+):
+    alpha_m, alpha_f, gamma, beta = parameters
+
+    # J = (1 - alpha_m) * (M + gamma_J * dt * C + beta_J * dt**2 * K)
+    gamma_J = (1 - alpha_f) * gamma / (1 - alpha_m)
+    beta_J = (1 - alpha_f) * beta / (1 - alpha_m)
+
+    # local truncation error of the displacements: (beta - 1/6) dt² (a1 - a0)
+    error_coeff = abs(beta - 1 / 6)
+
+    n_steps = len(t)
+    t_eps = 1e-9 * (t[-1] - t[0])
+
+    y0 = np.zeros(ny)
+    ydot0 = np.zeros(ny)
+    y2dot0 = np.zeros(ny)
+
+    yout = np.zeros((n_steps, ny)) if output is None else output
+    yout[0, :] = y0
+
+    dt = t[1] - t[0]
+
+    # consistent initial acceleration
+    M, C, K, RHS0 = system_func(
+        0, time_step=dt, disp_resp=y0, velc_resp=ydot0, accl_resp=y2dot0, args=args
+    )
+    if la.norm(RHS0) >= tol:
+        y2dot0[:] = _factorize_newmark(M, C, K, 0.0, 0.0, 0.0)(RHS0)
+
+    solve = None
+    dt_fact = None
+    matrices_fact = (None, None, None)
+
+    t_curr = t[0]
+    next_out = 1
+
+    def force_sample(step):
+        """Force of a point of the grid at the state of the start of the step."""
+        state = dict(
+            time_step=dt, disp_resp=y0, velc_resp=ydot0, accl_resp=y2dot0, args=args
+        )
+        if rhs_func is not None:
+            return rhs_func(step, **state)
+        return system_func(step, **state)[3]
+
+    while next_out < n_steps:
+        # steps that reach the grid end on its last point inside the step;
+        # shorter steps use the forces of the next point of the grid
+        k = np.searchsorted(t, t_curr + dt + t_eps, side="right") - 1
+        if t[k] > t_curr + t_eps:
+            # the forces are only read at the end of the steps, so a step
+            # does not cross points of the grid where the force changes
+            first = np.searchsorted(t, t_curr + t_eps, side="right")
+            if k > first and _forces_change(force_sample, t, first - 1, k, rtol):
+                k = first
+                dt = t[k] - t_curr
+            t_new = t[k]
+            step = k
+        else:
+            t_new = t_curr + dt
+            step = k + 1
+        h = t_new - t_curr
+
+        M, C, K, RHS = system_func(
+            step,
+            time_step=h,
+            disp_resp=y0,
+            velc_resp=ydot0,
+            accl_resp=y2dot0,
+            args=args,
+        )
+
+        if (
+            solve is None
+            or not np.isclose(h, dt_fact, rtol=1e-9, atol=0.0)
+            or not _same_matrices((M, C, K), matrices_fact)
+        ):
+            solve = _factorize_newmark(M, C, K, gamma_J, beta_J, h)
+            dt_fact = h
+            matrices_fact = (M.copy(), C.copy(), K.copy())
+
+        y2dot = y2dot0.copy()
+        ydot = ydot0 + h * ((1 - gamma) * y2dot0 + gamma * y2dot)
+        y = y0 + h * ydot0 + h**2 * ((0.5 - beta) * y2dot0 + beta * y2dot)
+
+        converged = False
+        for nr_iter in range(15):
+            res = (1 - alpha_f) * RHS + alpha_f * RHS0
+            res -= M @ ((1 - alpha_m) * y2dot + alpha_m * y2dot0)
+            res -= C @ ((1 - alpha_f) * ydot + alpha_f * ydot0)
+            res -= K @ ((1 - alpha_f) * y + alpha_f * y0)
+
+            if la.norm(res) < tol and nr_iter:
+                converged = True
+                break
+
+            dy2dot = solve(res) / (1 - alpha_m)
+            y2dot += dy2dot
+            ydot += gamma * h * dy2dot
+            y += beta * h**2 * dy2dot
+
+            if rhs_func is not None:
+                RHS = rhs_func(
+                    step,
+                    time_step=h,
+                    disp_resp=y,
+                    velc_resp=ydot,
+                    accl_resp=y2dot,
+                    args=args,
+                )
+
+        if converged:
+            scale = atol + rtol * np.maximum(np.abs(y), np.abs(y0))
+            error = error_coeff * h**2 * (y2dot - y2dot0) / scale
+            error = np.sqrt(np.mean(error**2))
+            factor = 0.9 * error ** (-1 / 3) if error > 0 else 5.0
+        else:
+            error = np.inf
+            factor = 0.25
+
+        if error > 1 and h > dt_min * (1 + 1e-9):
+            dt = max(h * max(factor, 0.2), dt_min)
+            continue
+        elif not converged:
+            raise RuntimeError(
+                f"Time step dropped below minimum threshold ({dt_min}) without convergence."
+            )
+
+        # dense output at the points of the grid inside the step
+        last_out = np.searchsorted(t, t_new + t_eps, side="right")
+        if last_out > next_out:
+            s = (t[next_out:last_out] - t_curr) / h
+            yout[next_out:last_out, :] = _hermite_interpolation(
+                s, h, y0, ydot0, y, ydot
+            )
+
+            for i in range(next_out, last_out):
+                aux = round(t[i] / progress_interval, 9)
+                if aux - int(aux) == 0:
+                    print("Time: ", t[i], " seconds")
+
+            next_out = last_out
+
+        y0, ydot0, y2dot0, RHS0 = y, ydot, y2dot, RHS
+        t_curr = t_new
+
+        # small changes of the time step are not worth a new factorization
+        if factor < 1 or factor >= 1.5:
+            dt = dt * min(factor, 5.0)
+        dt = min(max(dt, dt_min), dt_max)
+
+    return yout
+
+
+def mac_matrix(u, v):
+    """Modal assurance criterion between two sets of mode shapes.
+
+    The MAC of every pair of columns of `u` and `v` is computed at once:
+    MAC[i, j] = |u_i^H v_j|^2 / ((u_i^H u_i) (v_j^H v_j)).
+
+    Parameters
+    ----------
+    u : np.ndarray
+        Array with one mode shape per column, with shape (n, n_u).
+    v : np.ndarray
+        Array with one mode shape per column, with shape (n, n_v).
+
+    Returns
+    -------
+    mac : np.ndarray
+        MAC values with shape (n_u, n_v).
+
+    Examples
+    --------
+    >>> u = np.array([[1, 0], [0, 1j]])
+    >>> mac_matrix(u, u)
+    array([[1., 0.],
+           [0., 1.]])
+    """
+    uv = u.conj().T @ v
+    uu = np.einsum("ij,ij->j", u.conj(), u).real
+    vv = np.einsum("ij,ij->j", v.conj(), v).real
+
+    return np.abs(uv) ** 2 / np.outer(uu, vv)
+
+
 def make_speed_array(speed, t):
     """Make speed, displacement and acceleration arrays from speed and time array.
 
@@ -1177,7 +2390,7 @@ def remove_dofs(matrix, dofs=None):
 
     Parameters
     ----------
-    matrix: ndarray
+    matrix: ndarray or scipy.sparse matrix
         The original matrix to process.
     dofs: list
         List of indices representing dofs to be removed. Default is None, but internally it considers
@@ -1185,8 +2398,9 @@ def remove_dofs(matrix, dofs=None):
 
     Returns
     -------
-    new_matrix: ndarray
-        The modified matrix with the removed dofs.
+    new_matrix: ndarray or scipy.sparse matrix
+        The modified matrix with the removed dofs. Sparse matrices are
+        returned in CSR format.
 
     Examples
     --------
@@ -1205,7 +2419,11 @@ def remove_dofs(matrix, dofs=None):
     True
     """
     if dofs is None:
-        dofs = np.arange(2, len(matrix), 3)
+        dofs = np.arange(2, matrix.shape[0], 3)
+
+    if issparse(matrix):
+        keep = np.setdiff1d(np.arange(matrix.shape[0]), dofs)
+        return matrix.tocsr()[keep][:, keep]
 
     new_matrix = np.delete(np.delete(matrix, dofs, axis=0), dofs, axis=1)
 
@@ -1249,13 +2467,17 @@ def convert_6dof_to_4dof(rotor):
     new_rotor = copy(rotor)
 
     # Modify matrix methods to get 4 dof matrices
-    new_rotor.M = lambda frequency=None, synchronous=False: remove_dofs(
-        rotor.M(frequency=frequency, synchronous=synchronous)
+    new_rotor.M = lambda frequency=None, synchronous=False, sparse=False: remove_dofs(
+        rotor.M(frequency=frequency, synchronous=synchronous, sparse=sparse)
+    )
+    new_rotor.K = lambda frequency, sparse=False: remove_dofs(
+        rotor.K(frequency, sparse=sparse)
+    )
+    new_rotor.Ksdt = lambda sparse=False: remove_dofs(rotor.Ksdt(sparse=sparse))
+    new_rotor.C = lambda frequency, sparse=False: remove_dofs(
+        rotor.C(frequency, sparse=sparse)
     )
-    new_rotor.K = lambda frequency: remove_dofs(rotor.K(frequency))
-    new_rotor.Ksdt = lambda: remove_dofs(rotor.Ksdt())
-    new_rotor.C = lambda frequency: remove_dofs(rotor.C(frequency))
-    new_rotor.G = lambda: remove_dofs(rotor.G())
+    new_rotor.G = lambda sparse=False: remove_dofs(rotor.G(sparse=sparse))
 
     # Because of lru_cache, we need to unwrap the methods
     new_rotor.run_modal = new_rotor.run_modal.__wrapped__
@@ -1313,13 +2535,17 @@ def convert_6dof_to_torsional(rotor):
     dofs = [i for i in range(rotor.ndof) if (i - 5) % 6 != 0 or i < 5]
 
     # Modify matrix methods to get 1 (torsional only) dof matrices
-    new_rotor.M = lambda frequency=None, synchronous=False: remove_dofs(
-        rotor.M(frequency=frequency, synchronous=synchronous), dofs
+    new_rotor.M = lambda frequency=None, synchronous=False, sparse=False: remove_dofs(
+        rotor.M(frequency=frequency, synchronous=synchronous, sparse=sparse), dofs
+    )
+    new_rotor.K = lambda frequency, sparse=False: remove_dofs(
+        rotor.K(frequency, sparse=sparse), dofs
+    )
+    new_rotor.Ksdt = lambda sparse=False: remove_dofs(rotor.Ksdt(sparse=sparse), dofs)
+    new_rotor.C = lambda frequency, sparse=False: remove_dofs(
+        rotor.C(frequency, sparse=sparse), dofs
     )
-    new_rotor.K = lambda frequency: remove_dofs(rotor.K(frequency), dofs)
-    new_rotor.Ksdt = lambda: remove_dofs(rotor.Ksdt(), dofs)
-    new_rotor.C = lambda frequency: remove_dofs(rotor.C(frequency), dofs)
-    new_rotor.G = lambda: remove_dofs(rotor.G(), dofs)
+    new_rotor.G = lambda sparse=False: remove_dofs(rotor.G(sparse=sparse), dofs)
 
     # Because of lru_cache, we need to unwrap the methods
     new_rotor.run_modal = new_rotor.run_modal.__wrapped__